@@ -28,6 +28,7 @@ from st2common.constants.action import LIVEACTION_STATUS_TIMED_OUT
 from st2common.constants.action import LIVEACTION_STATUS_FAILED
 from st2common.constants.action import LIVEACTION_STATUS_CANCELED
 from st2common.constants.action import LIVEACTION_COMPLETED_STATES
+from st2common.constants.action import LIVEACTION_CANCELABLE_STATES
 from st2common.constants.action import LIVEACTION_FAILED_STATES
 from st2common.constants.keyvalue import FULL_SYSTEM_SCOPE, SYSTEM_SCOPE, DATASTORE_PARENT_SCOPE
 from st2common.content.loader import MetaLoader
@@ -41,6 +42,7 @@ from st2common.models.utils import action_param_utils
 from st2common.persistence.execution import ActionExecution
 from st2common.services import action as action_service
 from st2common.services.keyvalues import KeyValueLookup
+from st2common.services.liveaction_watcher import get_completion_watcher
 from st2common.util import action_db as action_db_util
 from st2common.util import isotime
 from st2common.util import date as date_utils
@@ -106,6 +108,21 @@ class ChainHolder(object):
                        'task "%s".' % (on_failure_node_name, node.name))
                 raise ValueError(msg)
 
+            # Check "parallel" nodes
+            for branch_node_name in node.parallel or []:
+                branch_node = self.get_node(branch_node_name)
+
+                if not branch_node:
+                    msg = ('Unable to find node with name "%s" referenced in "parallel" in '
+                           'task "%s".' % (branch_node_name, node.name))
+                    raise ValueError(msg)
+
+                if branch_node.parallel or branch_node.on_success or branch_node.on_failure:
+                    msg = ('Task "%s" referenced in "parallel" in task "%s" can\'t be a parallel '
+                           'task or specify "on-success" or "on-failure".' %
+                           (branch_node_name, node.name))
+                    raise ValueError(msg)
+
         # check if node specified in default is valid.
         if self.actionchain.default:
             valid_name = self._is_valid_node_name(all_node_names=all_nodes,
@@ -133,7 +150,8 @@ class ChainHolder(object):
         node_names = set(all_nodes)
         on_success_nodes = ChainHolder._get_all_on_success_nodes(action_chain=action_chain)
         on_failure_nodes = ChainHolder._get_all_on_failure_nodes(action_chain=action_chain)
-        referenced_nodes = on_success_nodes | on_failure_nodes
+        parallel_nodes = ChainHolder._get_all_parallel_nodes(action_chain=action_chain)
+        referenced_nodes = on_success_nodes | on_failure_nodes | parallel_nodes
         possible_default_nodes = node_names - referenced_nodes
         if possible_default_nodes:
             # This is to preserve order. set([..]) does not preserve the order so iterate
@@ -168,6 +186,16 @@ class ChainHolder(object):
         on_failure_nodes = set([node.on_failure for node in action_chain.chain])
         return on_failure_nodes
 
+    @staticmethod
+    def _get_all_parallel_nodes(action_chain):
+        """
+        Return names for all the tasks referenced in "parallel".
+        """
+        parallel_nodes = set()
+        for node in action_chain.chain:
+            parallel_nodes.update(node.parallel or [])
+        return parallel_nodes
+
     def _is_valid_node_name(self, all_node_names, node_name):
         """
         Function which validates that the provided node name is defined in the workflow definition
@@ -213,6 +241,9 @@ class ChainHolder(object):
                                                          (node_name))
         return None
 
+    def get_parallel_nodes(self, node):
+        return [self.get_node(node_name, raise_on_failure=True) for node_name in node.parallel]
+
     def get_next_node(self, curr_node_name=None, condition='on-success'):
         if not curr_node_name:
             return self.get_node(self.actionchain.default)
@@ -334,13 +365,24 @@ class ActionChainRunner(ActionRunner):
 
             created_at = date_utils.get_datetime_utc_now()
 
+            # Task which is being prepared (differs from action_node for parallel tasks)
+            task_node = action_node
+
             try:
-                liveaction = self._get_next_action(
-                    action_node=action_node, parent_context=parent_context,
-                    action_params=action_parameters, context_result=context_result)
+                if action_node.parallel:
+                    # Parameters of all the parallel tasks are rendered before any of them runs
+                    branch_liveactions = []
+                    for task_node in self.chain_holder.get_parallel_nodes(action_node):
+                        branch_liveactions.append(self._get_next_action(
+                            action_node=task_node, parent_context=parent_context,
+                            action_params=action_parameters, context_result=context_result))
+                else:
+                    liveaction = self._get_next_action(
+                        action_node=action_node, parent_context=parent_context,
+                        action_params=action_parameters, context_result=context_result)
             except InvalidActionReferencedException as e:
                 error = ('Failed to run task "%s". Action with reference "%s" doesn\'t exist.' %
-                         (action_node.name, action_node.ref))
+                         (task_node.name, task_node.ref))
                 LOG.exception(error)
 
                 fail = True
@@ -352,11 +394,11 @@ class ActionChainRunner(ActionRunner):
             except ParameterRenderingFailedException as e:
                 # Rendering parameters failed before we even got to running this action, abort and
                 # fail the whole action chain
-                LOG.exception('Failed to run action "%s".', action_node.name)
+                LOG.exception('Failed to run action "%s".', task_node.name)
 
                 fail = True
                 error = ('Failed to run task "%s". Parameter rendering failed: %s' %
-                         (action_node.name, str(e)))
+                         (task_node.name, str(e)))
                 trace = traceback.format_exc(10)
                 top_level_error = {
                     'error': error,
@@ -365,7 +407,13 @@ class ActionChainRunner(ActionRunner):
                 break
 
             try:
-                liveaction = self._run_action(liveaction)
+                if action_node.parallel:
+                    liveaction = self._run_parallel_actions(
+                        action_node=action_node, liveactions=branch_liveactions,
+                        action_parameters=action_parameters, context_result=context_result,
+                        result=result)
+                else:
+                    liveaction = self._run_action(liveaction)
             except Exception as e:
                 # Save the traceback and error message
                 LOG.exception('Failure in running action "%s".', action_node.name)
@@ -399,8 +447,10 @@ class ActionChainRunner(ActionRunner):
                 if error:
                     format_kwargs['error'] = error
 
-                task_result = self._format_action_exec_result(**format_kwargs)
-                result['tasks'].append(task_result)
+                # Note: Results of the parallel tasks have already been recorded
+                if not action_node.parallel or error:
+                    task_result = self._format_action_exec_result(**format_kwargs)
+                    result['tasks'].append(task_result)
 
                 if self.liveaction_id:
                     self._stopped = action_service.is_action_canceled_or_canceling(
@@ -555,10 +605,130 @@ class ActionChainRunner(ActionRunner):
 
         return liveaction
 
-    def _run_action(self, liveaction, wait_for_completion=True, sleep_delay=1.0):
+    def _run_parallel_actions(self, action_node, liveactions, action_parameters, context_result,
+                              result):
+        """
+        Run the actions of the parallel tasks at the same time and wait until all of them complete
+        or, if the node joins on "any", until the first one succeeds.
+
+        Task results and published variables are merged in the order the tasks are listed in
+        "parallel" so they don't depend on the order the actions have completed in.
+
+        :return: LiveAction object which represents the combined status and result of the tasks.
+        :rtype: :class:`LiveActionDB`
+        """
+        task_nodes = self.chain_holder.get_parallel_nodes(action_node)
+        created_at = date_utils.get_datetime_utc_now()
+        completed = eventlet.queue.LightQueue()
+
+        def run_task(index, liveaction):
+            try:
+                completed.put((index, self._run_action(liveaction), None))
+            except Exception as e:
+                LOG.exception('Failure in running action "%s".', task_nodes[index].name)
+
+                error = {
+                    'error': 'Task "%s" failed: %s' % (task_nodes[index].name, str(e)),
+                    'traceback': traceback.format_exc(10)
+                }
+                completed.put((index, None, error))
+
+        for index, liveaction in enumerate(liveactions):
+            eventlet.spawn_n(run_task, index, liveaction)
+
+        task_liveactions = [None] * len(liveactions)
+        task_errors = [None] * len(liveactions)
+        updated_at = [None] * len(liveactions)
+        pending = set(range(len(liveactions)))
+        canceled = False
+
+        while pending:
+            index, liveaction, error = completed.get()
+            pending.discard(index)
+            task_liveactions[index] = liveaction
+            task_errors[index] = error
+            updated_at[index] = date_utils.get_datetime_utc_now()
+
+            succeeded = liveaction and liveaction.status == LIVEACTION_STATUS_SUCCEEDED
+            if action_node.join == actionchain.JOIN_ANY and succeeded and not canceled:
+                # First task has succeeded, the rest of them are not needed anymore
+                canceled = True
+                self._cancel_actions([liveactions[pending_index] for pending_index in pending])
+
+        statuses = []
+        node_result = {}
+        for index, task_node in enumerate(task_nodes):
+            liveaction = task_liveactions[index]
+            error = task_errors[index]
+
+            if error:
+                context_result[task_node.name] = error
+                statuses.append(LIVEACTION_STATUS_FAILED)
+            else:
+                context_result[task_node.name] = liveaction.result
+                statuses.append(liveaction.status)
+
+                if liveaction.status == LIVEACTION_STATUS_SUCCEEDED:
+                    rendered_publish_vars = ActionChainRunner._render_publish_vars(
+                        action_node=task_node, action_parameters=action_parameters,
+                        execution_result=liveaction.result,
+                        previous_execution_results=context_result,
+                        chain_vars=self.chain_holder.vars)
+
+                    if rendered_publish_vars:
+                        self.chain_holder.vars.update(rendered_publish_vars)
+                        if self._display_published:
+                            result[PUBLISHED_VARS_KEY].update(rendered_publish_vars)
+
+            node_result[task_node.name] = context_result[task_node.name]
+
+            format_kwargs = {'action_node': task_node, 'liveaction_db': liveaction,
+                             'created_at': created_at, 'updated_at': updated_at[index]}
+            if error:
+                format_kwargs['error'] = error
+
+            result['tasks'].append(self._format_action_exec_result(**format_kwargs))
+
+        return LiveActionDB(action=None, status=self._get_parallel_status(action_node, statuses),
+                            result=node_result)
+
+    @staticmethod
+    def _get_parallel_status(action_node, statuses):
+        if action_node.join == actionchain.JOIN_ANY:
+            if LIVEACTION_STATUS_SUCCEEDED in statuses:
+                return LIVEACTION_STATUS_SUCCEEDED
+        elif all([status == LIVEACTION_STATUS_SUCCEEDED for status in statuses]):
+            return LIVEACTION_STATUS_SUCCEEDED
+
+        if LIVEACTION_STATUS_CANCELED in statuses and action_node.join != actionchain.JOIN_ANY:
+            return LIVEACTION_STATUS_CANCELED
+
+        if LIVEACTION_STATUS_TIMED_OUT in statuses and \
+                LIVEACTION_STATUS_FAILED not in statuses:
+            return LIVEACTION_STATUS_TIMED_OUT
+
+        return LIVEACTION_STATUS_FAILED
+
+    def _cancel_actions(self, liveactions):
+        for liveaction in liveactions:
+            try:
+                liveaction = action_db_util.get_liveaction_by_id(liveaction.id)
+
+                if liveaction.status in LIVEACTION_CANCELABLE_STATES:
+                    action_service.request_cancellation(liveaction, self.get_user())
+            except Exception:
+                LOG.exception('Failed to cancel liveaction "%s".', liveaction.id)
+
+    def _run_action(self, liveaction, wait_for_completion=True, sleep_delay=1.0,
+                    fallback_sleep_delay=10.0):
         """
         :param sleep_delay: Number of seconds to wait during "is completed" polls.
         :type sleep_delay: ``float``
+
+        :param fallback_sleep_delay: Number of seconds to wait during "is completed" polls when
+                                     the completion watcher is running. The polls are only a
+                                     fallback in case the completion notification is lost.
+        :type fallback_sleep_delay: ``float``
         """
         try:
             # request return canceled
@@ -568,10 +738,28 @@ class ActionChainRunner(ActionRunner):
             LOG.exception('Failed to schedule liveaction.')
             raise e
 
-        while (wait_for_completion and liveaction.status not in LIVEACTION_COMPLETED_STATES):
-            eventlet.sleep(sleep_delay)
+        if not wait_for_completion or liveaction.status in LIVEACTION_COMPLETED_STATES:
+            return liveaction
+
+        watcher = get_completion_watcher()
+        if not watcher:
+            while liveaction.status not in LIVEACTION_COMPLETED_STATES:
+                eventlet.sleep(sleep_delay)
+                liveaction = action_db_util.get_liveaction_by_id(liveaction.id)
+
+            return liveaction
+
+        # Wake up as soon as the completion is published instead of polling the database
+        event = watcher.add_waiter(liveaction.id)
+        try:
             liveaction = action_db_util.get_liveaction_by_id(liveaction.id)
 
+            while liveaction.status not in LIVEACTION_COMPLETED_STATES:
+                watcher.wait(event, timeout=fallback_sleep_delay)
+                liveaction = action_db_util.get_liveaction_by_id(liveaction.id)
+        finally:
+            watcher.remove_waiter(liveaction.id, event)
+
         return liveaction
 
     def _build_liveaction_object(self, action_node, resolved_params, parent_context):
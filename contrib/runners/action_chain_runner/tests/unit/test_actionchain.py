@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import eventlet
 import mock
 import action_chain_runner as acr
 from st2actions.container.service import RunnerContainerService
@@ -98,6 +99,12 @@ CHAIN_WITH_PUBLISH = FixturesLoader().get_fixture_file_path_abs(
     FIXTURES_PACK, 'actionchains', 'chain_with_publish.yaml')
 CHAIN_WITH_PUBLISH_PARAM_RENDERING_FAILURE = FixturesLoader().get_fixture_file_path_abs(
     FIXTURES_PACK, 'actionchains', 'chain_publish_params_rendering_failure.yaml')
+CHAIN_WITH_PARALLEL = FixturesLoader().get_fixture_file_path_abs(
+    FIXTURES_PACK, 'actionchains', 'chain_with_parallel.yaml')
+CHAIN_WITH_PARALLEL_JOIN_ANY = FixturesLoader().get_fixture_file_path_abs(
+    FIXTURES_PACK, 'actionchains', 'chain_with_parallel_join_any.yaml')
+CHAIN_WITH_INVALID_PARALLEL = FixturesLoader().get_fixture_file_path_abs(
+    FIXTURES_PACK, 'actionchains', 'chain_with_invalid_parallel.yaml')
 CHAIN_WITH_INVALID_ACTION = FixturesLoader().get_fixture_file_path_abs(
     FIXTURES_PACK, 'actionchains', 'chain_with_invalid_action.yaml')
 CHAIN_ACTION_PARAMS_AND_PARAMETERS_ATTRIBUTE = FixturesLoader().get_fixture_file_path_abs(
@@ -310,6 +317,32 @@ class TestActionChainRunner(DbTestCase):
         # based on the chain the callcount is known to be 3. Not great but works.
         self.assertEqual(request.call_count, 3)
 
+    @mock.patch('eventlet.sleep', mock.MagicMock())
+    @mock.patch.object(action_db_util, 'get_liveaction_by_id', mock.MagicMock(
+        return_value=DummyActionExecution()))
+    @mock.patch.object(action_db_util, 'get_action_by_ref',
+                       mock.MagicMock(return_value=ACTION_1))
+    @mock.patch.object(action_service, 'request',
+                       return_value=(DummyActionExecution(status=LIVEACTION_STATUS_RUNNING), None))
+    def test_chain_runner_success_path_with_completion_watcher(self, request):
+        watcher = mock.Mock()
+
+        with mock.patch.object(acr, 'get_completion_watcher', mock.Mock(return_value=watcher)):
+            chain_runner = acr.get_runner()
+            chain_runner.entry_point = CHAIN_1_PATH
+            chain_runner.action = ACTION_1
+            chain_runner.container_service = RunnerContainerService()
+            chain_runner.pre_run()
+            chain_runner.run({})
+
+        self.assertEqual(request.call_count, 3)
+        self.assertEqual(watcher.add_waiter.call_count, 3)
+        self.assertEqual(watcher.remove_waiter.call_count, 3)
+
+        # Task completion was detected without polling
+        self.assertFalse(eventlet.sleep.called)
+        self.assertFalse(watcher.wait.called)
+
     @mock.patch.object(action_db_util, 'get_action_by_ref',
                        mock.MagicMock(return_value=ACTION_1))
     @mock.patch.object(action_service, 'request',
@@ -639,6 +672,69 @@ class TestActionChainRunner(DbTestCase):
         self.assertEqual(result['published'],
                          {'published_action_param': u'test value 1', 'o1': u'published'})
 
+    @mock.patch.object(action_db_util, 'get_action_by_ref',
+                       mock.MagicMock(return_value=ACTION_2))
+    @mock.patch.object(action_service, 'request')
+    def test_chain_runner_parallel(self, request):
+        def mock_request(liveaction):
+            task_name = liveaction.context['chain']['name']
+            return (DummyActionExecution(result={'raw_out': task_name}), None)
+
+        request.side_effect = mock_request
+
+        chain_runner = acr.get_runner()
+        chain_runner.entry_point = CHAIN_WITH_PARALLEL
+        chain_runner.action = ACTION_2
+        chain_runner.container_service = RunnerContainerService()
+        chain_runner.runner_parameters = {'display_published': True}
+        chain_runner.pre_run()
+        status, result, _ = chain_runner.run({})
+
+        self.assertEqual(status, LIVEACTION_STATUS_SUCCEEDED)
+        self.assertEqual(request.call_count, 4)
+
+        # Results and published variables are merged in the order the tasks are listed in
+        self.assertEqual([task['name'] for task in result['tasks']], ['c1', 'c2', 'c3', 'c4'])
+        self.assertEqual(result['published'], {'o1': 'c2', 'o3': 'c3'})
+
+        mock_args, _ = request.call_args
+        self.assertEqual(mock_args[0].parameters['strtype'], 'c2-c3')
+
+    @mock.patch.object(action_db_util, 'get_action_by_ref',
+                       mock.MagicMock(return_value=ACTION_2))
+    @mock.patch.object(action_service, 'request')
+    def test_chain_runner_parallel_join_any(self, request):
+        def mock_request(liveaction):
+            task_name = liveaction.context['chain']['name']
+            status = LIVEACTION_STATUS_SUCCEEDED if task_name == 'c2' else LIVEACTION_STATUS_FAILED
+            return (DummyActionExecution(status=status), None)
+
+        request.side_effect = mock_request
+
+        chain_runner = acr.get_runner()
+        chain_runner.entry_point = CHAIN_WITH_PARALLEL_JOIN_ANY
+        chain_runner.action = ACTION_2
+        chain_runner.container_service = RunnerContainerService()
+        chain_runner.pre_run()
+        status, result, _ = chain_runner.run({})
+
+        # Single successful task is enough so "on-failure" task is not executed
+        self.assertEqual(status, LIVEACTION_STATUS_SUCCEEDED)
+        self.assertEqual(request.call_count, 2)
+        self.assertEqual([task['state'] for task in result['tasks']],
+                         [LIVEACTION_STATUS_FAILED, LIVEACTION_STATUS_SUCCEEDED])
+
+    def test_chain_runner_invalid_parallel_task(self):
+        chain_runner = acr.get_runner()
+        chain_runner.entry_point = CHAIN_WITH_INVALID_PARALLEL
+        chain_runner.action = ACTION_2
+        chain_runner.container_service = RunnerContainerService()
+
+        expected_msg = ('Task "c1" referenced in "parallel" in task "fan_out" can\'t be a parallel '
+                        'task or specify "on-success" or "on-failure".')
+        self.assertRaisesRegexp(runnerexceptions.ActionRunnerPreRunError, expected_msg,
+                                chain_runner.pre_run)
+
     @mock.patch.object(action_db_util, 'get_action_by_ref',
                        mock.MagicMock(return_value=ACTION_1))
     @mock.patch.object(action_service, 'request', return_value=(DummyActionExecution(), None))
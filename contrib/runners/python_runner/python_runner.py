@@ -16,14 +16,23 @@
 import os
 import sys
 import json
+import time
 import uuid
+import errno
+import signal
+import shutil
+import tempfile
 from subprocess import list2cmdline
 
+import eventlet
+from eventlet.green import socket
 from eventlet.green import subprocess
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.runners.base import ActionRunner
 from st2common.util.green.shell import run_command
+from st2common.util.green.shell import TIMEOUT_EXIT_CODE
 from st2common.constants.action import ACTION_OUTPUT_RESULT_DELIMITER
 from st2common.constants.action import LIVEACTION_STATUS_SUCCEEDED
 from st2common.constants.action import LIVEACTION_STATUS_FAILED
@@ -45,6 +54,8 @@ LOG = logging.getLogger(__name__)
 __all__ = [
     'get_runner',
     'PythonRunner',
+    'PythonActionZygoteClient',
+    'stop_zygotes'
 ]
 
 # constants to lookup in runner_parameters.
@@ -60,6 +71,14 @@ BLACKLISTED_ENV_VARS = [
 BASE_DIR = os.path.dirname(os.path.abspath(python_action_wrapper.__file__))
 WRAPPER_SCRIPT_NAME = 'python_action_wrapper.py'
 WRAPPER_SCRIPT_PATH = os.path.join(BASE_DIR, WRAPPER_SCRIPT_NAME)
+ZYGOTE_SCRIPT_NAME = 'python_action_zygote.py'
+ZYGOTE_SCRIPT_PATH = os.path.join(BASE_DIR, ZYGOTE_SCRIPT_NAME)
+
+# How long to wait for the zygote process to start listening
+ZYGOTE_START_TIMEOUT = 10
+
+# Maps Python binary (pack virtualenv) to the zygote client
+_ZYGOTES = {}
 
 
 def get_runner():
@@ -130,6 +149,10 @@ class PythonRunner(ActionRunner):
         env['PYTHONPATH'] = get_sandbox_python_path(inherit_from_parent=True,
                                                     inherit_parent_virtualenv=True)
 
+        # Zygote is shared by all the executions so it's started without any execution specific
+        # variables (e.g. auth token) which are passed with each request instead
+        zygote_env = env.copy()
+
         # Include user provided environment variables (if any)
         user_env_vars = self._get_env_vars()
         env.update(user_env_vars)
@@ -140,6 +163,17 @@ class PythonRunner(ActionRunner):
         datastore_env_vars = self._get_datastore_access_env_vars()
         env.update(datastore_env_vars)
 
+        if cfg.CONF.actionrunner.python_runner_prefork:
+            try:
+                zygote = get_zygote(python_path=python_path, env=zygote_env)
+                exit_code, stdout, stderr, timed_out = zygote.run(
+                    pack=pack, file_path=self.entry_point, parameters=action_parameters or {},
+                    user=user, env=env, timeout=self._timeout)
+                return self._get_output_values(exit_code, stdout, stderr, timed_out)
+            except ZygoteUnavailableError as e:
+                LOG.warning('Failed to run action in the zygote process, falling back to a '
+                            'new process: %s' % (str(e)))
+
         command_string = list2cmdline(args)
         LOG.debug('Running command: PATH=%s PYTHONPATH=%s %s' % (env['PATH'], env['PYTHONPATH'],
                                                                  command_string))
@@ -267,3 +301,156 @@ class PythonRunner(ActionRunner):
         env_vars[API_URL_ENV_VARIABLE_NAME] = get_full_public_api_url()
 
         return env_vars
+
+
+class ZygoteUnavailableError(Exception):
+    """
+    Raised when the action couldn't be handed over to the zygote process.
+    """
+    pass
+
+
+class PythonActionZygoteClient(object):
+    """
+    Client for the zygote process (see python_action_zygote.py) which runs Python actions of a
+    single pack virtualenv in processes forked from an interpreter with all the dependencies
+    already imported. This avoids the interpreter start up and import overhead of every execution.
+    """
+
+    def __init__(self, python_path, env):
+        """
+        :param python_path: Python binary used to start the zygote.
+        :type python_path: ``str``
+
+        :param env: Environment the zygote is started with. Note: This environment is visible
+                    for the whole lifetime of the zygote so it shouldn't contain any execution
+                    specific variables. Those are passed with each request.
+        :type env: ``dict``
+        """
+        self._socket_dir = tempfile.mkdtemp(prefix='st2-python-zygote-')
+        self._socket_path = os.path.join(self._socket_dir, 'zygote.sock')
+
+        args = [
+            python_path,
+            ZYGOTE_SCRIPT_PATH,
+            '--socket-path=%s' % (self._socket_path),
+            '--parent-args=%s' % (json.dumps(sys.argv[1:]))
+        ]
+
+        LOG.debug('Starting Python runner zygote: %s' % (list2cmdline(args)))
+
+        # Zygote exits once its stdin is closed which happens when this process exits
+        self._process = subprocess.Popen(args=args, stdin=subprocess.PIPE, env=env)
+
+    def is_running(self):
+        return self._process.poll() is None
+
+    def stop(self):
+        if self.is_running():
+            self._process.stdin.close()
+            self._process.wait()
+
+        shutil.rmtree(self._socket_dir, ignore_errors=True)
+
+    def run(self, pack, file_path, parameters, user, env, timeout):
+        """
+        Run the action in a process forked from the zygote and wait until it completes.
+
+        :rtype: ``tuple`` (exit_code, stdout, stderr, timed_out)
+        """
+        request = {
+            'pack': pack,
+            'file_path': file_path,
+            'parameters': parameters,
+            'user': user,
+            'env': env
+        }
+
+        try:
+            connection = self._connect()
+            connection.sendall(json.dumps(request) + '\n')
+            reader = connection.makefile('rb')
+            pid = json.loads(reader.readline())['pid']
+        except (socket.error, IOError, ValueError, KeyError) as e:
+            raise ZygoteUnavailableError(str(e))
+
+        try:
+            timed_out = False
+            response = None
+
+            with eventlet.Timeout(timeout, False):
+                response = reader.readline()
+
+            if response is None:
+                timed_out = True
+                self._kill(pid)
+                response = reader.readline()
+
+            response = json.loads(response)
+            stdout = reader.read(response['stdout_size'])
+            stderr = reader.read(response['stderr_size'])
+        finally:
+            connection.close()
+
+        exit_code = TIMEOUT_EXIT_CODE if timed_out else response['exit_code']
+        return (exit_code, stdout, stderr, timed_out)
+
+    def _connect(self):
+        start_time = time.time()
+
+        while True:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                connection.connect(self._socket_path)
+                return connection
+            except socket.error as e:
+                connection.close()
+
+                if e.errno not in [errno.ENOENT, errno.ECONNREFUSED]:
+                    raise
+
+                # Zygote hasn't started listening yet
+                if not self.is_running() or time.time() - start_time > ZYGOTE_START_TIMEOUT:
+                    raise
+
+                eventlet.sleep(0.1)
+
+    def _kill(self, pid):
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+
+def get_zygote(python_path, env):
+    """
+    Return zygote client for the provided Python binary, (re)starting the zygote if needed.
+
+    :rtype: :class:`PythonActionZygoteClient`
+    """
+    zygote = _ZYGOTES.get(python_path, None)
+
+    if not zygote or not zygote.is_running():
+        if zygote:
+            zygote.stop()
+
+        zygote = PythonActionZygoteClient(python_path=python_path, env=env)
+        _ZYGOTES[python_path] = zygote
+
+    return zygote
+
+
+def stop_zygotes():
+    """
+    Stop all the running zygote processes. Called on action runner shutdown.
+    """
+    for python_path in list(_ZYGOTES.keys()):
+        zygote = _ZYGOTES.pop(python_path)
+
+        try:
+            zygote.stop()
+        except Exception:
+            LOG.exception('Failed to stop Python runner zygote for "%s".' % (python_path))
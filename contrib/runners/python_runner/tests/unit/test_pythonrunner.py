@@ -16,9 +16,11 @@
 import os
 
 import mock
+from oslo_config import cfg
 
 import python_runner
 from st2common.runners.python_action_wrapper import PythonActionWrapper
+from st2common.runners.python_action_zygote import PythonActionZygote
 from st2common.runners.base_action import Action
 from st2actions.container import service
 from st2common.runners.utils import get_action_class_instance
@@ -27,6 +29,7 @@ from st2common.constants.action import ACTION_OUTPUT_RESULT_DELIMITER
 from st2common.constants.action import LIVEACTION_STATUS_SUCCEEDED, LIVEACTION_STATUS_FAILED
 from st2common.constants.action import LIVEACTION_STATUS_TIMED_OUT
 from st2common.constants.pack import SYSTEM_PACK_NAME
+from st2common.constants.system import AUTH_TOKEN_ENV_VARIABLE_NAME
 from st2tests.base import RunnerTestCase
 from st2tests.base import CleanDbTestCase
 import st2tests.base as tests_base
@@ -454,6 +457,79 @@ class PythonRunnerTestCase(RunnerTestCase, CleanDbTestCase):
                        'No module named invalid')
         self.assertRaisesRegexp(Exception, expected_msg, wrapper._get_action_instance)
 
+    def test_simple_action_prefork(self):
+        cfg.CONF.set_override(name='python_runner_prefork', override=True, group='actionrunner')
+        self.addCleanup(cfg.CONF.clear_override, name='python_runner_prefork',
+                        group='actionrunner')
+
+        runner = python_runner.get_runner()
+        runner.action = self._get_mock_action_obj()
+        runner.runner_parameters = {}
+        runner.entry_point = PASCAL_ROW_ACTION_PATH
+        runner.container_service = service.RunnerContainerService()
+        runner.pre_run()
+
+        # Second run reuses already started zygote
+        for index in range(0, 2):
+            (status, output, _) = runner.run({'row_index': 4})
+            self.assertEqual(status, LIVEACTION_STATUS_SUCCEEDED)
+            self.assertEqual(output['result'], [1, 4, 6, 4, 1])
+            self.assertEqual(output['exit_code'], 0)
+
+        self.assertEqual(len(python_runner._ZYGOTES), 1)
+        zygote = list(python_runner._ZYGOTES.values())[0]
+        self.assertTrue(zygote.is_running())
+
+        # Action timeout
+        runner.runner_parameters = {python_runner.RUNNER_TIMEOUT: 0}
+        runner.pre_run()
+        (status, output, _) = runner.run({'row_index': 4})
+        self.assertEqual(status, LIVEACTION_STATUS_TIMED_OUT)
+        self.assertEqual(output['error'], 'Action failed to complete in 0 seconds')
+        self.assertEqual(output['exit_code'], -9)
+
+        python_runner.stop_zygotes()
+        self.assertFalse(zygote.is_running())
+        self.assertEqual(python_runner._ZYGOTES, {})
+
+    @mock.patch('python_runner.get_zygote')
+    def test_prefork_zygote_is_started_without_execution_env_vars(self, mock_get_zygote):
+        cfg.CONF.set_override(name='python_runner_prefork', override=True, group='actionrunner')
+        self.addCleanup(cfg.CONF.clear_override, name='python_runner_prefork',
+                        group='actionrunner')
+
+        mock_get_zygote.return_value.run.return_value = (0, '', '', False)
+
+        runner = python_runner.get_runner()
+        runner.auth_token = mock.Mock()
+        runner.auth_token.token = 'ponies'
+        runner.action = self._get_mock_action_obj()
+        runner.runner_parameters = {'env': {'key1': 'value1'}}
+        runner.entry_point = PASCAL_ROW_ACTION_PATH
+        runner.container_service = service.RunnerContainerService()
+        runner.pre_run()
+        runner.run({'row_index': 4})
+
+        zygote_env = mock_get_zygote.call_args[1]['env']
+        self.assertTrue('PYTHONPATH' in zygote_env)
+        self.assertFalse(AUTH_TOKEN_ENV_VARIABLE_NAME in zygote_env)
+        self.assertFalse('key1' in zygote_env)
+
+        # Execution specific variables are passed with the request
+        request_env = mock_get_zygote.return_value.run.call_args[1]['env']
+        self.assertEqual(request_env[AUTH_TOKEN_ENV_VARIABLE_NAME], 'ponies')
+        self.assertEqual(request_env['key1'], 'value1')
+
+    @mock.patch('st2common.runners.python_action_zygote.config.parse_args',
+                mock.Mock(side_effect=Exception('invalid config')))
+    def test_zygote_exits_on_config_parse_failure(self):
+        zygote = PythonActionZygote(socket_path='/tmp/doesnt-exist.sock', parent_args=[])
+
+        with self.assertRaises(SystemExit) as cm:
+            zygote.run()
+
+        self.assertEqual(cm.exception.code, 1)
+
     def _get_mock_action_obj(self):
         """
         Return mock action object.
@@ -42,7 +42,13 @@ def _register_common_opts():
 def _register_notifier_opts():
     notifier_opts = [
         cfg.StrOpt('logging', default='conf/logging.notifier.conf',
-                   help='Location of the logging configuration file.')
+                   help='Location of the logging configuration file.'),
+        cfg.IntOpt('batch_size', default=1,
+                   help='Number of execution update messages to prefetch and acknowledge '
+                        'together. 1 disables batching.'),
+        cfg.FloatOpt('batch_flush_interval', default=1,
+                     help='Maximum number of seconds to wait for a partial batch to fill up '
+                          'before processing it.')
     ]
     CONF.register_opts(notifier_opts, group='notifier')
 
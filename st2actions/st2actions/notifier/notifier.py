@@ -98,8 +98,15 @@ class Notifier(consumers.MessageHandler):
 
         self._post_generic_trigger(liveaction=liveaction, execution=execution)
 
+    def get_queue_consumer(self, connection, queues):
+        return consumers.QueueConsumer(
+            connection=connection, queues=queues, handler=self,
+            batch_size=cfg.CONF.notifier.batch_size,
+            batch_flush_interval=cfg.CONF.notifier.batch_flush_interval)
+
     def _get_execution_for_liveaction(self, liveaction):
-        execution = ActionExecution.get(liveaction__id=str(liveaction.id))
+        # Notifier only needs the execution id upfront, result is retrieved lazily if needed
+        execution = ActionExecution.get(liveaction__id=str(liveaction.id), only_fields=['id'])
 
         if not execution:
             return None
@@ -207,9 +214,17 @@ class Notifier(consumers.MessageHandler):
         })
         context.update({ACTION_PARAMETERS_KV_PREFIX: liveaction.parameters})
         context.update({ACTION_CONTEXT_KV_PREFIX: liveaction.context})
-        context.update({ACTION_RESULTS_KV_PREFIX: execution.result})
+        context.update({ACTION_RESULTS_KV_PREFIX: self._get_execution_result(execution)})
         return context
 
+    def _get_execution_result(self, execution):
+        # Execution is retrieved without the (potentially large) result attribute which is only
+        # needed when rendering notification templates so we load it lazily here
+        if not execution.result:
+            execution = ActionExecution.load_fields(execution, ['result'])
+
+        return execution.result
+
     def _transform_message(self, message, context=None):
         mapping = {'message': message}
         context = context or {}
@@ -26,11 +26,14 @@ from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.models.db.liveaction import LiveActionDB
 from st2common.persistence.execution import ActionExecution
 from st2common.services import executions
+from st2common.services import keyvalues
+from st2common.services import liveaction_watcher
 from st2common.transport import liveaction
 from st2common.transport.consumers import MessageHandler
 from st2common.transport.consumers import ActionsQueueConsumer
 from st2common.transport import utils as transport_utils
 from st2common.util import action_db as action_utils
+from st2common.util import loader
 from st2common.util import system_info
 
 
@@ -55,6 +58,11 @@ class ActionExecutionDispatcher(MessageHandler):
         # We want to use a special ActionsQueueConsumer which uses 2 dispatcher pools
         return ActionsQueueConsumer(connection=connection, queues=queues, handler=self)
 
+    def start(self, wait=False):
+        keyvalues.setup_cache()
+        liveaction_watcher.setup_completion_watcher()
+        super(ActionExecutionDispatcher, self).start(wait=wait)
+
     def process(self, liveaction):
         """Dispatches the LiveAction to appropriate action runner.
 
@@ -97,6 +105,9 @@ class ActionExecutionDispatcher(MessageHandler):
 
     def shutdown(self):
         super(ActionExecutionDispatcher, self).shutdown()
+        keyvalues.teardown_cache()
+        liveaction_watcher.teardown_completion_watcher()
+        self._stop_python_runner_zygotes()
         # Abandon running executions if incomplete
         while self._running_liveactions:
             liveaction_id = self._running_liveactions.pop()
@@ -105,6 +116,18 @@ class ActionExecutionDispatcher(MessageHandler):
             except:
                 LOG.exception('Failed to abandon liveaction %s.', liveaction_id)
 
+    def _stop_python_runner_zygotes(self):
+        # Python runner module is only loaded (and zygotes started) once a Python action runs
+        python_runner = loader.RUNNER_MODULES_CACHE.get('python_runner', None)
+
+        if not python_runner or not hasattr(python_runner, 'stop_zygotes'):
+            return
+
+        try:
+            python_runner.stop_zygotes()
+        except:
+            LOG.exception('Failed to stop Python runner zygote processes.')
+
     def _run_action(self, liveaction_db):
         # stamp liveaction with process_info
         runner_info = system_info.get_process_info()
@@ -23,6 +23,7 @@ from eventlet import wsgi
 from st2common import log as logging
 from st2common.service_setup import setup as common_setup
 from st2common.service_setup import teardown as common_teardown
+from st2common.services import rbac as rbac_services
 from st2common.util.monkey_patch import monkey_patch
 from st2api import config
 config.register_opts()
@@ -49,6 +50,9 @@ def _setup():
     # Additional pre-run time checks
     validate_rbac_is_correctly_configured()
 
+    # Cache user permissions (if enabled) so RBAC checks don't hit the database on each request
+    rbac_services.setup_cache()
+
 
 def _run_server():
     host = cfg.CONF.api.host
@@ -65,6 +69,7 @@ def _run_server():
 
 
 def _teardown():
+    rbac_services.teardown_cache()
     common_teardown()
 
 
@@ -69,6 +69,15 @@ def _register_app_opts():
                    help='location of the logging.conf file'),
         cfg.IntOpt('max_page_size', default=100,
                    help=('Maximum limit (page size) argument which can be specified by the user '
-                         'in a query string.'))
+                         'in a query string.')),
+        cfg.BoolOpt('stream_list_responses', default=False,
+                    help=('True to stream the responses of the API list endpoints. Items are '
+                          'retrieved from the database and serialized (without indentation) one '
+                          'by one while the response is being sent.')),
+        cfg.StrOpt('list_total_count', default='exact',
+                   choices=['exact', 'estimated', 'off'],
+                   help=('How the X-Total-Count header of the API list endpoints is computed. '
+                         '"exact" counts all the matching objects, "estimated" only counts '
+                         'objects up to the end of the next page and "off" omits the header.'))
     ]
     CONF.register_opts(logging_opts, group='api')
@@ -17,19 +17,27 @@
 
 import abc
 import copy
+import json
+import base64
+import datetime
 
+import bson
 from oslo_config import cfg
+import mongoengine as me
 from mongoengine import ValidationError
 import six
 from six.moves import http_client
 
 from st2common import log as logging
+from st2common.fields import ComplexDateTimeField
 from st2common.models.system.common import ResourceReference
 from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.rbac import utils as rbac_utils
+from st2common.util import isotime
 from st2common.util import schema as util_schema
 from st2common.router import abort
 from st2common.router import Response
+from st2common.router import StreamingJSONListResponse
 
 LOG = logging.getLogger(__name__)
 
@@ -104,6 +112,24 @@ class ResourceController(object):
     # A list of attributes which can be specified using ?exclude_attributes filter
     valid_exclude_attributes = []
 
+    # A list of attributes which are always retrieved from the database when
+    # ?include_attributes filter is used (e.g. attributes needed to mask secrets)
+    mandatory_include_fields_retrieve = []
+
+    # A list of attributes which are always included in the response when ?include_attributes
+    # filter is used
+    mandatory_include_fields_response = ['id']
+
+    # True if the list responses of this controller can be streamed (api.stream_list_responses).
+    # Note: This should only be enabled for controllers which don't post-process the response
+    # returned by _get_all
+    supports_streaming = False
+
+    # Sort order which is used for the keyset (cursor based) pagination (?after=<cursor>). Fields
+    # should be covered by an index and the last field needs to be unique (e.g. id). None if the
+    # controller doesn't support keyset pagination.
+    keyset_sort = None
+
     # Method responsible for retrieving an instance of the corresponding model DB object
     # Note: This method should throw StackStormDBObjectNotFoundError if the corresponding DB
     # object doesn't exist
@@ -119,14 +145,51 @@ class ResourceController(object):
         self.get_one_db_method = self._get_by_name_or_id
 
     def _get_all(self, exclude_fields=None, sort=None, offset=0, limit=None, query_options=None,
-                 from_model_kwargs=None, raw_filters=None):
+                 from_model_kwargs=None, raw_filters=None, include_fields=None, after=None):
         """
         :param exclude_fields: A list of object fields to exclude.
         :type exclude_fields: ``list``
+
+        :param include_fields: A list of object fields to include. Only those fields (and fields
+                               listed in mandatory_include_fields_*) are retrieved from the
+                               database and returned in the response.
+        :type include_fields: ``list``
+
+        :param after: Cursor returned in the X-Next-Cursor header of the previous page. If
+                      provided (empty string for the first page), keyset pagination is used
+                      instead of the offset one. X-Total-Count header is not included in those
+                      responses.
+        :type after: ``str``
         """
         raw_filters = copy.deepcopy(raw_filters) or {}
 
         exclude_fields = exclude_fields or []
+        include_fields = include_fields or []
+
+        if include_fields and exclude_fields:
+            msg = 'exclude_attributes and include_attributes arguments are mutually exclusive'
+            raise ValueError(msg)
+
+        if include_fields:
+            only_fields = include_fields + self.mandatory_include_fields_retrieve
+            response_fields = set(include_fields + self.mandatory_include_fields_response)
+        else:
+            only_fields = None
+            response_fields = None
+
+        keyset_pagination = after is not None
+
+        if keyset_pagination:
+            self._validate_keyset_pagination_arguments(sort=sort, offset=offset,
+                                                       raw_filters=raw_filters)
+
+            # Fields which are used to build the cursor always need to be retrieved
+            keyset_fields = self._get_keyset_fields()
+            exclude_fields = [field for field in exclude_fields if field not in keyset_fields]
+
+            if only_fields:
+                only_fields = only_fields + keyset_fields
+
         query_options = query_options if query_options else self.query_options
 
         # TODO: Why do we use comma delimited string, user can just specify
@@ -154,6 +217,9 @@ class ResourceController(object):
         default_sort_values = copy.copy(query_options.get('sort'))
         raw_filters['sort'] = db_sort_values if db_sort_values else default_sort_values
 
+        if keyset_pagination:
+            raw_filters['sort'] = copy.copy(self.keyset_sort)
+
         # TODO: To protect us from DoS, we need to make max_limit mandatory
         offset = int(offset)
 
@@ -180,7 +246,10 @@ class ResourceController(object):
             else:
                 filters['__'.join(v.split('.'))] = filter_value
 
-        instances = self.access.query(exclude_fields=exclude_fields, **filters)
+        q_obj = self._get_keyset_filter(cursor=after) if after else None
+
+        instances = self.access.query(exclude_fields=exclude_fields, only_fields=only_fields,
+                                      q_obj=q_obj, **filters)
         if limit == 1:
             # Perform the filtering on the DB side
             instances = instances.limit(limit)
@@ -188,18 +257,128 @@ class ResourceController(object):
         from_model_kwargs = from_model_kwargs or {}
         from_model_kwargs.update(self.from_model_kwargs)
 
-        result = []
-        for instance in instances[offset:eop]:
+        def get_item(instance):
             item = self.model.from_model(instance, **from_model_kwargs)
-            result.append(item)
 
-        resp = Response(json=result)
-        resp.headers['X-Total-Count'] = str(instances.count())
+            if response_fields:
+                item = {key: value for key, value in six.iteritems(vars(item))
+                        if key in response_fields}
+
+            return item
+
+        if keyset_pagination:
+            # Note: Streaming is not used since the next cursor is only known once the last item
+            # has been retrieved
+            instances_page = list(instances[offset:eop])
+
+            resp = Response(json=[get_item(instance) for instance in instances_page])
+
+            if limit and len(instances_page) == int(limit):
+                resp.headers['X-Next-Cursor'] = self._get_keyset_cursor(instances_page[-1])
+        elif self.supports_streaming and cfg.CONF.api.stream_list_responses:
+            # Items are retrieved from the cursor and serialized while the response is being sent
+            items = (get_item(instance) for instance in instances[offset:eop])
+            resp = StreamingJSONListResponse(items=items)
+        else:
+            result = [get_item(instance) for instance in instances[offset:eop]]
+            resp = Response(json=result)
+
+        if not keyset_pagination:
+            total_count = self._get_total_count(instances=instances, offset=offset, limit=limit)
+            if total_count is not None:
+                resp.headers['X-Total-Count'] = str(total_count)
         if limit:
             resp.headers['X-Limit'] = str(limit)
 
         return resp
 
+    def _validate_keyset_pagination_arguments(self, sort=None, offset=0, raw_filters=None):
+        if not self.keyset_sort:
+            raise ValueError('Cursor based pagination (after argument) is not supported for '
+                             'this resource')
+
+        if sort or int(offset):
+            raise ValueError('after argument can\'t be used together with sort and offset '
+                             'arguments')
+
+        # Range filters change the sort order of the results
+        for value in six.itervalues(raw_filters or {}):
+            if isinstance(value, six.string_types) and '..' in value:
+                raise ValueError('after argument can\'t be used together with a range filter')
+
+    def _get_keyset_fields(self):
+        return [sort_key.lstrip('+-') for sort_key in self.keyset_sort]
+
+    def _get_keyset_cursor(self, instance):
+        """
+        Return opaque cursor which points to the position after the provided object.
+        """
+        values = []
+
+        for field in self._get_keyset_fields():
+            value = getattr(instance, field)
+
+            if isinstance(value, datetime.datetime):
+                value = isotime.format(value, offset=False)
+            else:
+                value = str(value)
+
+            values.append(value)
+
+        return base64.urlsafe_b64encode(json.dumps(values))
+
+    def _get_keyset_filter(self, cursor):
+        """
+        Return Q object which matches objects which follow the position the provided cursor
+        points to in the keyset_sort order.
+        """
+        keyset_fields = self._get_keyset_fields()
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(str(cursor)))
+
+            if not isinstance(values, list) or len(values) != len(keyset_fields):
+                raise ValueError('Invalid number of values')
+
+            model_fields = self.access.impl.model._fields
+            for index, field in enumerate(keyset_fields):
+                if isinstance(model_fields[field], (me.DateTimeField, ComplexDateTimeField)):
+                    values[index] = isotime.parse(values[index])
+                elif isinstance(model_fields[field], me.ObjectIdField):
+                    values[index] = bson.ObjectId(values[index])
+        except Exception:
+            raise ValueError('Invalid cursor "%s" provided' % (cursor))
+
+        # (f1 > v1) OR (f1 == v1 AND f2 > v2) OR ... (with "<" for descending fields)
+        result = None
+        for index, sort_key in enumerate(self.keyset_sort):
+            operator = 'lt' if sort_key.startswith('-') else 'gt'
+            query = {'%s__%s' % (keyset_fields[index], operator): values[index]}
+
+            for previous_index in range(0, index):
+                query[keyset_fields[previous_index]] = values[previous_index]
+
+            result = me.Q(**query) if result is None else result | me.Q(**query)
+
+        return result
+
+    def _get_total_count(self, instances, offset=0, limit=None):
+        """
+        Return value of the X-Total-Count header based on the api.list_total_count config option
+        or None if the header shouldn't be included in the response.
+        """
+        mode = cfg.CONF.api.list_total_count
+
+        if mode == 'off':
+            return None
+        elif mode == 'estimated' and limit:
+            # Only count objects up to the end of the next page. This way clients can still tell
+            # if there are more pages available without counting all the matching objects.
+            count = instances.skip(offset).limit(int(limit) * 2).count(with_limit_and_skip=True)
+            return offset + count
+
+        return instances.count()
+
     def _get_one_by_id(self, id, requester_user, permission_type, exclude_fields=None,
                        from_model_kwargs=None):
         """
@@ -336,6 +515,22 @@ class ResourceController(object):
 
         return exclude_fields
 
+    def _validate_include_fields(self, include_fields):
+        """
+        Validate that provided include fields are valid model attributes.
+        """
+        if not include_fields:
+            return include_fields
+
+        valid_fields = self.access.impl.model._fields
+
+        for field in include_fields:
+            if field not in valid_fields:
+                msg = 'Invalid or unsupported attribute specified: %s' % (field)
+                raise ValueError(msg)
+
+        return include_fields
+
 
 class ContentPackResourceController(ResourceController):
     include_reference = False
@@ -86,6 +86,13 @@ class ActionExecutionsControllerMixin(BaseRestControllerMixin):
         'trigger_instance'
     ]
 
+    # Those attributes are always retrieved when ?include_attributes filter is used so we can
+    # correctly determine and mask secret execution parameters
+    mandatory_include_fields_retrieve = [
+        'action.parameters',
+        'runner.runner_parameters'
+    ]
+
     def _handle_schedule_execution(self, liveaction_api, requester_user, context_string=None,
                                    show_secrets=False):
         """
@@ -401,23 +408,38 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
         'timestamp_lt': lambda value: isotime.parse(value=value)
     }
 
-    def get_all(self, requester_user, exclude_attributes=None, sort=None, offset=0, limit=None,
-                show_secrets=False, **raw_filters):
+    supports_streaming = True
+    keyset_sort = ['-start_timestamp', '-id']
+
+    def get_all(self, requester_user, exclude_attributes=None, include_attributes=None, sort=None,
+                offset=0, limit=None, show_secrets=False, after=None, **raw_filters):
         """
         List all executions.
 
         Handles requests:
             GET /executions[?exclude_attributes=result,trigger_instance]
+            GET /executions[?include_attributes=id,status]
+            GET /executions[?after=<cursor>]
 
         :param exclude_attributes: Comma delimited string of attributes to exclude from the object.
         :type exclude_attributes: ``str``
+
+        :param include_attributes: Comma delimited string of attributes to include in the object.
+                                   Only those attributes are retrieved from the database.
+        :type include_attributes: ``str``
         """
         if exclude_attributes:
             exclude_fields = exclude_attributes.split(',')
         else:
             exclude_fields = None
 
+        if include_attributes:
+            include_fields = include_attributes.split(',')
+        else:
+            include_fields = None
+
         exclude_fields = self._validate_exclude_fields(exclude_fields=exclude_fields)
+        include_fields = self._validate_include_fields(include_fields=include_fields)
 
         # Use a custom sort order when filtering on a timestamp so we return a correct result as
         # expected by the user
@@ -431,12 +453,14 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
             'mask_secrets': self._get_mask_secrets(requester_user, show_secrets=show_secrets)
         }
         return self._get_action_executions(exclude_fields=exclude_fields,
+                                           include_fields=include_fields,
                                            from_model_kwargs=from_model_kwargs,
                                            sort=sort,
                                            offset=offset,
                                            limit=limit,
                                            query_options=query_options,
-                                           raw_filters=raw_filters)
+                                           raw_filters=raw_filters,
+                                           after=after)
 
     def get_one(self, id, requester_user, exclude_attributes=None, show_secrets=False):
         """
@@ -521,11 +545,15 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
         return ActionExecutionAPI.from_model(execution_db,
                                              mask_secrets=from_model_kwargs['mask_secrets'])
 
-    def _get_action_executions(self, exclude_fields=None, sort=None, offset=0, limit=None,
-                               query_options=None, raw_filters=None, from_model_kwargs=None):
+    def _get_action_executions(self, exclude_fields=None, include_fields=None, sort=None,
+                               offset=0, limit=None, query_options=None, raw_filters=None,
+                               from_model_kwargs=None, after=None):
         """
         :param exclude_fields: A list of object fields to exclude.
         :type exclude_fields: ``list``
+
+        :param include_fields: A list of object fields to include.
+        :type include_fields: ``list``
         """
 
         if limit is None:
@@ -535,12 +563,14 @@ class ActionExecutionsController(ActionExecutionsControllerMixin, ResourceContro
 
         LOG.debug('Retrieving all action executions with filters=%s', raw_filters)
         return super(ActionExecutionsController, self)._get_all(exclude_fields=exclude_fields,
+                                                                include_fields=include_fields,
                                                                 from_model_kwargs=from_model_kwargs,
                                                                 sort=sort,
                                                                 offset=offset,
                                                                 limit=limit,
                                                                 query_options=query_options,
-                                                                raw_filters=raw_filters)
+                                                                raw_filters=raw_filters,
+                                                                after=after)
 
 
 action_executions_controller = ActionExecutionsController()
@@ -183,6 +183,7 @@ class ApiKeyController(BaseRestControllerMixin):
 
         api_key_db.id = old_api_key_db.id
         api_key_db = ApiKey.add_or_update(api_key_db)
+        auth_util.invalidate_api_key(api_key_db)
 
         extra = {'old_api_key_db': old_api_key_db, 'new_api_key_db': api_key_db}
         LOG.audit('API Key updated. ApiKey.id=%s.' % (api_key_db.id), extra=extra)
@@ -205,6 +206,7 @@ class ApiKeyController(BaseRestControllerMixin):
                                                           permission_type=permission_type)
 
         ApiKey.delete(api_key_db)
+        auth_util.invalidate_api_key(api_key_db)
 
         extra = {'api_key_db': api_key_db}
         LOG.audit('ApiKey deleted. ApiKey.id=%s' % (api_key_db.id), extra=extra)
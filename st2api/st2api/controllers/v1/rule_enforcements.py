@@ -50,6 +50,8 @@ class RuleEnforcementController(resource.ResourceController):
         'sort': ['-enforced_at', 'rule.ref']
     }
 
+    keyset_sort = ['-enforced_at', '-id']
+
     supported_filters = SUPPORTED_FILTERS
     filter_transform_functions = {
         'enforced_at': lambda value: isotime.parse(value=value),
@@ -57,11 +59,12 @@ class RuleEnforcementController(resource.ResourceController):
         'enforced_at_lt': lambda value: isotime.parse(value=value)
     }
 
-    def get_all(self, sort=None, offset=0, limit=None, **raw_filters):
+    def get_all(self, sort=None, offset=0, limit=None, after=None, **raw_filters):
         return super(RuleEnforcementController, self)._get_all(sort=sort,
                                                                offset=offset,
                                                                limit=limit,
-                                                               raw_filters=raw_filters)
+                                                               raw_filters=raw_filters,
+                                                               after=after)
 
     def get_one(self, id, requester_user):
         return super(RuleEnforcementController,
@@ -37,7 +37,9 @@ class TracesController(ResourceController):
         'sort': ['-start_timestamp', 'trace_tag']
     }
 
-    def get_all(self, sort=None, offset=0, limit=None, **raw_filters):
+    keyset_sort = ['-start_timestamp', '-id']
+
+    def get_all(self, sort=None, offset=0, limit=None, after=None, **raw_filters):
         # Use a custom sort order when filtering on a timestamp so we return a correct result as
         # expected by the user
         query_options = None
@@ -50,7 +52,8 @@ class TracesController(ResourceController):
                              offset=offset,
                              limit=limit,
                              query_options=query_options,
-                             raw_filters=raw_filters)
+                             raw_filters=raw_filters,
+                             after=after)
 
     def get_one(self, id, requester_user):
         return self._get_one_by_id(id,
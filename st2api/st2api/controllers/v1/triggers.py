@@ -373,6 +373,9 @@ class TriggerInstanceController(TriggerInstanceControllerMixin, resource.Resourc
         'sort': ['-occurrence_time', 'trigger']
     }
 
+    supports_streaming = True
+    keyset_sort = ['-occurrence_time', '-id']
+
     def __init__(self):
         super(TriggerInstanceController, self).__init__()
 
@@ -385,20 +388,23 @@ class TriggerInstanceController(TriggerInstanceControllerMixin, resource.Resourc
         """
         return self._get_one_by_id(instance_id, permission_type=None, requester_user=None)
 
-    def get_all(self, sort=None, offset=0, limit=None, **raw_filters):
+    def get_all(self, sort=None, offset=0, limit=None, after=None, **raw_filters):
         """
             List all triggerinstances.
 
             Handles requests:
                 GET /triggerinstances/
+                GET /triggerinstances/?after=<cursor>
         """
         trigger_instances = self._get_trigger_instances(sort=sort,
                                                         offset=offset,
                                                         limit=limit,
-                                                        raw_filters=raw_filters)
+                                                        raw_filters=raw_filters,
+                                                        after=after)
         return trigger_instances
 
-    def _get_trigger_instances(self, sort=None, offset=0, limit=None, raw_filters=None):
+    def _get_trigger_instances(self, sort=None, offset=0, limit=None, raw_filters=None,
+                               after=None):
         if limit is None:
             limit = self.default_limit
 
@@ -408,7 +414,8 @@ class TriggerInstanceController(TriggerInstanceControllerMixin, resource.Resourc
         return super(TriggerInstanceController, self)._get_all(sort=sort,
                                                                offset=offset,
                                                                limit=limit,
-                                                               raw_filters=raw_filters)
+                                                               raw_filters=raw_filters,
+                                                               after=after)
 
 
 triggertype_controller = TriggerTypeController()
@@ -20,6 +20,7 @@ import datetime
 import bson
 import six
 from six.moves import http_client
+from oslo_config import cfg
 
 import st2tests.config as tests_config
 tests_config.parse_args()
@@ -119,6 +120,93 @@ class TestActionExecutionFilters(FunctionalTest):
         self.assertEqual(response.status_int, 200)
         self.assertFalse('result' in response.json[0])
 
+    def test_get_all_include_attributes(self):
+        path = '/v1/executions?action=executions.local&limit=1&include_attributes=status'
+        response = self.app.get(path)
+
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(len(response.json), 1)
+        self.assertItemsEqual(response.json[0].keys(), ['id', 'status'])
+
+        # Invalid include attribute
+        path = '/v1/executions?action=executions.local&limit=1&include_attributes=invalid'
+        response = self.app.get(path, expect_errors=True)
+
+        self.assertEqual(response.status_int, 400)
+        self.assertTrue('Invalid or unsupported attribute specified' in
+                        response.json['faultstring'])
+
+        # include_attributes and exclude_attributes are mutually exclusive
+        path = ('/v1/executions?action=executions.local&limit=1&include_attributes=status&'
+                'exclude_attributes=result')
+        response = self.app.get(path, expect_errors=True)
+
+        self.assertEqual(response.status_int, 400)
+
+    def test_get_all_streaming_response(self):
+        cfg.CONF.set_override(name='stream_list_responses', override=True, group='api')
+        self.addCleanup(cfg.CONF.set_override, name='stream_list_responses', override=False,
+                        group='api')
+
+        response = self.app.get('/v1/executions?limit=10')
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(len(response.json), 10)
+        self.assertEqual(response.headers['X-Total-Count'], str(self.num_records))
+
+        response = self.app.get('/v1/executions')
+        ids = [item['id'] for item in response.json]
+        self.assertListEqual(sorted(ids), sorted(self.refs.keys()))
+
+    def test_get_all_total_count(self):
+        self.addCleanup(cfg.CONF.set_override, name='list_total_count', override='exact',
+                        group='api')
+
+        # Only objects up to the end of the next page are counted
+        cfg.CONF.set_override(name='list_total_count', override='estimated', group='api')
+        response = self.app.get('/v1/executions?limit=10&offset=20')
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(len(response.json), 10)
+        self.assertEqual(response.headers['X-Total-Count'], '40')
+
+        response = self.app.get('/v1/executions?limit=10&offset=85')
+        self.assertEqual(response.headers['X-Total-Count'], str(self.num_records))
+
+        cfg.CONF.set_override(name='list_total_count', override='off', group='api')
+        response = self.app.get('/v1/executions?limit=10')
+        self.assertEqual(response.status_int, 200)
+        self.assertEqual(len(response.json), 10)
+        self.assertFalse('X-Total-Count' in response.headers)
+
+    def test_get_all_keyset_pagination(self):
+        ids = []
+        cursor = ''
+
+        while True:
+            response = self.app.get('/v1/executions?limit=30&after=%s' % (cursor))
+            self.assertEqual(response.status_int, 200)
+            self.assertFalse('X-Total-Count' in response.headers)
+            ids.extend([item['id'] for item in response.json])
+
+            cursor = response.headers.get('X-Next-Cursor', None)
+            if not cursor:
+                break
+
+        self.assertEqual(len(ids), self.num_records)
+        self.assertListEqual(sorted(ids), sorted(self.refs.keys()))
+
+        # Results are sorted by start_timestamp (descending)
+        timestamps = [self.refs[id].start_timestamp for id in ids]
+        self.assertListEqual(timestamps, sorted(timestamps, reverse=True))
+
+        # Cursor can't be used together with offset
+        response = self.app.get('/v1/executions?limit=30&offset=30&after=', expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+
+        # Invalid cursor
+        response = self.app.get('/v1/executions?limit=30&after=invalid', expect_errors=True)
+        self.assertEqual(response.status_int, 400)
+        self.assertTrue('Invalid cursor' in response.json['faultstring'])
+
     def test_get_one(self):
         obj_id = random.choice(self.refs.keys())
         response = self.app.get('/v1/executions/%s' % obj_id)
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import os
+import copy
 import json
 import logging
 from functools import wraps
@@ -194,6 +195,38 @@ class ResourceManager(object):
         return [self.resource.deserialize(item)
                 for item in response.json()]
 
+    @add_auth_token_to_kwargs_from_env
+    def iterate(self, page_size=100, **kwargs):
+        """
+        Iterate over all the resources using cursor based pagination.
+
+        Pages are retrieved lazily which makes this method suitable for iterating over a large
+        number of resources. Only supported by the resources which support the "after" argument
+        (executions, trigger instances, traces and rule enforcements).
+
+        :param page_size: Number of resources retrieved in a single request.
+        :type page_size: ``int``
+        """
+        url = '/%s' % self.resource.get_url_path_name()
+
+        params = kwargs.pop('params', {})
+        cursor = ''
+
+        while cursor is not None:
+            page_params = copy.copy(params)
+            page_params['limit'] = page_size
+            page_params['after'] = cursor
+
+            response = self.client.get(url=url, params=page_params, **kwargs)
+            if response.status_code != 200:
+                self.handle_error(response)
+
+            for item in response.json():
+                yield self.resource.deserialize(item)
+
+            # Header is only included if there might be more results available
+            cursor = response.headers.get('X-Next-Cursor', None) or None
+
     @add_auth_token_to_kwargs_from_env
     def get_by_id(self, id, **kwargs):
         url = '/%s/%s' % (self.resource.get_url_path_name(), id)
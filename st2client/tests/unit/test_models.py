@@ -68,6 +68,28 @@ class TestResourceManager(unittest2.TestCase):
         mgr = models.ResourceManager(base.FakeResource, base.FAKE_ENDPOINT)
         self.assertRaises(Exception, mgr.get_all)
 
+    def test_resource_iterate(self):
+        responses = [
+            base.FakeResponse(json.dumps(base.RESOURCES[:1]), 200, 'OK',
+                              headers={'X-Next-Cursor': 'cursor1'}),
+            base.FakeResponse(json.dumps(base.RESOURCES[1:]), 200, 'OK')
+        ]
+        mgr = models.ResourceManager(base.FakeResource, base.FAKE_ENDPOINT)
+
+        with mock.patch.object(httpclient.HTTPClient, 'get',
+                               mock.MagicMock(side_effect=responses)) as mock_get:
+            resources = mgr.iterate(page_size=1, params={'status': 'succeeded'})
+            actual = [resource.serialize() for resource in resources]
+
+        expected = json.loads(json.dumps(base.RESOURCES))
+        self.assertListEqual(actual, expected)
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get.call_args_list[0][1]['params'],
+                         {'status': 'succeeded', 'limit': 1, 'after': ''})
+        self.assertEqual(mock_get.call_args_list[1][1]['params'],
+                         {'status': 'succeeded', 'limit': 1, 'after': 'cursor1'})
+
     @mock.patch.object(
         httpclient.HTTPClient, 'get',
         mock.MagicMock(return_value=base.FakeResponse(json.dumps(base.RESOURCES[0]), 200, 'OK')))
@@ -33,6 +33,7 @@ from st2common.script_setup import teardown as common_teardown
 from st2common.constants.exit_codes import SUCCESS_EXIT_CODE
 from st2common.constants.exit_codes import FAILURE_EXIT_CODE
 from st2common.garbage_collection.executions import purge_executions
+from st2common.garbage_collection.executions import purge_orphaned_execution_states
 
 LOG = logging.getLogger(__name__)
 
@@ -79,8 +80,12 @@ def main():
         timestamp = timestamp.replace(tzinfo=pytz.UTC)
 
     try:
-        purge_executions(logger=LOG, timestamp=timestamp, action_ref=action_ref,
-                         purge_incomplete=purge_incomplete)
+        deleted_liveaction_count = purge_executions(logger=LOG, timestamp=timestamp,
+                                                    action_ref=action_ref,
+                                                    purge_incomplete=purge_incomplete)
+
+        if deleted_liveaction_count:
+            purge_orphaned_execution_states(logger=LOG)
     except Exception as e:
         LOG.exception(str(e))
         return FAILURE_EXIT_CODE
@@ -50,7 +50,13 @@ def register_opts(ignore_errors=False):
         cfg.BoolOpt('sync_remote_groups', default=False,
                     help=('True to synchronize remote groups returned by the auth backed for each '
                           'StackStorm user with local StackStorm roles based on the group to role '
-                          'mapping definition files.'))
+                          'mapping definition files.')),
+        cfg.BoolOpt('permission_cache_enabled', default=False,
+                    help=('True to cache resolved user roles and permission grants in memory in '
+                          'the API service. Cached permissions are invalidated from the RBAC CUD '
+                          'events.')),
+        cfg.IntOpt('permission_cache_ttl', default=60,
+                   help='Number of seconds after which cached user permissions expire.')
     ]
     do_register_opts(rbac_opts, 'rbac', ignore_errors)
 
@@ -81,7 +87,11 @@ def register_opts(ignore_errors=False):
         cfg.BoolOpt('validate_trigger_payload', default=False,
                     help=('True to validate payload for non-system trigger types when dispatching'
                           'a trigger inside the sensor. By default, only payload for system '
-                          'triggers is validated.'))
+                          'triggers is validated.')),
+        cfg.IntOpt('execution_references_cache_ttl', default=10,
+                   help=('Number of seconds for which rule, trigger and trigger type objects '
+                         'referenced by new action executions are cached in memory. Set to 0 to '
+                         'disable the cache.'))
     ]
     do_register_opts(system_opts, 'system', ignore_errors)
 
@@ -190,7 +200,17 @@ def register_opts(ignore_errors=False):
         cfg.ListOpt('allow_origin', default=['http://127.0.0.1:3000'],
                     help='List of origins allowed for api, auth and stream'),
         cfg.BoolOpt('mask_secrets', default=True,
-                    help='True to mask secrets in the API responses')
+                    help='True to mask secrets in the API responses'),
+        cfg.StrOpt('response_validation', default='full',
+                   choices=['off', 'sampled', 'full'],
+                   help=('Validation of the API responses against the API spec. "off" disables '
+                         'it, "sampled" only validates a portion of the responses (see '
+                         'response_validation_sample_rate) and "full" validates all the '
+                         'responses. Validation failures are logged and reported using the '
+                         'Warning response header.')),
+        cfg.FloatOpt('response_validation_sample_rate', default=0.1,
+                     help=('Portion (0.0 - 1.0) of the API responses which are validated when '
+                           'response_validation is "sampled".'))
     ]
     do_register_opts(api_opts, 'api', ignore_errors)
 
@@ -201,7 +221,15 @@ def register_opts(ignore_errors=False):
         cfg.StrOpt('encryption_key_path', default='',
                    help='Location of the symmetric encryption key for encrypting values in ' +
                         'kvstore. This key should be in JSON and should\'ve been ' +
-                        'generated using keyczar.')
+                        'generated using keyczar.'),
+        cfg.BoolOpt('cache_enabled', default=False,
+                    help='True to cache datastore values in memory in the services which read '
+                         'them (e.g. rules engine and action runner). Cached values are '
+                         'invalidated from the key value pair CUD events.'),
+        cfg.IntOpt('cache_ttl', default=60,
+                   help='Number of seconds after which a cached datastore value expires.'),
+        cfg.IntOpt('cache_max_size', default=10000,
+                   help='Maximum number of datastore values to keep in the cache.')
     ]
     do_register_opts(keyvalue_opts, group='keyvalue')
 
@@ -210,7 +238,12 @@ def register_opts(ignore_errors=False):
         cfg.StrOpt('api_url', default=None,
                    help='Base URL to the API endpoint excluding the version'),
         cfg.BoolOpt('enable', default=True, help='Enable authentication middleware.'),
-        cfg.IntOpt('token_ttl', default=86400, help='Access token ttl in seconds.')
+        cfg.IntOpt('token_ttl', default=86400, help='Access token ttl in seconds.'),
+        cfg.IntOpt('validation_cache_ttl', default=10,
+                   help=('Number of seconds for which validated tokens and API keys are cached in '
+                         'memory. Set to 0 to disable the cache.')),
+        cfg.IntOpt('validation_cache_max_size', default=1000,
+                   help='Maximum number of validated tokens and API keys to cache in memory.')
     ]
     do_register_opts(auth_opts, 'auth', ignore_errors)
 
@@ -227,7 +260,11 @@ def register_opts(ignore_errors=False):
                    help='Virtualenv binary which should be used to create pack virtualenvs.'),
         cfg.ListOpt('virtualenv_opts', default=['--system-site-packages'],
                     help='List of virtualenv options to be passsed to "virtualenv" command that ' +
-                         'creates pack virtualenv.')
+                         'creates pack virtualenv.'),
+        cfg.BoolOpt('python_runner_prefork', default=False,
+                    help='True to run Python actions in processes forked from a pre-started '
+                         'interpreter (one per pack virtualenv) instead of starting a new '
+                         'interpreter for each execution.')
     ]
     do_register_opts(action_runner_opts, group='actionrunner')
 
@@ -15,6 +15,8 @@
 
 __all__ = [
     'DEFAULT_COLLECTION_INTERVAL',
+    'DEFAULT_PURGE_BATCH_SIZE',
+    'DEFAULT_PURGE_BATCH_SLEEP_DELAY',
     'MINIMUM_TTL_DAYS'
 ]
 
@@ -22,5 +24,11 @@ __all__ = [
 # Default garbage collection interval (in seconds)
 DEFAULT_COLLECTION_INTERVAL = 600
 
+# Maximum number of objects which are deleted with a single query
+DEFAULT_PURGE_BATCH_SIZE = 1000
+
+# How long to sleep (in seconds) between deleting two batches of objects
+DEFAULT_PURGE_BATCH_SLEEP_DELAY = 0.1
+
 # Minimum value for the TTL. If user supplies value lower than this, we will throw.
 MINIMUM_TTL_DAYS = 7
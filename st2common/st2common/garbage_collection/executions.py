@@ -14,20 +14,26 @@
 # limitations under the License.
 
 """
-Module with utility functions for purging old action executions and
-corresponding live action objects.
+Module with utility functions for purging old action executions, corresponding live action
+objects and orphaned execution state objects.
 """
 
 import copy
 
+import eventlet
 from mongoengine.errors import InvalidQueryError
 
 from st2common.constants import action as action_constants
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SLEEP_DELAY
+from st2common.garbage_collection.utils import delete_by_query_in_batches
 from st2common.persistence.liveaction import LiveAction
 from st2common.persistence.execution import ActionExecution
+from st2common.persistence.executionstate import ActionExecutionState
 
 __all__ = [
-    'purge_executions'
+    'purge_executions',
+    'purge_orphaned_execution_states'
 ]
 
 DONE_STATES = [action_constants.LIVEACTION_STATUS_SUCCEEDED,
@@ -36,7 +42,9 @@ DONE_STATES = [action_constants.LIVEACTION_STATUS_SUCCEEDED,
                action_constants.LIVEACTION_STATUS_CANCELED]
 
 
-def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False):
+def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False,
+                     batch_size=DEFAULT_PURGE_BATCH_SIZE,
+                     batch_sleep_delay=DEFAULT_PURGE_BATCH_SLEEP_DELAY):
     """
     :param timestamp: Exections older than this timestamp will be deleted.
     :type timestamp: ``datetime.datetime
@@ -46,6 +54,15 @@ def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False)
 
     :param purge_incomplete: True to also delete executions which are not in a done state.
     :type purge_incomplete: ``bool``
+
+    :param batch_size: Maximum number of objects to delete with a single query.
+    :type batch_size: ``int``
+
+    :param batch_sleep_delay: How long to sleep between two delete queries (in seconds).
+    :type batch_sleep_delay: ``float``
+
+    :return: Number of deleted live action objects.
+    :rtype: ``int``
     """
     if not timestamp:
         raise ValueError('Specify a valid timestamp to purge.')
@@ -71,7 +88,10 @@ def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False)
         liveaction_filters['action'] = action_ref
 
     try:
-        deleted_count = ActionExecution.delete_by_query(**exec_filters)
+        deleted_count = delete_by_query_in_batches(ActionExecution, logger=logger,
+                                                   batch_size=batch_size,
+                                                   batch_sleep_delay=batch_sleep_delay,
+                                                   **exec_filters)
     except InvalidQueryError as e:
         msg = ('Bad query (%s) used to delete execution instances: %s'
                'Please contact support.' % (exec_filters, str(e)))
@@ -82,8 +102,13 @@ def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False)
     else:
         logger.info('Deleted %s action execution objects' % (deleted_count))
 
+    deleted_liveaction_count = 0
+
     try:
-        deleted_count = LiveAction.delete_by_query(**liveaction_filters)
+        deleted_liveaction_count = delete_by_query_in_batches(LiveAction, logger=logger,
+                                                              batch_size=batch_size,
+                                                              batch_sleep_delay=batch_sleep_delay,
+                                                              **liveaction_filters)
     except InvalidQueryError as e:
         msg = ('Bad query (%s) used to delete liveaction instances: %s'
                'Please contact support.' % (liveaction_filters, str(e)))
@@ -92,10 +117,10 @@ def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False)
         logger.exception('Deletion of liveaction models failed for query with filters: %s.',
                          liveaction_filters)
     else:
-        logger.info('Deleted %s liveaction objects' % (deleted_count))
+        logger.info('Deleted %s liveaction objects' % (deleted_liveaction_count))
 
-    zombie_execution_instances = len(ActionExecution.query(**exec_filters))
-    zombie_liveaction_instances = len(LiveAction.query(**liveaction_filters))
+    zombie_execution_instances = ActionExecution.count(**exec_filters)
+    zombie_liveaction_instances = LiveAction.count(**liveaction_filters)
 
     if (zombie_execution_instances > 0) or (zombie_liveaction_instances > 0):
         logger.error('Zombie execution instances left: %d.', zombie_execution_instances)
@@ -103,3 +128,58 @@ def purge_executions(logger, timestamp, action_ref=None, purge_incomplete=False)
 
     # Print stats
     logger.info('All execution models older than timestamp %s were deleted.', timestamp)
+
+    return deleted_liveaction_count
+
+
+def purge_orphaned_execution_states(logger, batch_size=DEFAULT_PURGE_BATCH_SIZE,
+                                    batch_sleep_delay=DEFAULT_PURGE_BATCH_SLEEP_DELAY):
+    """
+    Delete execution state objects which reference a liveaction which doesn't exist anymore.
+
+    :param batch_size: Maximum number of objects to check and delete with a single query.
+    :type batch_size: ``int``
+
+    :param batch_sleep_delay: How long to sleep between two batches (in seconds).
+    :type batch_sleep_delay: ``float``
+
+    :return: Number of deleted objects.
+    :rtype: ``int``
+    """
+    logger.info('Purging orphaned execution states')
+
+    deleted_count = 0
+    last_id = None
+
+    while True:
+        filters = {}
+        if last_id:
+            filters['id__gt'] = last_id
+
+        queryset = ActionExecutionState.query(order_by=['id'], limit=batch_size, **filters)
+        states = list(queryset.only('id', 'execution_id').scalar('id', 'execution_id'))
+
+        if not states:
+            break
+
+        liveaction_ids = [execution_id for _, execution_id in states]
+        queryset = LiveAction.query(id__in=liveaction_ids)
+        existing_liveaction_ids = set(queryset.only('id').scalar('id'))
+
+        orphaned_state_ids = [state_id for state_id, execution_id in states
+                              if execution_id not in existing_liveaction_ids]
+
+        if orphaned_state_ids:
+            deleted_count += ActionExecutionState.delete_by_query(id__in=orphaned_state_ids)
+
+        last_id = states[-1][0]
+
+        if len(states) < batch_size:
+            break
+
+        if batch_sleep_delay:
+            eventlet.sleep(batch_sleep_delay)
+
+    logger.info('Deleted %s orphaned execution state objects' % (deleted_count))
+
+    return deleted_count
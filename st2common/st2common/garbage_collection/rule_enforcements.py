@@ -0,0 +1,67 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module with utility functions for purging old rule enforcement objects.
+"""
+
+from mongoengine.errors import InvalidQueryError
+
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SLEEP_DELAY
+from st2common.garbage_collection.utils import delete_by_query_in_batches
+from st2common.persistence.rule_enforcement import RuleEnforcement
+
+__all__ = [
+    'purge_rule_enforcements'
+]
+
+
+def purge_rule_enforcements(logger, timestamp, batch_size=DEFAULT_PURGE_BATCH_SIZE,
+                            batch_sleep_delay=DEFAULT_PURGE_BATCH_SLEEP_DELAY):
+    """
+    :param timestamp: Rule enforcements older than this timestamp will be deleted.
+    :type timestamp: ``datetime.datetime
+
+    :param batch_size: Maximum number of objects to delete with a single query.
+    :type batch_size: ``int``
+
+    :param batch_sleep_delay: How long to sleep between two delete queries (in seconds).
+    :type batch_sleep_delay: ``float``
+    """
+    if not timestamp:
+        raise ValueError('Specify a valid timestamp to purge.')
+
+    logger.info('Purging rule enforcements older than timestamp: %s' %
+                timestamp.strftime('%Y-%m-%dT%H:%M:%S.%fZ'))
+
+    query_filters = {'enforced_at__lt': timestamp}
+
+    try:
+        deleted_count = delete_by_query_in_batches(RuleEnforcement, logger=logger,
+                                                   batch_size=batch_size,
+                                                   batch_sleep_delay=batch_sleep_delay,
+                                                   **query_filters)
+    except InvalidQueryError as e:
+        msg = ('Bad query (%s) used to delete rule enforcements: %s'
+               'Please contact support.' % (query_filters, str(e)))
+        raise InvalidQueryError(msg)
+    except:
+        logger.exception('Deleting instances using query_filters %s failed.', query_filters)
+    else:
+        logger.info('Deleted %s rule enforcement objects' % (deleted_count))
+
+    # Print stats
+    logger.info('All rule enforcement models older than timestamp %s were deleted.', timestamp)
@@ -19,6 +19,9 @@ Module with utility functions for purging old trigger instance objects.
 
 from mongoengine.errors import InvalidQueryError
 
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SLEEP_DELAY
+from st2common.garbage_collection.utils import delete_by_query_in_batches
 from st2common.persistence.trigger import TriggerInstance
 from st2common.util import isotime
 
@@ -27,10 +30,17 @@ __all__ = [
 ]
 
 
-def purge_trigger_instances(logger, timestamp):
+def purge_trigger_instances(logger, timestamp, batch_size=DEFAULT_PURGE_BATCH_SIZE,
+                            batch_sleep_delay=DEFAULT_PURGE_BATCH_SLEEP_DELAY):
     """
     :param timestamp: Trigger instances older than this timestamp will be deleted.
     :type timestamp: ``datetime.datetime
+
+    :param batch_size: Maximum number of objects to delete with a single query.
+    :type batch_size: ``int``
+
+    :param batch_sleep_delay: How long to sleep between two delete queries (in seconds).
+    :type batch_sleep_delay: ``float``
     """
     if not timestamp:
         raise ValueError('Specify a valid timestamp to purge.')
@@ -41,7 +51,10 @@ def purge_trigger_instances(logger, timestamp):
     query_filters = {'occurrence_time__lt': isotime.parse(timestamp)}
 
     try:
-        deleted_count = TriggerInstance.delete_by_query(**query_filters)
+        deleted_count = delete_by_query_in_batches(TriggerInstance, logger=logger,
+                                                   batch_size=batch_size,
+                                                   batch_sleep_delay=batch_sleep_delay,
+                                                   **query_filters)
     except InvalidQueryError as e:
         msg = ('Bad query (%s) used to delete trigger instances: %s'
                'Please contact support.' % (query_filters, str(e)))
@@ -0,0 +1,89 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module with utility functions shared by the purge functions.
+"""
+
+import copy
+
+import eventlet
+
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SLEEP_DELAY
+
+__all__ = [
+    'delete_by_query_in_batches'
+]
+
+
+def delete_by_query_in_batches(model_cls, logger, batch_size=DEFAULT_PURGE_BATCH_SIZE,
+                               batch_sleep_delay=DEFAULT_PURGE_BATCH_SLEEP_DELAY, **filters):
+    """
+    Delete objects which match the provided filters in id ordered batches.
+
+    Deleting a large number of objects using a single query can keep the database busy for a
+    long time so we only delete up to ``batch_size`` objects at once and sleep between the
+    batches to give other queries a chance to run.
+
+    :param model_cls: Persistence class of the objects to delete.
+    :type model_cls: :class:`st2common.persistence.base.Access`
+
+    :param batch_size: Maximum number of objects to delete with a single query.
+    :type batch_size: ``int``
+
+    :param batch_sleep_delay: How long to sleep between two batches (in seconds).
+    :type batch_sleep_delay: ``float``
+
+    :return: Number of deleted objects.
+    :rtype: ``int``
+    """
+    if batch_size < 1:
+        raise ValueError('Batch size needs to be a positive integer.')
+
+    deleted_count = 0
+    batch_count = 0
+    last_id = None
+
+    while True:
+        batch_filters = copy.copy(filters)
+        if last_id:
+            batch_filters['id__gt'] = last_id
+
+        queryset = model_cls.query(order_by=['id'], limit=batch_size, **batch_filters)
+        object_ids = list(queryset.only('id').scalar('id'))
+
+        if not object_ids:
+            break
+
+        # Note: We also include original filters in the delete query so we don't delete objects
+        # which have been updated between the two queries and don't match the filters anymore
+        delete_filters = copy.copy(filters)
+        delete_filters['id__in'] = object_ids
+        deleted_count += model_cls.delete_by_query(**delete_filters)
+
+        batch_count += 1
+        last_id = object_ids[-1]
+
+        logger.debug('Deleted %s %s objects so far (%s batches).', deleted_count,
+                     model_cls.__name__, batch_count)
+
+        if len(object_ids) < batch_size:
+            break
+
+        if batch_sleep_delay:
+            eventlet.sleep(batch_sleep_delay)
+
+    return deleted_count
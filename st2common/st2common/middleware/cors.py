@@ -68,7 +68,7 @@ class CorsMiddleware(object):
             methods_allowed = ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS']
             request_headers_allowed = ['Content-Type', 'Authorization', HEADER_ATTRIBUTE_NAME,
                                        HEADER_API_KEY_ATTRIBUTE_NAME, REQUEST_ID_HEADER]
-            response_headers_allowed = ['Content-Type', 'X-Limit', 'X-Total-Count',
+            response_headers_allowed = ['Content-Type', 'X-Limit', 'X-Total-Count', 'X-Next-Cursor',
                                         REQUEST_ID_HEADER]
 
             headers['Access-Control-Allow-Origin'] = origin_allowed
@@ -18,12 +18,14 @@ import importlib
 import traceback
 import ssl as ssl_lib
 
+import bson
 import six
 import mongoengine
 from pymongo.errors import OperationFailure
 
 from st2common import log as logging
 from st2common.util import isotime
+from st2common.util import mongoescape
 from st2common.models.db import stormbase
 from st2common.models.utils.profiling import log_query_and_profile_data_for_queryset
 from st2common.exceptions.db import StackStormDBObjectNotFoundError
@@ -237,8 +239,9 @@ class MongoDBAccess(object):
     def get_by_name(self, value):
         return self.get(name=value, raise_exception=True)
 
-    def get_by_id(self, value):
-        return self.get(id=value, raise_exception=True)
+    def get_by_id(self, value, only_fields=None, exclude_fields=None):
+        return self.get(id=value, only_fields=only_fields, exclude_fields=exclude_fields,
+                        raise_exception=True)
 
     def get_by_uid(self, value):
         return self.get(uid=value, raise_exception=True)
@@ -249,7 +252,7 @@ class MongoDBAccess(object):
     def get_by_pack(self, value):
         return self.get(pack=value, raise_exception=True)
 
-    def get(self, exclude_fields=None, *args, **kwargs):
+    def get(self, exclude_fields=None, only_fields=None, *args, **kwargs):
         raise_exception = kwargs.pop('raise_exception', False)
 
         instances = self.model.objects(**kwargs)
@@ -257,6 +260,9 @@ class MongoDBAccess(object):
         if exclude_fields:
             instances = instances.exclude(*exclude_fields)
 
+        if only_fields:
+            instances = instances.only(*only_fields)
+
         instance = instances[0] if instances else None
         log_query_and_profile_data_for_queryset(queryset=instances)
 
@@ -275,9 +281,15 @@ class MongoDBAccess(object):
         return result
 
     def query(self, offset=0, limit=None, order_by=None, exclude_fields=None,
-              **filters):
+              only_fields=None, q_obj=None, **filters):
+        """
+        :param q_obj: Optional mongoengine Q object (e.g. a combination of conditions using the OR
+                      operator) which is used together with the provided filters.
+        :type q_obj: :class:`mongoengine.queryset.visitor.Q`
+        """
         order_by = order_by or []
         exclude_fields = exclude_fields or []
+        only_fields = only_fields or []
         eop = offset + int(limit) if limit else None
 
         # Process the filters
@@ -286,17 +298,31 @@ class MongoDBAccess(object):
         filters, order_by = self._process_datetime_range_filters(filters=filters, order_by=order_by)
         filters = self._process_null_filters(filters=filters)
 
-        result = self.model.objects(**filters)
+        result = self.model.objects(q_obj, **filters)
 
         if exclude_fields:
             result = result.exclude(*exclude_fields)
 
+        if only_fields:
+            result = result.only(*only_fields)
+
         result = result.order_by(*order_by)
         result = result[offset:eop]
         log_query_and_profile_data_for_queryset(queryset=result)
 
         return result
 
+    def load_fields(self, instance, fields):
+        """
+        Retrieve the provided fields for an instance which has been retrieved with a field
+        projection (``only_fields`` / ``exclude_fields``).
+
+        This allows callers to lazily load large fields (e.g. execution result) only when they
+        are actually needed.
+        """
+        instance.reload(*fields)
+        return instance
+
     def distinct(self, *args, **kwargs):
         field = kwargs.pop('field')
         result = self.model.objects(**kwargs).distinct(field)
@@ -310,6 +336,35 @@ class MongoDBAccess(object):
         instance = self.model.objects.insert(instance)
         return self._undo_dict_field_escape(instance)
 
+    def insert_many(self, instances):
+        """
+        Insert multiple new objects using a single bulk insert.
+
+        Ids are assigned to the objects before the insert so the inserted objects don't need to
+        be loaded back from the database. Bulk insert is ordered and stops on the first error. In
+        that case ids of the objects which haven't been inserted are reset to ``None`` before the
+        exception is propagated.
+        """
+        for instance in instances:
+            instance.id = bson.ObjectId()
+
+            # Setting an id marks the object as an existing one
+            instance._created = True
+
+        try:
+            self.model.objects.insert(instances, load_bulk=False)
+        except Exception:
+            self._reset_ids_of_not_inserted_instances(instances)
+            raise
+
+        for instance in instances:
+            # Inserted objects should behave the same as the objects loaded from the database
+            # (e.g. save() should update an existing document)
+            instance._created = False
+            instance._clear_changed_fields()
+
+        return [self._undo_dict_field_escape(instance) for instance in instances]
+
     def add_or_update(self, instance):
         instance.save()
         return self._undo_dict_field_escape(instance)
@@ -317,6 +372,17 @@ class MongoDBAccess(object):
     def update(self, instance, **kwargs):
         return instance.update(**kwargs)
 
+    def find_one_and_update(self, filters, **kwargs):
+        """
+        Atomically update a single object which matches the provided filters and return the
+        updated object using a single database round trip.
+
+        :return: Updated object or ``None`` if no object matches the filters.
+        """
+        instances = self.model.objects(**filters)
+        log_query_and_profile_data_for_queryset(queryset=instances)
+        return instances.modify(new=True, **kwargs)
+
     def delete(self, instance):
         return instance.delete()
 
@@ -330,10 +396,31 @@ class MongoDBAccess(object):
 
         return count
 
+    def _reset_ids_of_not_inserted_instances(self, instances):
+        ids = [instance.id for instance in instances]
+
+        try:
+            inserted_ids = set(self.model.objects(id__in=ids).distinct('id'))
+        except Exception:
+            LOG.exception('Failed to retrieve ids of the inserted %s objects.',
+                          self.model.__name__)
+            inserted_ids = set([])
+
+        for instance in instances:
+            if instance.id not in inserted_ids:
+                instance.id = None
+                instance._created = True
+
     def _undo_dict_field_escape(self, instance):
         for attr, field in instance._fields.iteritems():
             if isinstance(field, stormbase.EscapedDictField):
                 value = getattr(instance, attr)
+
+                # Escaping doesn't modify the value in place so in most cases there is nothing to
+                # undo and we can avoid converting (potentially very large) value again
+                if mongoescape.unescape_chars(value) is value:
+                    continue
+
                 setattr(instance, attr, field.to_python(value))
         return instance
 
@@ -83,7 +83,8 @@ class ActionExecutionDB(stormbase.StormFoundationDB):
             {'fields': ['trigger.name']},
             {'fields': ['trigger_type.name']},
             {'fields': ['context.user']},
-            {'fields': ['-start_timestamp', 'action.ref', 'status']}
+            {'fields': ['-start_timestamp', 'action.ref', 'status']},
+            {'fields': ['-start_timestamp', '-id']}
         ]
     }
 
@@ -87,6 +87,7 @@ class TraceDB(stormbase.StormFoundationDB, stormbase.UIDFieldMixin):
             {'fields': ['trigger_instances.object_id']},
             {'fields': ['rules.object_id']},
             {'fields': ['-start_timestamp', 'trace_tag']},
+            {'fields': ['-start_timestamp', '-id']},
         ]
     }
 
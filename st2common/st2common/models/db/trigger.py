@@ -122,6 +122,7 @@ class TriggerInstanceDB(stormbase.StormFoundationDB):
             {'fields': ['occurrence_time']},
             {'fields': ['trigger']},
             {'fields': ['-occurrence_time', 'trigger']},
+            {'fields': ['-occurrence_time', '-id']},
             {'fields': ['status']}
         ]
     }
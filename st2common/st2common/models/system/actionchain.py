@@ -19,6 +19,9 @@ import string
 from st2common.util import schema as util_schema
 from st2common.models.api.notification import NotificationSubSchemaAPI
 
+JOIN_ALL = 'all'
+JOIN_ANY = 'any'
+
 
 class Node(object):
 
@@ -34,8 +37,25 @@ class Node(object):
             },
             "ref": {
                 "type": "string",
-                "description": "Ref of the action to be executed.",
-                "required": True
+                "description": "Ref of the action to be executed. Required unless the node is "
+                               "a parallel node."
+            },
+            "parallel": {
+                "type": "array",
+                "description": "Names of the nodes which are executed in parallel. Each of the "
+                               "nodes executes a single action and can't specify on-success "
+                               "or on-failure.",
+                "items": {
+                    "type": "string"
+                }
+            },
+            "join": {
+                "type": "string",
+                "description": "Whether all the parallel nodes need to succeed (all) or the "
+                               "first one to succeed is enough (any). Remaining nodes are "
+                               "canceled in the latter case.",
+                "enum": [JOIN_ALL, JOIN_ANY],
+                "default": JOIN_ALL
             },
             "params": {
                 "type": "object",
@@ -101,6 +121,18 @@ class Node(object):
                    'both')
             raise ValueError(msg)
 
+        if bool(self.ref) == bool(self.parallel):
+            msg = ('Either "ref" or "parallel" attribute needs to be provided in node "%s", but '
+                   'not both' % (self.name))
+            raise ValueError(msg)
+
+        if self.parallel and (params or parameters):
+            msg = 'Parallel node "%s" can\'t specify parameters' % (self.name)
+            raise ValueError(msg)
+
+        if not self.join:
+            self.join = JOIN_ALL
+
         return self
 
     def get_parameters(self):
@@ -20,9 +20,13 @@ from st2common.util import date as date_utils
 
 __all__ = [
     'get_operator',
-    'get_allowed_operators'
+    'get_allowed_operators',
+    'compile_regex_pattern'
 ]
 
+# Type of the objects returned by re.compile
+REGEX_PATTERN_TYPE = type(re.compile(''))
+
 
 def get_allowed_operators():
     return operators
@@ -35,6 +39,30 @@ def get_operator(op):
     else:
         raise Exception('Invalid operator: ' + op)
 
+
+def compile_regex_pattern(op, criteria_pattern):
+    """
+    Compile the provided pattern for a regex based operator.
+
+    Result can be passed to the operator function instead of a string pattern which means the
+    pattern is not compiled again on every evaluation.
+
+    :return: Compiled pattern or ``None`` if the operator is not a regex based operator.
+    """
+    flags = regex_operators_flags.get(op.lower(), None)
+
+    if flags is None:
+        return None
+
+    return re.compile(criteria_pattern, flags)
+
+
+def _get_regex(criteria_pattern, flags):
+    if isinstance(criteria_pattern, REGEX_PATTERN_TYPE):
+        return criteria_pattern
+
+    return re.compile(criteria_pattern, flags)
+
 # Operation implementations
 
 
@@ -125,7 +153,7 @@ def match_regex(value, criteria_pattern):
     # match_regex is deprecated, please use 'regex' and 'iregex'
     if criteria_pattern is None:
         return False
-    regex = re.compile(criteria_pattern, re.DOTALL)
+    regex = _get_regex(criteria_pattern, regex_operators_flags[MATCH_REGEX])
     # check for a match and not for details of the match.
     return regex.match(value) is not None
 
@@ -133,7 +161,7 @@ def match_regex(value, criteria_pattern):
 def regex(value, criteria_pattern):
     if criteria_pattern is None:
         return False
-    regex = re.compile(criteria_pattern)
+    regex = _get_regex(criteria_pattern, regex_operators_flags[REGEX])
     # check for a match and not for details of the match.
     return regex.search(value) is not None
 
@@ -141,7 +169,7 @@ def regex(value, criteria_pattern):
 def iregex(value, criteria_pattern):
     if criteria_pattern is None:
         return False
-    regex = re.compile(criteria_pattern, re.IGNORECASE)
+    regex = _get_regex(criteria_pattern, regex_operators_flags[IREGEX])
     # check for a match and not for details of the match.
     return regex.search(value) is not None
 
@@ -247,3 +275,10 @@ operators = {
     KEY_EXISTS: exists,
     KEY_NOT_EXISTS: nexists
 }
+
+# regex flags used by the regex based operators
+regex_operators_flags = {
+    MATCH_REGEX: re.DOTALL,
+    REGEX: 0,
+    IREGEX: re.IGNORECASE
+}
@@ -82,8 +82,9 @@ class Access(object):
         return cls._get_impl().get_by_name(value)
 
     @classmethod
-    def get_by_id(cls, value):
-        return cls._get_impl().get_by_id(value)
+    def get_by_id(cls, value, only_fields=None, exclude_fields=None):
+        return cls._get_impl().get_by_id(value, only_fields=only_fields,
+                                         exclude_fields=exclude_fields)
 
     @classmethod
     def get_by_uid(cls, value):
@@ -113,6 +114,10 @@ class Access(object):
     def query(cls, *args, **kwargs):
         return cls._get_impl().query(*args, **kwargs)
 
+    @classmethod
+    def load_fields(cls, model_object, fields):
+        return cls._get_impl().load_fields(model_object, fields)
+
     @classmethod
     def distinct(cls, *args, **kwargs):
         return cls._get_impl().distinct(*args, **kwargs)
@@ -161,6 +166,53 @@ class Access(object):
 
         return model_object
 
+    @classmethod
+    def insert_many(cls, model_objects, publish=True, dispatch_trigger=True):
+        """
+        Insert multiple new objects using a single bulk insert.
+
+        Note: Unlike ``insert`` this method doesn't look up conflicting objects on failure. If the
+        insert fails, the objects which have been inserted before the failure have an id assigned
+        and the objects which haven't been inserted don't.
+        """
+        if not model_objects:
+            return []
+
+        for model_object in model_objects:
+            if model_object.id:
+                raise ValueError('id for object %s was unexpected.' % model_object)
+
+        try:
+            model_objects = cls._get_impl().insert_many(model_objects)
+        except Exception:
+            inserted_model_objects = [model_object for model_object in model_objects
+                                      if model_object.id]
+            cls._publish_and_dispatch_create(model_objects=inserted_model_objects,
+                                             publish=publish,
+                                             dispatch_trigger=dispatch_trigger)
+            raise
+
+        cls._publish_and_dispatch_create(model_objects=model_objects, publish=publish,
+                                         dispatch_trigger=dispatch_trigger)
+        return model_objects
+
+    @classmethod
+    def _publish_and_dispatch_create(cls, model_objects, publish=True, dispatch_trigger=True):
+        for model_object in model_objects:
+            # Publish internal event on the message bus
+            if publish:
+                try:
+                    cls.publish_create(model_object)
+                except:
+                    LOG.exception('Publish failed.')
+
+            # Dispatch trigger
+            if dispatch_trigger:
+                try:
+                    cls.dispatch_create_trigger(model_object)
+                except:
+                    LOG.exception('Trigger dispatch failed.')
+
     @classmethod
     def add_or_update(cls, model_object, publish=True, dispatch_trigger=True,
                       log_not_unique_error_as_debug=False):
@@ -237,6 +289,38 @@ class Access(object):
 
         return model_object
 
+    @classmethod
+    def find_one_and_update(cls, filters, publish=True, dispatch_trigger=True, **kwargs):
+        """
+        Use this method when the updated object is needed afterwards. Unlike "update", the
+        object is updated and retrieved in a single atomic database operation.
+
+        :param filters: Filters used to find the object which is updated.
+        :type filters: ``dict``
+
+        :return: Updated object or ``None`` if no object matches the filters.
+        """
+        model_object = cls._get_impl().find_one_and_update(filters, **kwargs)
+
+        if not model_object:
+            return None
+
+        # Publish internal event on the message bus
+        if publish:
+            try:
+                cls.publish_update(model_object)
+            except:
+                LOG.exception('Publish failed.')
+
+        # Dispatch trigger
+        if dispatch_trigger:
+            try:
+                cls.dispatch_update_trigger(model_object)
+            except:
+                LOG.exception('Trigger dispatch failed.')
+
+        return model_object
+
     @classmethod
     def delete(cls, model_object, publish=True, dispatch_trigger=True):
         persisted_object = cls._get_impl().delete(model_object)
@@ -27,6 +27,10 @@ class ActionExecutionState(persistence.Access):
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def delete_by_query(cls, **query):
+        return cls._get_impl().delete_by_query(**query)
+
     @classmethod
     def _get_publisher(cls):
         if not cls.publisher:
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 from st2common import log as logging
+from st2common import transport
 from st2common.constants.triggers import KEY_VALUE_PAIR_CREATE_TRIGGER
 from st2common.constants.triggers import KEY_VALUE_PAIR_UPDATE_TRIGGER
 from st2common.constants.triggers import KEY_VALUE_PAIR_VALUE_CHANGE_TRIGGER
@@ -22,6 +23,7 @@ from st2common.models.api.keyvalue import KeyValuePairAPI
 from st2common.models.db.keyvalue import keyvaluepair_access
 from st2common.models.system.common import ResourceReference
 from st2common.persistence.base import Access
+from st2common.transport import utils as transport_utils
 
 LOG = logging.getLogger(__name__)
 
@@ -87,10 +89,16 @@ class KeyValuePair(Access):
         return cls._dispatch_trigger(operation=operation, trigger=trigger, payload=payload)
 
     @classmethod
-    def get_by_names(cls, names):
+    def get_by_names(cls, names, scope=None):
         """
         Retrieve KeyValuePair objects for the provided key names.
+
+        :param scope: Optional scope to limit the lookup to.
+        :type scope: ``str``
         """
+        if scope:
+            return cls.query(scope=scope, name__in=names)
+
         return cls.query(name__in=names)
 
     @classmethod
@@ -113,6 +121,13 @@ class KeyValuePair(Access):
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.keyvalue.KeyValuePairCUDPublisher(
+                urls=transport_utils.get_messaging_urls())
+        return cls.publisher
+
     @classmethod
     def _get_by_object(cls, object):
         # For KeyValuePair name is unique.
@@ -13,11 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from st2common import transport
 from st2common.persistence import base
 from st2common.models.db.rbac import role_access
 from st2common.models.db.rbac import user_role_assignment_access
 from st2common.models.db.rbac import permission_grant_access
 from st2common.models.db.rbac import group_to_role_mapping_access
+from st2common.transport import utils as transport_utils
 
 __all__ = [
     'Role',
@@ -29,27 +31,51 @@ __all__ = [
 
 class Role(base.Access):
     impl = role_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.rbac.RBACCUDPublisher(
+                urls=transport_utils.get_messaging_urls())
+        return cls.publisher
+
 
 class UserRoleAssignment(base.Access):
     impl = user_role_assignment_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.rbac.RBACCUDPublisher(
+                urls=transport_utils.get_messaging_urls())
+        return cls.publisher
+
 
 class PermissionGrant(base.Access):
     impl = permission_grant_access
+    publisher = None
 
     @classmethod
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def _get_publisher(cls):
+        if not cls.publisher:
+            cls.publisher = transport.rbac.RBACCUDPublisher(
+                urls=transport_utils.get_messaging_urls())
+        return cls.publisher
+
 
 class GroupToRoleMapping(base.Access):
     impl = group_to_role_mapping_access
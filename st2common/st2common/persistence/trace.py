@@ -24,6 +24,10 @@ class Trace(Access):
     def _get_impl(cls):
         return cls.impl
 
+    @classmethod
+    def delete_by_query(cls, **query):
+        return cls._get_impl().delete_by_query(**query)
+
     @classmethod
     def push_components(cls, instance, action_executions=None, rules=None, trigger_instances=None):
         update_kwargs = {}
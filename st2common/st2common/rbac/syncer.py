@@ -127,6 +127,7 @@ class RBACDefinitionsDBSyncer(object):
 
         LOG.debug('Deleting %s stale roles' % (len(role_ids_to_delete)))
         Role.query(id__in=role_ids_to_delete, system=False).delete()
+        _publish_delete(Role, role_dbs_to_delete)
         LOG.debug('Deleted %s stale roles' % (len(role_ids_to_delete)))
 
         # Remove associated permission grants
@@ -308,6 +309,7 @@ class RBACDefinitionsDBSyncer(object):
         queryset_filter = (Q(user=user_db.name) & Q(role__in=role_names_to_delete) &
                            (Q(is_remote=False) | Q(is_remote__exists=False)))
         UserRoleAssignmentDB.objects(queryset_filter).delete()
+        _publish_delete(UserRoleAssignment, role_assignment_dbs_to_delete)
         LOG.debug('Removed %s assignments for user "%s"' %
                 (len(role_assignment_dbs_to_delete), user_db.name))
 
@@ -401,6 +403,7 @@ class RBACRemoteGroupToRoleSyncer(object):
 
         UserRoleAssignment.query(user=user_db.name, role__in=role_names_to_delete,
                                  is_remote=True).delete()
+        _publish_delete(UserRoleAssignment, role_assignment_dbs_to_delete)
 
         # 3. Create role assignments for all the current groups
         created_assignments_dbs = []
@@ -428,3 +431,15 @@ class RBACRemoteGroupToRoleSyncer(object):
                   (len(created_assignments_dbs), str(user_db)), extra=extra)
 
         return (created_assignments_dbs, role_assignment_dbs_to_delete)
+
+
+def _publish_delete(persistence_cls, model_dbs):
+    """
+    Publish delete events for the objects which have been deleted with a bulk delete query so the
+    services which cache permissions can invalidate them.
+    """
+    for model_db in model_dbs:
+        try:
+            persistence_cls.publish_delete(model_db)
+        except Exception:
+            LOG.exception('Publish failed.')
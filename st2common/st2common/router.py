@@ -15,6 +15,7 @@
 
 import copy
 import functools
+import random
 import re
 import six
 import sys
@@ -126,15 +127,33 @@ class Response(webob.Response):
 
             if content_type is None:
                 content_type = 'application/json'
+        else:
+            json_body = None
 
         super(Response, self).__init__(body, status, headerlist, app_iter, content_type,
                                        *args, **kwargs)
 
+        # Original (pre-serialization) value of the JSON body
+        self._json_value = json_body
+
     def _json_body__get(self):
         return super(Response, self)._json_body__get()
 
     def _json_body__set(self, value):
         self.body = json_encode(value).encode('UTF-8')
+        self._json_value = value
+
+    def get_json_value(self):
+        """
+        Return JSON body of this response as a structure of primitive types.
+
+        If the response was created from a Python value, the value is converted without parsing
+        the already serialized body.
+        """
+        if self._json_value is None:
+            return self.json
+
+        return _to_primitive(self._json_value)
 
     def _json_body__del(self):
         return super(Response, self)._json_body__del()
@@ -142,6 +161,52 @@ class Response(webob.Response):
     json = json_body = property(_json_body__get, _json_body__set, _json_body__del)
 
 
+class StreamingJSONListResponse(Response):
+    """
+    Response which serializes items of the provided iterable (e.g. a database cursor) one by one
+    while the response body is being sent.
+
+    Note: Items are serialized without indentation and the response is not validated against the
+    API spec since that would require consuming the whole iterable upfront.
+    """
+
+    def __init__(self, items, status=None, headerlist=None, content_type='application/json',
+                 **kwargs):
+        app_iter = _json_list_iter(items=items)
+        super(StreamingJSONListResponse, self).__init__(status=status, headerlist=headerlist,
+                                                        app_iter=app_iter,
+                                                        content_type=content_type, **kwargs)
+
+
+def _json_list_iter(items):
+    yield b'['
+
+    for index, item in enumerate(items):
+        if index > 0:
+            yield b', '
+
+        yield json_encode(item, indent=None).encode('UTF-8')
+
+    yield b']'
+
+
+def _to_primitive(value):
+    """
+    Convert a value which is serialized using json_encode to a structure of primitive types.
+
+    Note: Dictionaries and lists are always copied so the returned value can be safely modified.
+    """
+    if hasattr(value, '__json__') and six.callable(value.__json__):
+        value = value.__json__()
+
+    if isinstance(value, dict):
+        return {key: _to_primitive(item) for key, item in six.iteritems(value)}
+    elif isinstance(value, (list, tuple)):
+        return [_to_primitive(item) for item in value]
+
+    return value
+
+
 class Router(object):
     def __init__(self, arguments=None, debug=False, auth=True):
         self.debug = debug
@@ -153,12 +218,17 @@ class Router(object):
         self.spec_resolver = None
         self.routes = routes.Mapper()
 
+        # Request and response body validators keyed by the id of the schema object. Schemas are
+        # part of the API spec and don't change so each validator only needs to be built once
+        self._validators = {}
+
     def add_spec(self, spec, transforms):
         info = spec.get('info', {})
         LOG.debug('Adding API: %s %s', info.get('title', 'untitled'), info.get('version', '0.0.0'))
 
         self.spec = spec
         self.spec_resolver = jsonschema.RefResolver('', self.spec)
+        self._validators = {}
 
         validate(copy.deepcopy(self.spec))
 
@@ -341,7 +411,7 @@ class Router(object):
                         raise exc.HTTPBadRequest(detail=detail)
 
                     try:
-                        CustomValidator(schema, resolver=self.spec_resolver).validate(data)
+                        self._get_validator(schema=schema).validate(data)
                     except (jsonschema.ValidationError, ValueError) as e:
                         raise exc.HTTPBadRequest(detail=e.message,
                                                  comment=traceback.format_exc())
@@ -427,16 +497,55 @@ class Router(object):
         responses = endpoint.get('responses', {})
         response_spec = responses.get(str(resp.status_code), responses.get('default', None))
 
-        if response_spec and 'schema' in response_spec:
+        if (response_spec and 'schema' in response_spec and
+                not isinstance(resp, StreamingJSONListResponse) and
+                self._should_validate_response()):
             try:
-                validator = CustomValidator(response_spec['schema'], resolver=self.spec_resolver)
-                validator.validate(resp.json)
+                validator = self._get_validator(schema=response_spec['schema'])
+                validator.validate(self._get_response_json(resp))
             except (jsonschema.ValidationError, ValueError):
                 LOG.exception('Response validation failed.')
                 resp.headers.add('Warning', '199 OpenAPI "Response validation failed"')
 
         return resp
 
+    def _should_validate_response(self):
+        """
+        Return True if the response should be validated against the API spec based on the
+        api.response_validation config option.
+        """
+        mode = cfg.CONF.api.response_validation
+
+        if mode == 'off':
+            return False
+        elif mode == 'sampled':
+            return random.random() < cfg.CONF.api.response_validation_sample_rate  # nosec
+
+        return True
+
+    def _get_response_json(self, resp):
+        """
+        Return response body which is validated against the API spec. Avoid parsing the
+        serialized body if the original value is available.
+        """
+        if isinstance(resp, Response):
+            return resp.get_json_value()
+
+        return resp.json
+
+    def _get_validator(self, schema):
+        """
+        Return (cached) validator for the provided request or response body schema.
+        """
+        key = id(schema)
+        validator = self._validators.get(key, None)
+
+        if not validator:
+            validator = CustomValidator(schema, resolver=self.spec_resolver)
+            self._validators[key] = validator
+
+        return validator
+
     def as_wsgi(self, environ, start_response):
         """
         Converts WSGI request to webob.Request and initiates the response returned by controller.
@@ -108,7 +108,8 @@ class ActionService(object):
 
 
 class PythonActionWrapper(object):
-    def __init__(self, pack, file_path, parameters=None, user=None, parent_args=None):
+    def __init__(self, pack, file_path, parameters=None, user=None, parent_args=None,
+                 parse_config=True):
         """
         :param pack: Name of the pack this action belongs to.
         :type pack: ``str``
@@ -124,6 +125,10 @@ class PythonActionWrapper(object):
 
         :param parent_args: Command line arguments passed to the parent process.
         :type parse_args: ``list``
+
+        :param parse_config: False if the config has already been parsed in this process (e.g.
+                             by the zygote process this process has been forked from).
+        :type parse_config: ``bool``
         """
 
         self._pack = pack
@@ -135,11 +140,12 @@ class PythonActionWrapper(object):
         self._class_name = None
         self._logger = logging.getLogger('PythonActionWrapper')
 
-        try:
-            config.parse_args(args=self._parent_args)
-        except Exception as e:
-            LOG.debug('Failed to parse config using parent args (parent_args=%s): %s' %
-                      (str(self._parent_args), str(e)))
+        if parse_config:
+            try:
+                config.parse_args(args=self._parent_args)
+            except Exception as e:
+                LOG.debug('Failed to parse config using parent args (parent_args=%s): %s' %
+                          (str(self._parent_args), str(e)))
 
         # We don't need to ensure indexes every subprocess because they should already be created
         # and ensured by other services
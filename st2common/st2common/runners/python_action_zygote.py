@@ -0,0 +1,209 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+
+# Note: See python_action_wrapper.py for details on this work-around
+RUNNERS_PATH_SUFFIX = 'st2common/runners'
+if __name__ == '__main__':
+    script_path = sys.path[0]
+    if RUNNERS_PATH_SUFFIX in script_path:
+        sys.path.pop(0)
+
+import os
+import json
+import errno
+import select
+import signal
+import socket
+import argparse
+import tempfile
+import traceback
+
+from st2actions import config
+from st2common.runners.python_action_wrapper import PythonActionWrapper
+
+# Note: Imported so the module is already loaded in the forked action processes
+from st2common.services import datastore  # NOQA
+
+__all__ = [
+    'PythonActionZygote'
+]
+
+
+class PythonActionZygote(object):
+    """
+    Process which has all the Python runner dependencies already imported and runs Python actions
+    in processes forked from itself.
+
+    Runner connects to the unix socket and sends a request (serialized as a single JSON line) with
+    the action pack, file path, parameters, user and environment. Zygote forks a handler process
+    for each connection which forks the action process, responds with its pid (so the runner can
+    kill it on timeout) and once the action finishes, with the exit code and the sizes of the
+    captured stdout and stderr, followed by their content.
+
+    Config is parsed once in the zygote before forking. Database connection is established in
+    each action process since the MongoDB client is not fork safe.
+
+    Zygote exits when its stdin is closed (runner process has exited). If the config can't be
+    parsed, zygote exits right away so the runner falls back to running actions in a new process.
+    """
+
+    def __init__(self, socket_path, parent_args=None):
+        """
+        :param socket_path: Path to the unix socket to listen on.
+        :type socket_path: ``str``
+
+        :param parent_args: Command line arguments passed to the parent process.
+        :type parent_args: ``list``
+        """
+        self._socket_path = socket_path
+        self._parent_args = parent_args or []
+
+    def run(self):
+        try:
+            config.parse_args(args=self._parent_args)
+        except Exception:
+            sys.stderr.write('Failed to parse config using parent args (parent_args=%s):\n' %
+                             (str(self._parent_args)))
+            traceback.print_exc()
+            sys.exit(1)
+
+        # Handler processes are reaped automatically
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self._socket_path)
+        server.listen(128)
+
+        try:
+            while True:
+                try:
+                    readable = select.select([server, sys.stdin], [], [])[0]
+                except select.error as e:
+                    if e.args[0] == errno.EINTR:
+                        continue
+                    raise
+
+                if sys.stdin in readable and not os.read(sys.stdin.fileno(), 1024):
+                    break
+
+                if server in readable:
+                    connection = server.accept()[0]
+
+                    if os.fork() == 0:
+                        server.close()
+                        self._handle(connection)
+
+                    connection.close()
+        finally:
+            server.close()
+            os.unlink(self._socket_path)
+            os.rmdir(os.path.dirname(self._socket_path))
+
+    def _handle(self, connection):
+        exit_code = 0
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+        try:
+            reader = connection.makefile('rb')
+            request = json.loads(reader.readline())
+
+            stdout_file = tempfile.TemporaryFile()
+            stderr_file = tempfile.TemporaryFile()
+
+            pid = os.fork()
+            if pid == 0:
+                connection.close()
+                self._run_action(request, stdout_file, stderr_file)
+
+            connection.sendall(json.dumps({'pid': pid}) + '\n')
+
+            status = os.waitpid(pid, 0)[1]
+            if os.WIFSIGNALED(status):
+                action_exit_code = -os.WTERMSIG(status)
+            else:
+                action_exit_code = os.WEXITSTATUS(status)
+
+            stdout_file.seek(0)
+            stdout = stdout_file.read()
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+
+            response = {
+                'exit_code': action_exit_code,
+                'stdout_size': len(stdout),
+                'stderr_size': len(stderr)
+            }
+            connection.sendall(json.dumps(response) + '\n' + stdout + stderr)
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _run_action(self, request, stdout_file, stderr_file):
+        exit_code = 0
+
+        try:
+            # Action process gets its own process group so all the processes it has started are
+            # killed on timeout
+            os.setsid()
+
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(devnull, 0)
+            os.dup2(stdout_file.fileno(), 1)
+            os.dup2(stderr_file.fileno(), 2)
+
+            os.environ.clear()
+            os.environ.update(request['env'])
+
+            wrapper = PythonActionWrapper(pack=request['pack'],
+                                          file_path=request['file_path'],
+                                          parameters=request['parameters'],
+                                          user=request['user'],
+                                          parent_args=self._parent_args,
+                                          parse_config=False)
+            wrapper.run()
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                sys.stderr.write('%s\n' % (e.code))
+                exit_code = 1
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Python action runner zygote process')
+    parser.add_argument('--socket-path', required=True,
+                        help='Path to the unix socket to listen on')
+    parser.add_argument('--parent-args', required=False,
+                        help='Command line arguments passed to the parent process')
+    args = parser.parse_args()
+
+    parent_args = json.loads(args.parent_args) if args.parent_args else []
+
+    assert isinstance(parent_args, list)
+    zygote = PythonActionZygote(socket_path=args.socket_path, parent_args=parent_args)
+    zygote.run()
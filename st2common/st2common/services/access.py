@@ -19,6 +19,7 @@ import datetime
 from oslo_config import cfg
 
 from st2common.util import isotime
+from st2common.util import auth as auth_utils
 from st2common.util import date as date_utils
 from st2common.exceptions.auth import TokenNotFoundError, UserNotFoundError
 from st2common.exceptions.auth import TTLTooLargeException
@@ -93,7 +94,9 @@ def create_token(username, ttl=None, metadata=None, add_missing_user=True, servi
 def delete_token(token):
     try:
         token_db = Token.get(token)
-        return Token.delete(token_db)
+        result = Token.delete(token_db)
+        auth_utils.invalidate_token(token)
+        return result
     except TokenNotFoundError:
         pass
     except Exception:
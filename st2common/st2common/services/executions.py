@@ -28,6 +28,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import copy
+import time
+
+import bson
 from oslo_config import cfg
 import six
 
@@ -36,6 +41,7 @@ from st2common.util import date as date_utils
 from st2common.util import reference
 import st2common.util.action_db as action_utils
 from st2common.constants import action as action_constants
+from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.persistence.execution import ActionExecution
 from st2common.persistence.runner import RunnerType
 from st2common.persistence.rule import Rule
@@ -59,6 +65,11 @@ __all__ = [
 
 LOG = logging.getLogger(__name__)
 
+# Short lived cache for serialized rule, trigger and trigger type objects referenced by executions.
+# Maps a key to a (value, expire_timestamp) tuple.
+_REFERENCED_OBJECTS_CACHE = collections.OrderedDict()
+_REFERENCED_OBJECTS_CACHE_MAX_SIZE = 500
+
 # Attributes which are stored in the "liveaction" dictionary when composing LiveActionDB object
 # into a ActionExecution compatible dictionary.
 # Those attributes are LiveAction specific and are therefore stored in a "liveaction" key
@@ -109,57 +120,102 @@ def create_execution_object(liveaction, publish=True):
     attrs.update(_decompose_liveaction(liveaction))
 
     if 'rule' in liveaction.context:
-        rule = reference.get_model_from_ref(Rule, liveaction.context.get('rule', {}))
-        attrs['rule'] = vars(RuleAPI.from_model(rule))
+        rule_ref = liveaction.context.get('rule', {})
+        attrs['rule'] = _get_referenced_object(
+            key=('rule', rule_ref.get('id', None), rule_ref.get('name', None)),
+            get_model_func=lambda: reference.get_model_from_ref(Rule, rule_ref),
+            api_cls=RuleAPI)
 
     if 'trigger_instance' in liveaction.context:
-        trigger_instance_id = liveaction.context.get('trigger_instance', {})
-        trigger_instance_id = trigger_instance_id.get('id', None)
-        trigger_instance = TriggerInstance.get_by_id(trigger_instance_id)
-        trigger = reference.get_model_by_resource_ref(db_api=Trigger,
-                                                      ref=trigger_instance.trigger)
-        trigger_type = reference.get_model_by_resource_ref(db_api=TriggerType,
-                                                           ref=trigger.type)
         trigger_instance = reference.get_model_from_ref(
             TriggerInstance, liveaction.context.get('trigger_instance', {}))
+        trigger_ref = trigger_instance.trigger
+
+        def get_trigger():
+            return reference.get_model_by_resource_ref(db_api=Trigger, ref=trigger_ref)
+
+        trigger = _get_referenced_object(key=('trigger', trigger_ref),
+                                         get_model_func=get_trigger,
+                                         api_cls=TriggerAPI)
+
+        def get_trigger_type():
+            return reference.get_model_by_resource_ref(db_api=TriggerType, ref=trigger['type'])
+
         attrs['trigger_instance'] = vars(TriggerInstanceAPI.from_model(trigger_instance))
-        attrs['trigger'] = vars(TriggerAPI.from_model(trigger))
-        attrs['trigger_type'] = vars(TriggerTypeAPI.from_model(trigger_type))
+        attrs['trigger'] = trigger
+        attrs['trigger_type'] = _get_referenced_object(key=('trigger_type', trigger['type']),
+                                                       get_model_func=get_trigger_type,
+                                                       api_cls=TriggerTypeAPI)
 
-    parent = _get_parent_execution(liveaction)
-    if parent:
-        attrs['parent'] = str(parent.id)
+    parent_id = _get_parent_execution_id(liveaction)
+    if parent_id:
+        attrs['parent'] = parent_id
 
     attrs['log'] = [_create_execution_log_entry(liveaction['status'])]
 
-    execution = ActionExecutionDB(**attrs)
-    execution = ActionExecution.add_or_update(execution, publish=False)
+    # Id is generated upfront so the web_url which contains it can be set before the execution is
+    # written to the database using a single insert
+    execution_id = bson.ObjectId()
+    attrs['id'] = execution_id
+    attrs['web_url'] = _get_web_url_for_execution(str(execution_id))
 
-    # Update the web_url field in execution. Unfortunately, we need
-    # the execution id for constructing the URL which we only get
-    # after the model is written to disk.
-    execution.web_url = _get_web_url_for_execution(str(execution.id))
+    execution = ActionExecutionDB(**attrs)
     execution = ActionExecution.add_or_update(execution, publish=publish)
 
-    if parent:
-        if str(execution.id) not in parent.children:
-            parent.children.append(str(execution.id))
-            ActionExecution.add_or_update(parent)
+    if parent_id:
+        # Atomically add a child to the parent execution instead of re-writing the whole object
+        parent = ActionExecution.find_one_and_update({'id': parent_id},
+                                                     add_to_set__children=str(execution.id))
+
+        if not parent:
+            LOG.error('No valid execution object found in db for id: %s' % parent_id)
 
     return execution
 
 
-def _get_parent_execution(child_liveaction_db):
+def _get_parent_execution_id(child_liveaction_db):
     parent_context = child_liveaction_db.context.get('parent', None)
 
-    if parent_context:
-        parent_id = parent_context['execution_id']
-        try:
-            return ActionExecution.get_by_id(parent_id)
-        except:
-            LOG.exception('No valid execution object found in db for id: %s' % parent_id)
-            return None
-    return None
+    if not parent_context:
+        return None
+
+    parent_id = parent_context['execution_id']
+
+    if not bson.ObjectId.is_valid(parent_id):
+        LOG.error('No valid execution object found in db for id: %s' % parent_id)
+        return None
+
+    return str(parent_id)
+
+
+def _get_referenced_object(key, get_model_func, api_cls):
+    """
+    Retrieve serialized object (rule, trigger, trigger type) which is referenced by an execution.
+
+    Same objects are referenced by many executions (e.g. all the executions created by the same
+    rule) and they change rarely so they are cached for a short amount of time.
+
+    :rtype: ``dict``
+    """
+    ttl = cfg.CONF.system.execution_references_cache_ttl
+    now = time.time()
+
+    entry = _REFERENCED_OBJECTS_CACHE.pop(key, None)
+    if entry and entry[1] > now:
+        _REFERENCED_OBJECTS_CACHE[key] = entry
+        return copy.deepcopy(entry[0])
+
+    value = vars(api_cls.from_model(get_model_func()))
+
+    if ttl > 0:
+        _REFERENCED_OBJECTS_CACHE[key] = (value, now + ttl)
+
+        while len(_REFERENCED_OBJECTS_CACHE) > _REFERENCED_OBJECTS_CACHE_MAX_SIZE:
+            _REFERENCED_OBJECTS_CACHE.popitem(last=False)
+
+        value = copy.deepcopy(value)
+
+    return value
 
 
 def _get_web_url_for_execution(execution_id):
@@ -168,18 +224,31 @@ def _get_web_url_for_execution(execution_id):
 
 
 def update_execution(liveaction_db, publish=True):
-    execution = ActionExecution.get(liveaction__id=str(liveaction_db.id))
     decomposed = _decompose_liveaction(liveaction_db)
 
     kw = {}
     for k, v in six.iteritems(decomposed):
         kw['set__' + k] = v
 
-    if liveaction_db.status != execution.status:
-        # Note: If the status changes we store this transition in the "log" attribute of action
-        # execution
-        kw['push__log'] = _create_execution_log_entry(liveaction_db.status)
-    execution = ActionExecution.update(execution, publish=publish, **kw)
+    liveaction_id = str(liveaction_db.id)
+
+    # If the status changes we store this transition in the "log" attribute of action execution.
+    # To avoid retrieving the execution first, the update is guarded by a status filter which only
+    # matches if the status has changed. If the status hasn't changed (or the update is racing
+    # with another one), we fall back to an update which doesn't add a log entry.
+    filters = {'liveaction__id': liveaction_id, 'status__ne': liveaction_db.status}
+    log_entry = _create_execution_log_entry(liveaction_db.status)
+    execution = ActionExecution.find_one_and_update(filters, publish=publish,
+                                                    push__log=log_entry, **kw)
+
+    if not execution:
+        filters = {'liveaction__id': liveaction_id}
+        execution = ActionExecution.find_one_and_update(filters, publish=publish, **kw)
+
+    if not execution:
+        msg = 'Unable to find ActionExecution for LiveAction with id="%s"' % (liveaction_id)
+        raise StackStormDBObjectNotFoundError(msg)
+
     return execution
 
 
@@ -216,7 +285,7 @@ def abandon_execution_if_incomplete(liveaction_id, publish=True):
 
 def is_execution_canceled(execution_id):
     try:
-        execution = ActionExecution.get_by_id(execution_id)
+        execution = ActionExecution.get_by_id(execution_id, only_fields=['id', 'status'])
         return execution.status == action_constants.LIVEACTION_STATUS_CANCELED
     except:
         return False  # XXX: What to do here?
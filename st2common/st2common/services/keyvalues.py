@@ -13,6 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import calendar
+import collections
+import time
+
+import six
+from oslo_config import cfg
+
 from st2common import log as logging
 
 from st2common.constants.keyvalue import SYSTEM_SCOPE, FULL_SYSTEM_SCOPE
@@ -22,17 +29,29 @@ from st2common.constants.keyvalue import DATASTORE_KEY_SEPARATOR
 from st2common.exceptions.keyvalue import InvalidScopeException, InvalidUserException
 from st2common.models.system.keyvalue import UserKeyReference
 from st2common.persistence.keyvalue import KeyValuePair
+from st2common.util import date as date_utils
 
 __all__ = [
     'get_kvp_for_name',
     'get_values_for_names',
+    'get_value_for_scope_and_name',
+    'prefetch_values',
 
+    'setup_cache',
+    'teardown_cache',
+    'get_cache',
+
+    'KeyValuePairCache',
     'KeyValueLookup',
     'UserKeyValueLookup'
 ]
 
 LOG = logging.getLogger(__name__)
 
+# Process wide datastore cache, only available when set up using setup_cache
+_CACHE = None
+_CACHE_WATCHER = None
+
 
 def get_kvp_for_name(name):
     try:
@@ -65,6 +84,180 @@ def get_values_for_names(names, default_value=None):
     return result
 
 
+class KeyValuePairCache(object):
+    """
+    Process wide read-through cache for datastore values.
+
+    Values (including the ones for keys which don't exist) are cached for ``ttl`` seconds or until
+    the key expires, whichever comes first. Once the cache holds more than ``max_size`` values,
+    the oldest values are evicted. To keep the cache up to date across processes, values need to
+    be invalidated from the key value pair CUD events (see ``setup_cache``). Note: Keys which
+    expire don't emit a CUD event.
+    """
+
+    def __init__(self, ttl=60, max_size=10000):
+        self._ttl = ttl
+        self._max_size = max_size
+
+        # Maps (scope, name) tuple to a (value, expire_timestamp) tuple
+        self._values = collections.OrderedDict()
+
+        # Incremented on each invalidation. Used to avoid caching a value which was read from the
+        # database before a concurrent invalidation.
+        self._generation = 0
+
+    def get_value(self, scope, name):
+        """
+        Return value for the provided key. ``None`` is returned if the key doesn't exist.
+        """
+        entry = self._values.get((scope, name), None)
+        if entry and entry[1] > time.time():
+            return entry[0]
+
+        generation = self._generation
+        kvp_db = KeyValuePair.get_by_scope_and_name(scope=scope, name=name)
+        value = kvp_db.value if kvp_db else None
+
+        if generation == self._generation:
+            self._set_value(scope=scope, name=name, value=value,
+                            expire_timestamp=self._get_expire_timestamp(kvp_db))
+
+        return value
+
+    def prefetch(self, scope, names):
+        """
+        Retrieve values for all the provided keys which are not in the cache using a single query.
+        """
+        now = time.time()
+        names = [name for name in set(names)
+                 if self._values.get((scope, name), (None, 0))[1] <= now]
+
+        if not names:
+            return
+
+        generation = self._generation
+        kvp_dbs = KeyValuePair.get_by_names(names=names, scope=scope)
+        kvp_dbs = dict([(kvp_db.name, kvp_db) for kvp_db in kvp_dbs])
+
+        if generation != self._generation:
+            return
+
+        for name in names:
+            kvp_db = kvp_dbs.get(name, None)
+            self._set_value(scope=scope, name=name, value=kvp_db.value if kvp_db else None,
+                            expire_timestamp=self._get_expire_timestamp(kvp_db))
+
+    def invalidate(self, scope, name):
+        self._generation += 1
+        self._values.pop((scope, name), None)
+
+    def invalidate_kvp(self, kvp_db):
+        """
+        Invalidate cached value for the provided KeyValuePairDB object. Used as a CUD event
+        handler.
+        """
+        self.invalidate(scope=kvp_db.scope, name=kvp_db.name)
+
+    def clear(self):
+        self._generation += 1
+        self._values.clear()
+
+    def _set_value(self, scope, name, value, expire_timestamp=None):
+        key = (scope, name)
+        self._values.pop(key, None)
+
+        cache_expire_timestamp = time.time() + self._ttl
+        if expire_timestamp is not None:
+            cache_expire_timestamp = min(cache_expire_timestamp, expire_timestamp)
+
+        self._values[key] = (value, cache_expire_timestamp)
+
+        while len(self._values) > self._max_size:
+            self._values.popitem(last=False)
+
+    def _get_expire_timestamp(self, kvp_db):
+        """
+        Return key expiration time as a unix timestamp or ``None`` if the key doesn't expire.
+        """
+        if not kvp_db or not kvp_db.expire_timestamp:
+            return None
+
+        expire_timestamp = date_utils.convert_to_utc(kvp_db.expire_timestamp)
+        return calendar.timegm(expire_timestamp.utctimetuple())
+
+    def __len__(self):
+        return len(self._values)
+
+
+def setup_cache():
+    """
+    Set up the process wide datastore cache and start watching for key value pair CUD events if
+    the cache is enabled in the config.
+
+    :rtype: :class:`KeyValuePairCache` or ``None``
+    """
+    global _CACHE, _CACHE_WATCHER
+
+    if not cfg.CONF.keyvalue.cache_enabled or _CACHE is not None:
+        return _CACHE
+
+    # Late import to avoid importing kombu in processes which don't use the cache
+    from st2common.services.keyvalue_watcher import KeyValuePairWatcher
+
+    cache = KeyValuePairCache(ttl=cfg.CONF.keyvalue.cache_ttl,
+                              max_size=cfg.CONF.keyvalue.cache_max_size)
+    watcher = KeyValuePairWatcher(create_handler=cache.invalidate_kvp,
+                                  update_handler=cache.invalidate_kvp,
+                                  delete_handler=cache.invalidate_kvp,
+                                  queue_suffix='keyvalue_cache',
+                                  exclusive=True)
+    watcher.start()
+
+    _CACHE = cache
+    _CACHE_WATCHER = watcher
+    return _CACHE
+
+
+def teardown_cache():
+    global _CACHE, _CACHE_WATCHER
+
+    if _CACHE_WATCHER is not None:
+        _CACHE_WATCHER.stop()
+
+    _CACHE = None
+    _CACHE_WATCHER = None
+
+
+def get_cache():
+    """
+    :rtype: :class:`KeyValuePairCache` or ``None``
+    """
+    return _CACHE
+
+
+def get_value_for_scope_and_name(scope, name):
+    """
+    Retrieve value for the provided key. The process wide cache is used if it has been set up.
+
+    :return: Value or ``None`` if the key doesn't exist.
+    """
+    if _CACHE is not None:
+        return _CACHE.get_value(scope=scope, name=name)
+
+    kvp_db = KeyValuePair.get_by_scope_and_name(scope=scope, name=name)
+    return kvp_db.value if kvp_db else None
+
+
+def prefetch_values(scope, names):
+    """
+    Populate the process wide cache with values for the provided keys using a single query.
+
+    This is a no-op if the cache has not been set up.
+    """
+    if _CACHE is not None and names:
+        _CACHE.prefetch(scope=scope, names=names)
+
+
 class KeyValueLookup(object):
 
     def __init__(self, prefix=None, key_prefix=None, cache=None, scope=FULL_SYSTEM_SCOPE):
@@ -94,6 +287,35 @@ class KeyValueLookup(object):
     def __getattr__(self, name):
         return self._get(name)
 
+    def prefetch(self, names):
+        """
+        Retrieve values for the provided (dotted) key names using a single query and store them in
+        the value cache so subsequent lookups don't hit the database.
+        """
+        names = [name for name in set(names) if name not in self._value_cache]
+        if not names:
+            return
+
+        kvp_keys = {}
+        for name in names:
+            if self._prefix:
+                kvp_keys[DATASTORE_KEY_SEPARATOR.join([self._prefix, name])] = name
+            else:
+                kvp_keys[name] = name
+
+        if _CACHE is not None:
+            _CACHE.prefetch(scope=self._scope, names=kvp_keys.keys())
+            for kvp_key, name in six.iteritems(kvp_keys):
+                value = _CACHE.get_value(scope=self._scope, name=kvp_key)
+                self._value_cache[name] = value if value is not None else ''
+            return
+
+        kvp_dbs = KeyValuePair.get_by_names(names=kvp_keys.keys(), scope=self._scope)
+        values = dict([(kvp_db.name, kvp_db.value) for kvp_db in kvp_dbs])
+
+        for kvp_key, name in six.iteritems(kvp_keys):
+            self._value_cache[name] = values.get(kvp_key, '')
+
     def _get(self, name):
         # get the value for this key and save in value_cache
         if self._key_prefix:
@@ -106,8 +328,11 @@ class KeyValueLookup(object):
         else:
             kvp_key = key
 
-        value = self._get_kv(kvp_key)
-        self._value_cache[key] = value
+        if key in self._value_cache:
+            value = self._value_cache[key]
+        else:
+            value = self._get_kv(kvp_key)
+            self._value_cache[key] = value
         # return a KeyValueLookup as response since the lookup may not be complete e.g. if
         # the lookup is for 'key_base.key_value' it is likely that the calling code, e.g. Jinja,
         # will expect to do a dictionary style lookup for key_base and key_value as subsequent
@@ -118,10 +343,10 @@ class KeyValueLookup(object):
     def _get_kv(self, key):
         scope = self._scope
         LOG.debug('Lookup system kv: scope: %s and key: %s', scope, key)
-        kvp = KeyValuePair.get_by_scope_and_name(scope=scope, name=key)
-        if kvp:
-            LOG.debug('Got value %s from datastore.', kvp.value)
-        return kvp.value if kvp else ''
+        value = get_value_for_scope_and_name(scope=scope, name=key)
+        if value is not None:
+            LOG.debug('Got value %s from datastore.', value)
+        return value if value is not None else ''
 
 
 class UserKeyValueLookup(object):
@@ -160,8 +385,11 @@ class UserKeyValueLookup(object):
         else:
             kvp_key = key
 
-        value = self._get_kv(kvp_key)
-        self._value_cache[key] = value
+        if key in self._value_cache:
+            value = self._value_cache[key]
+        else:
+            value = self._get_kv(kvp_key)
+            self._value_cache[key] = value
         # return a KeyValueLookup as response since the lookup may not be complete e.g. if
         # the lookup is for 'key_base.key_value' it is likely that the calling code, e.g. Jinja,
         # will expect to do a dictionary style lookup for key_base and key_value as subsequent
@@ -171,8 +399,8 @@ class UserKeyValueLookup(object):
 
     def _get_kv(self, key):
         scope = self._scope
-        kvp = KeyValuePair.get_by_scope_and_name(scope=scope, name=key)
-        return kvp.value if kvp else ''
+        value = get_value_for_scope_and_name(scope=scope, name=key)
+        return value if value is not None else ''
 
 
 def get_key_reference(scope, name, user=None):
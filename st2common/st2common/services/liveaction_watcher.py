@@ -0,0 +1,131 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# pylint: disable=assignment-from-none
+
+import eventlet
+from eventlet.event import Event
+from kombu import Queue, binding
+
+from st2common.constants.action import LIVEACTION_COMPLETED_STATES
+from st2common.services.watcher import BaseWatcher
+from st2common.transport import liveaction
+import st2common.util.queues as queue_utils
+
+__all__ = [
+    'LiveActionCompletionWatcher',
+
+    'setup_completion_watcher',
+    'teardown_completion_watcher',
+    'get_completion_watcher'
+]
+
+_WATCHER = None
+
+
+class LiveActionCompletionWatcher(BaseWatcher):
+    """
+    Watches for LiveAction status updates to one of the completed states and wakes up the green
+    threads which are waiting for the particular LiveAction to complete.
+    """
+
+    def __init__(self, queue_suffix=None):
+        super(LiveActionCompletionWatcher, self).__init__(queue=self._get_queue(queue_suffix))
+
+        # Maps LiveAction id to the events of the waiting threads
+        self._waiters = {}
+
+    def handle(self, body, message):
+        self.notify(str(body.id))
+
+    def add_waiter(self, liveaction_id):
+        """
+        Register interest in the completion of the provided LiveAction.
+
+        Note: Waiter needs to be registered before the LiveAction status is checked so the
+        completion can't be missed.
+
+        :rtype: :class:`eventlet.event.Event`
+        """
+        event = Event()
+        self._waiters.setdefault(str(liveaction_id), set()).add(event)
+        return event
+
+    def remove_waiter(self, liveaction_id, event):
+        waiters = self._waiters.get(str(liveaction_id), None)
+        if waiters is None:
+            return
+
+        waiters.discard(event)
+        if not waiters:
+            del self._waiters[str(liveaction_id)]
+
+    def wait(self, event, timeout):
+        """
+        Wait until the LiveAction completes or the timeout expires.
+
+        :return: True if the LiveAction has completed.
+        :rtype: ``bool``
+        """
+        with eventlet.Timeout(timeout, False):
+            event.wait()
+
+        return event.ready()
+
+    def notify(self, liveaction_id):
+        for event in self._waiters.get(liveaction_id, set()):
+            if not event.ready():
+                event.send(True)
+
+    @staticmethod
+    def _get_queue(queue_suffix):
+        queue_name = queue_utils.get_queue_name(queue_name_base='st2.liveaction.completion.watch',
+                                                queue_name_suffix=queue_suffix,
+                                                add_random_uuid_to_suffix=True
+                                                )
+        bindings = [binding(liveaction.LIVEACTION_STATUS_MGMT_XCHG, routing_key=status)
+                    for status in LIVEACTION_COMPLETED_STATES]
+        return Queue(queue_name, bindings=bindings, exclusive=True)
+
+
+def setup_completion_watcher():
+    """
+    Start the process wide LiveAction completion watcher.
+
+    :rtype: :class:`LiveActionCompletionWatcher`
+    """
+    global _WATCHER
+
+    if not _WATCHER:
+        _WATCHER = LiveActionCompletionWatcher(queue_suffix='completion')
+        _WATCHER.start()
+
+    return _WATCHER
+
+
+def teardown_completion_watcher():
+    global _WATCHER
+
+    if _WATCHER:
+        _WATCHER.stop()
+
+    _WATCHER = None
+
+
+def get_completion_watcher():
+    """
+    :rtype: :class:`LiveActionCompletionWatcher` or ``None``
+    """
+    return _WATCHER
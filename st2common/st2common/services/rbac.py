@@ -13,8 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
+
 from mongoengine.queryset.visitor import Q
+from oslo_config import cfg
 
+from st2common import log as logging
 from st2common.rbac.types import PermissionType
 from st2common.rbac.types import ResourceType
 from st2common.rbac.types import SystemRole
@@ -50,9 +54,21 @@ __all__ = [
     'get_all_group_to_role_maps',
     'create_group_to_role_map',
 
-    'validate_roles_exists'
+    'validate_roles_exists',
+
+    'setup_cache',
+    'teardown_cache',
+    'get_cache',
+
+    'UserPermissionsCache'
 ]
 
+LOG = logging.getLogger(__name__)
+
+# Process wide user permissions cache, only available when set up using setup_cache
+_CACHE = None
+_CACHE_WATCHER = None
+
 
 def get_all_roles(exclude_system=False):
     """
@@ -93,6 +109,9 @@ def get_roles_for_user(user_db, include_remote=True):
 
     :rtype: ``list`` of :class:`RoleDB`
     """
+    if include_remote and _CACHE is not None:
+        return _CACHE.get_roles(user_db=user_db)
+
     if include_remote:
         queryset = UserRoleAssignment.query(user=user_db.name)
     else:
@@ -170,6 +189,7 @@ def create_role(name, description=None):
 
     role_db = RoleDB(name=name, description=description)
     role_db = Role.add_or_update(role_db)
+    _clear_cache()
     return role_db
 
 
@@ -182,6 +202,7 @@ def delete_role(name):
 
     role_db = Role.get(name=name)
     result = Role.delete(role_db)
+    _clear_cache()
     return result
 
 
@@ -205,6 +226,7 @@ def assign_role_to_user(role_db, user_db, description=None, is_remote=False):
                                               description=description,
                                               is_remote=is_remote)
     role_assignment_db = UserRoleAssignment.add_or_update(role_assignment_db)
+    _clear_cache()
     return role_assignment_db
 
 
@@ -220,6 +242,7 @@ def revoke_role_from_user(role_db, user_db):
     """
     role_assignment_db = UserRoleAssignment.get(user=user_db.name, role=role_db.name)
     result = UserRoleAssignment.delete(role_assignment_db)
+    _clear_cache()
     return result
 
 
@@ -237,6 +260,11 @@ def get_all_permission_grants_for_user(user_db, resource_uid=None, resource_type
 
     :rtype: ``list`` or :class:`PermissionGrantDB`
     """
+    if _CACHE is not None:
+        return _CACHE.get_permission_grants(user_db=user_db, resource_uid=resource_uid,
+                                            resource_types=resource_types,
+                                            permission_types=permission_types)
+
     role_names = UserRoleAssignment.query(user=user_db.name).only('role').scalar('role')
     permission_grant_ids = Role.query(name__in=role_names).scalar('permission_grants')
     permission_grant_ids = sum(permission_grant_ids, [])
@@ -295,6 +323,9 @@ def create_permission_grant(role_db, resource_uid, resource_type, permission_typ
     # Add assignment to the role
     role_db.update(push__permission_grants=str(permission_grant_db.id))
 
+    # Note: Role is updated directly so we need to publish the update event ourselves
+    _publish_role_update(role_db)
+
     return permission_grant_db
 
 
@@ -319,6 +350,8 @@ def remove_permission_grant_for_resource_db(role_db, resource_db, permission_typ
     # Remove assignment from a role
     role_db.update(pull__permission_grants=str(permission_grant_db.id))
 
+    _publish_role_update(role_db)
+
     return permission_grant_db
 
 
@@ -352,6 +385,177 @@ def validate_roles_exists(role_names):
             raise ValueError('Role "%s" doesn\'t exist in the database' % (role_name))
 
 
+class UserPermissionsCache(object):
+    """
+    Process wide cache for the roles and permission grants assigned to each user.
+
+    Roles and permission grants for a user are retrieved with three queries on first use and
+    permission grants are indexed by (resource uid, permission type) and by permission type, so
+    subsequent permission checks don't hit the database. Entries expire after ``ttl`` seconds. To
+    keep the cache up to date across processes, it needs to be cleared on role, role assignment
+    and permission grant CUD events (see ``setup_cache``).
+    """
+
+    def __init__(self, ttl=60):
+        self._ttl = ttl
+
+        # Maps user name to a (role_dbs, grant_dbs, grants_index, expire_timestamp) tuple
+        self._users = {}
+
+        # Incremented on each invalidation. Used to avoid caching permissions which were read from
+        # the database before a concurrent invalidation.
+        self._generation = 0
+
+    def get_roles(self, user_db):
+        """
+        :rtype: ``list`` of :class:`RoleDB`
+        """
+        role_dbs, _, _ = self._get_user_permissions(user_db=user_db)
+        return list(role_dbs)
+
+    def get_permission_grants(self, user_db, resource_uid=None, resource_types=None,
+                              permission_types=None):
+        """
+        Return permission grants for the provided user. Filters have the same meaning as in
+        ``get_all_permission_grants_for_user``.
+
+        :rtype: ``list`` of :class:`PermissionGrantDB`
+        """
+        _, grant_dbs, grants_index = self._get_user_permissions(user_db=user_db)
+
+        if permission_types:
+            candidate_grant_dbs = []
+            for permission_type in permission_types:
+                key = (resource_uid, permission_type) if resource_uid else permission_type
+                candidate_grant_dbs.extend(grants_index.get(key, []))
+        else:
+            candidate_grant_dbs = [grant_db for grant_db in grant_dbs
+                                   if not resource_uid or grant_db.resource_uid == resource_uid]
+
+        result = []
+        seen_ids = set([])
+        for grant_db in candidate_grant_dbs:
+            if grant_db.id in seen_ids:
+                continue
+
+            if resource_types and grant_db.resource_type not in resource_types:
+                continue
+
+            seen_ids.add(grant_db.id)
+            result.append(grant_db)
+
+        return result
+
+    def invalidate(self, *args, **kwargs):
+        """
+        Clear the whole cache. Used as a CUD event handler.
+        """
+        self.clear()
+
+    def clear(self):
+        self._generation += 1
+        self._users.clear()
+
+    def _get_user_permissions(self, user_db):
+        entry = self._users.get(user_db.name, None)
+        if entry and entry[3] > time.time():
+            return entry[:3]
+
+        generation = self._generation
+
+        role_names = UserRoleAssignment.query(user=user_db.name).only('role').scalar('role')
+        role_dbs = list(Role.query(name__in=role_names))
+        permission_grant_ids = sum([role_db.permission_grants for role_db in role_dbs], [])
+        grant_dbs = list(PermissionGrant.query(id__in=permission_grant_ids))
+
+        grants_index = {}
+        for grant_db in grant_dbs:
+            for permission_type in grant_db.permission_types:
+                grants_index.setdefault(permission_type, []).append(grant_db)
+
+                if grant_db.resource_uid:
+                    key = (grant_db.resource_uid, permission_type)
+                    grants_index.setdefault(key, []).append(grant_db)
+
+        if generation == self._generation:
+            self._users[user_db.name] = (role_dbs, grant_dbs, grants_index,
+                                         time.time() + self._ttl)
+
+        return role_dbs, grant_dbs, grants_index
+
+    def __len__(self):
+        return len(self._users)
+
+
+def setup_cache():
+    """
+    Set up the process wide user permissions cache and start watching for RBAC CUD events if RBAC
+    and the cache are enabled in the config.
+
+    :rtype: :class:`UserPermissionsCache` or ``None``
+    """
+    global _CACHE, _CACHE_WATCHER
+
+    if not cfg.CONF.rbac.enable or not cfg.CONF.rbac.permission_cache_enabled:
+        return _CACHE
+
+    if _CACHE is not None:
+        return _CACHE
+
+    # Late import to avoid importing kombu in processes which don't use the cache
+    from st2common.services.rbac_watcher import RBACWatcher
+
+    cache = UserPermissionsCache(ttl=cfg.CONF.rbac.permission_cache_ttl)
+    watcher = RBACWatcher(create_handler=cache.invalidate,
+                          update_handler=cache.invalidate,
+                          delete_handler=cache.invalidate,
+                          queue_suffix='permissions_cache',
+                          exclusive=True)
+    watcher.start()
+
+    _CACHE = cache
+    _CACHE_WATCHER = watcher
+    return _CACHE
+
+
+def teardown_cache():
+    global _CACHE, _CACHE_WATCHER
+
+    if _CACHE_WATCHER is not None:
+        _CACHE_WATCHER.stop()
+
+    _CACHE = None
+    _CACHE_WATCHER = None
+
+
+def get_cache():
+    """
+    :rtype: :class:`UserPermissionsCache` or ``None``
+    """
+    return _CACHE
+
+
+def _clear_cache():
+    """
+    Clear the process wide cache right away so changes made in this process are visible without
+    waiting for the CUD event.
+    """
+    if _CACHE is not None:
+        _CACHE.clear()
+
+
+def _publish_role_update(role_db):
+    """
+    Publish update event for a role which has been updated in place and clear the local cache.
+    """
+    try:
+        Role.publish_update(role_db)
+    except Exception:
+        LOG.exception('Publish failed.')
+
+    _clear_cache()
+
+
 def _validate_resource_type(resource_db):
     """
     Validate that the permissions can be manipulated for the provided resource type.
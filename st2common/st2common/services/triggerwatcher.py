@@ -32,7 +32,8 @@ class TriggerWatcher(ConsumerMixin):
     sleep_interval = 0  # sleep to co-operatively yield after processing each message
 
     def __init__(self, create_handler, update_handler, delete_handler,
-                 trigger_types=None, queue_suffix=None, exclusive=False):
+                 trigger_types=None, queue_suffix=None, exclusive=False,
+                 load_all_triggers=False):
         """
         :param create_handler: Function which is called on TriggerDB create event.
         :type create_handler: ``callable``
@@ -52,12 +53,18 @@ class TriggerWatcher(ConsumerMixin):
                           single connection created by TriggerWatcher. When the connection
                           breaks the Q is removed by the message broker.
         :type exclusive: ``bool``
+
+        :param load_all_triggers: True to call create handler for all the existing triggers on
+                                  start when no trigger_types are provided. By default, only
+                                  the triggers of the provided types are loaded.
+        :type load_all_triggers: ``bool``
         """
         # TODO: Handle trigger type filtering using routing key
         self._create_handler = create_handler
         self._update_handler = update_handler
         self._delete_handler = delete_handler
         self._trigger_types = trigger_types
+        self._load_all_triggers = load_all_triggers
         self._trigger_watch_q = self._get_queue(queue_suffix, exclusive=exclusive)
 
         self.connection = None
@@ -135,7 +142,14 @@ class TriggerWatcher(ConsumerMixin):
         eventlet.sleep(seconds=self.sleep_interval)
 
     def _load_triggers_from_db(self):
-        for trigger_type in self._trigger_types:
+        if not self._trigger_types and self._load_all_triggers:
+            # No trigger type filter, watcher is interested in all the triggers
+            for trigger in Trigger.get_all():
+                LOG.debug('Found existing trigger: %s in db.' % trigger)
+                self._handlers[publishers.CREATE_RK](trigger)
+            return
+
+        for trigger_type in self._trigger_types or []:
             for trigger in Trigger.query(type=trigger_type):
                 LOG.debug('Found existing trigger: %s in db.' % trigger)
                 self._handlers[publishers.CREATE_RK](trigger)
@@ -0,0 +1,163 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# pylint: disable=assignment-from-none
+
+import eventlet
+from kombu.mixins import ConsumerMixin
+from kombu import Connection, Queue
+
+from st2common import log as logging
+from st2common.transport import publishers
+from st2common.transport import utils as transport_utils
+import st2common.util.queues as queue_utils
+
+__all__ = [
+    'BaseWatcher',
+    'CUDWatcher'
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class BaseWatcher(ConsumerMixin):
+    """
+    Base class for the watchers which consume messages from a single queue in a green thread.
+
+    Subclasses need to implement ``handle`` which is called for each message. Messages are always
+    acknowledged, even if handling fails.
+    """
+
+    sleep_interval = 0  # sleep to co-operatively yield after processing each message
+
+    def __init__(self, queue):
+        """
+        :param queue: Queue to consume the messages from.
+        :type queue: :class:`kombu.Queue`
+        """
+        self._watch_q = queue
+
+        self.connection = None
+        self._updates_thread = None
+
+    def get_consumers(self, Consumer, channel):
+        return [Consumer(queues=[self._watch_q],
+                         accept=['pickle'],
+                         callbacks=[self.process_task])]
+
+    def process_task(self, body, message):
+        LOG.debug('process_task')
+        LOG.debug('     body: %s', body)
+        LOG.debug('     message.properties: %s', message.properties)
+        LOG.debug('     message.delivery_info: %s', message.delivery_info)
+
+        try:
+            self.handle(body, message)
+        except Exception as e:
+            LOG.exception('Handling failed. Message body: %s. Exception: %s', body, e.message)
+        finally:
+            message.ack()
+
+        eventlet.sleep(self.sleep_interval)
+
+    def handle(self, body, message):
+        raise NotImplementedError('handle() not implemented')
+
+    def start(self):
+        try:
+            self.connection = Connection(transport_utils.get_messaging_urls())
+            self._updates_thread = eventlet.spawn(self.run)
+        except:
+            LOG.exception('Failed to start %s.', self.__class__.__name__)
+            self.connection.release()
+
+    def stop(self):
+        try:
+            if self._updates_thread:
+                self._updates_thread = eventlet.kill(self._updates_thread)
+        finally:
+            if self.connection:
+                self.connection.release()
+
+    # Note: We sleep after we consume a message so we give a chance to other
+    # green threads to run. If we don't do that, ConsumerMixin will block on
+    # waiting for a message on the queue.
+
+    def on_consume_end(self, connection, channel):
+        super(BaseWatcher, self).on_consume_end(connection=connection,
+                                                channel=channel)
+        eventlet.sleep(seconds=self.sleep_interval)
+
+    def on_iteration(self):
+        super(BaseWatcher, self).on_iteration()
+        eventlet.sleep(seconds=self.sleep_interval)
+
+
+class CUDWatcher(BaseWatcher):
+    """
+    Base class for the watchers which call the provided handlers on the create, update and delete
+    events of a model.
+
+    Subclasses need to provide the exchange the model CUD events are published on and the base
+    name of the watch queue.
+    """
+
+    exchange = None
+    queue_name_base = None
+
+    def __init__(self, create_handler, update_handler, delete_handler,
+                 queue_suffix=None, exclusive=False):
+        """
+        :param create_handler: Function which is called on the model create event.
+        :type create_handler: ``callable``
+
+        :param update_handler: Function which is called on the model update event.
+        :type update_handler: ``callable``
+
+        :param delete_handler: Function which is called on the model delete event.
+        :type delete_handler: ``callable``
+
+        :param exclusive: If the Q is exclusive to a specific connection which is then
+                          single connection created by the watcher. When the connection
+                          breaks the Q is removed by the message broker.
+        :type exclusive: ``bool``
+        """
+        self._create_handler = create_handler
+        self._update_handler = update_handler
+        self._delete_handler = delete_handler
+
+        self._handlers = {
+            publishers.CREATE_RK: create_handler,
+            publishers.UPDATE_RK: update_handler,
+            publishers.DELETE_RK: delete_handler
+        }
+
+        queue = self._get_queue(queue_suffix=queue_suffix, exclusive=exclusive)
+        super(CUDWatcher, self).__init__(queue=queue)
+
+    def handle(self, body, message):
+        routing_key = message.delivery_info.get('routing_key', '')
+        handler = self._handlers.get(routing_key, None)
+
+        if not handler:
+            LOG.debug('Skipping message %s as no handler was found.', message)
+            return
+
+        handler(body)
+
+    def _get_queue(self, queue_suffix, exclusive):
+        queue_name = queue_utils.get_queue_name(queue_name_base=self.queue_name_base,
+                                                queue_name_suffix=queue_suffix,
+                                                add_random_uuid_to_suffix=True)
+        return Queue(queue_name, self.exchange, routing_key='#', exclusive=exclusive)
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 from st2common.transport import liveaction, actionexecutionstate, execution, publishers, reactor
+from st2common.transport import keyvalue, rbac
 from st2common.transport import bootstrap_utils, utils, connection_retry_wrapper
 
 # TODO(manas) : Exchanges, Queues and RoutingKey design discussion pending.
@@ -22,6 +23,8 @@ __all__ = [
     'liveaction',
     'actionexecutionstate',
     'execution',
+    'keyvalue',
+    'rbac',
     'publishers',
     'reactor',
     'bootstrap_utils',
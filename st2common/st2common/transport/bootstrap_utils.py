@@ -23,8 +23,10 @@ from st2common.transport.actionexecutionstate import ACTIONEXECUTIONSTATE_XCHG
 from st2common.transport.announcement import ANNOUNCEMENT_XCHG
 from st2common.transport.connection_retry_wrapper import ConnectionRetryWrapper
 from st2common.transport.execution import EXECUTION_XCHG
+from st2common.transport.keyvalue import KEY_VALUE_PAIR_XCHG
 from st2common.transport.liveaction import LIVEACTION_XCHG, LIVEACTION_STATUS_MGMT_XCHG
-from st2common.transport.reactor import SENSOR_CUD_XCHG
+from st2common.transport.rbac import RBAC_XCHG
+from st2common.transport.reactor import RULE_CUD_XCHG, SENSOR_CUD_XCHG
 from st2common.transport.reactor import TRIGGER_CUD_XCHG, TRIGGER_INSTANCE_XCHG
 
 LOG = logging.getLogger('st2common.transport.bootstrap')
@@ -35,7 +37,7 @@ __all__ = [
 
 EXCHANGES = [ACTIONEXECUTIONSTATE_XCHG, ANNOUNCEMENT_XCHG, EXECUTION_XCHG, LIVEACTION_XCHG,
              LIVEACTION_STATUS_MGMT_XCHG, TRIGGER_CUD_XCHG, TRIGGER_INSTANCE_XCHG,
-             SENSOR_CUD_XCHG]
+             SENSOR_CUD_XCHG, RULE_CUD_XCHG, KEY_VALUE_PAIR_XCHG, RBAC_XCHG]
 
 
 def _do_register_exchange(exchange, connection, channel, retry_wrapper):
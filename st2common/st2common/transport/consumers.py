@@ -14,6 +14,8 @@
 # limitations under the License.
 
 import abc
+import time
+
 import eventlet
 import six
 
@@ -36,12 +38,26 @@ LOG = logging.getLogger(__name__)
 
 
 class QueueConsumer(ConsumerMixin):
-    def __init__(self, connection, queues, handler):
+    """
+    Queue consumer which dispatches received messages to a green thread pool.
+
+    When ``batch_size`` is larger than 1 the consumer works in batched mode. In this mode up to
+    ``batch_size`` messages are prefetched and buffered. The buffer is processed together and all
+    the messages in it are acknowledged with a single ack once it's full or once the oldest
+    buffered message is older than ``batch_flush_interval`` seconds.
+    """
+
+    def __init__(self, connection, queues, handler, batch_size=1, batch_flush_interval=1):
         self.connection = connection
         self._dispatcher = BufferedDispatcher()
         self._queues = queues
         self._handler = handler
 
+        self._batch_size = batch_size
+        self._batch_flush_interval = batch_flush_interval
+        self._batch = []
+        self._batch_start_ts = None
+
     def shutdown(self):
         self._dispatcher.shutdown()
 
@@ -49,12 +65,27 @@ class QueueConsumer(ConsumerMixin):
         consumer = Consumer(queues=self._queues, accept=['pickle'], callbacks=[self.process])
 
         # use prefetch_count=1 for fair dispatch. This way workers that finish an item get the next
-        # task and the work does not get queued behind any single large item.
-        consumer.qos(prefetch_count=1)
+        # task and the work does not get queued behind any single large item. In batched mode we
+        # need to prefetch a whole batch.
+        consumer.qos(prefetch_count=self._batch_size)
 
         return [consumer]
 
+    def on_iteration(self):
+        # Called by ConsumerMixin on each iteration of the consume loop and at least once every
+        # second when there are no messages. This makes sure a partial batch doesn't sit in the
+        # buffer forever.
+        if self._batch_size <= 1 or not self._batch:
+            return
+
+        if (time.time() - self._batch_start_ts) >= self._batch_flush_interval:
+            self._flush_batch()
+
     def process(self, body, message):
+        if self._batch_size > 1:
+            self._add_to_batch(body, message)
+            return
+
         try:
             if not isinstance(body, self._handler.message_type):
                 raise TypeError('Received an unexpected type "%s" for payload.' % type(body))
@@ -72,6 +103,106 @@ class QueueConsumer(ConsumerMixin):
         except:
             LOG.exception('%s failed to process message: %s', self.__class__.__name__, body)
 
+    def _add_to_batch(self, body, message):
+        if not self._batch:
+            self._batch_start_ts = time.time()
+
+        self._batch.append((body, message))
+
+        if len(self._batch) >= self._batch_size:
+            self._flush_batch()
+
+    def _flush_batch(self):
+        batch, self._batch = self._batch, []
+        messages = [message for _, message in batch]
+
+        bodies = []
+        for body, _ in batch:
+            if not isinstance(body, self._handler.message_type):
+                LOG.error('%s received an unexpected type "%s" for payload: %s',
+                          self.__class__.__name__, type(body), body)
+                continue
+
+            bodies.append(body)
+
+        try:
+            responses = self._pre_ack_process_batch(bodies) if bodies else []
+        except:
+            # Fall back to processing messages one by one so a single failure doesn't result in
+            # the whole batch being lost
+            LOG.exception('%s failed to process batch of %s messages, processing messages one '
+                          'by one.', self.__class__.__name__, len(bodies))
+            responses = self._pre_ack_process_messages(bodies)
+
+        # At this point we will always ack all the messages in the batch. If the ack fails (e.g.
+        # channel is closed), messages will be redelivered by the broker so we don't dispatch
+        # them to avoid processing them twice.
+        if not self._ack_batch(messages):
+            LOG.error('%s dropping batch of %s messages which failed to be acknowledged.',
+                      self.__class__.__name__, len(messages))
+            return
+
+        for response in responses:
+            try:
+                self._dispatcher.dispatch(self._process_message, response)
+            except:
+                LOG.exception('%s failed to dispatch message: %s', self.__class__.__name__,
+                              response)
+
+    def _pre_ack_process_batch(self, bodies):
+        """
+        Process a batch of messages before it's acknowledged and return a list of items which are
+        dispatched to the pool.
+        """
+        return bodies
+
+    def _pre_ack_process_message(self, body):
+        """
+        Process a single message before it's acknowledged and return an item which is dispatched
+        to the pool. Used when processing of the whole batch fails.
+        """
+        return body
+
+    def _pre_ack_process_messages(self, bodies):
+        responses = []
+
+        for body in bodies:
+            try:
+                responses.append(self._pre_ack_process_message(body))
+            except:
+                LOG.exception('%s failed to process message: %s', self.__class__.__name__, body)
+
+        return responses
+
+    def _ack_batch(self, messages):
+        """
+        Acknowledge all the provided messages using a single ack with multiple=True.
+
+        Delivery tags are only unique per channel so we fall back to acknowledging messages one by
+        one if the channel changed in the middle of the batch (e.g. on reconnect).
+
+        :return: ``True`` if all the messages have been acknowledged, ``False`` otherwise.
+        :rtype: ``bool``
+        """
+        if not messages:
+            return True
+
+        last_message = messages[-1]
+        channels = set([id(message.channel) for message in messages])
+
+        try:
+            if len(channels) == 1:
+                last_message.channel.basic_ack(last_message.delivery_tag, multiple=True)
+            else:
+                for message in messages:
+                    message.ack()
+        except:
+            LOG.exception('%s failed to ack batch of %s messages.', self.__class__.__name__,
+                          len(messages))
+            return False
+
+        return True
+
 
 class StagedQueueConsumer(QueueConsumer):
     """
@@ -79,6 +210,10 @@ class StagedQueueConsumer(QueueConsumer):
     """
 
     def process(self, body, message):
+        if self._batch_size > 1:
+            self._add_to_batch(body, message)
+            return
+
         try:
             if not isinstance(body, self._handler.message_type):
                 raise TypeError('Received an unexpected type "%s" for payload.' % type(body))
@@ -90,6 +225,12 @@ class StagedQueueConsumer(QueueConsumer):
             # At this point we will always ack a message.
             message.ack()
 
+    def _pre_ack_process_batch(self, bodies):
+        return self._handler.pre_ack_process_batch(bodies)
+
+    def _pre_ack_process_message(self, body):
+        return self._handler.pre_ack_process(body)
+
 
 class ActionsQueueConsumer(QueueConsumer):
     """
@@ -107,6 +248,12 @@ class ActionsQueueConsumer(QueueConsumer):
         self._queues = queues
         self._handler = handler
 
+        # Batching is not supported since workflow and regular actions use different pools
+        self._batch_size = 1
+        self._batch_flush_interval = 0
+        self._batch = []
+        self._batch_start_ts = None
+
         workflows_pool_size = cfg.CONF.actionrunner.workflows_pool_size
         actions_pool_size = cfg.CONF.actionrunner.actions_pool_size
         self._workflows_dispatcher = BufferedDispatcher(dispatch_pool_size=workflows_pool_size,
@@ -194,5 +341,27 @@ class StagedMessageHandler(MessageHandler):
         """
         pass
 
+    def pre_ack_process_batch(self, messages):
+        """
+        Called before acknowleding a batch of messages when the consumer works in batched mode.
+
+        Handlers should override this method to track the whole batch at once (e.g. using a single
+        bulk DB insert). The default implementation calls ``pre_ack_process`` for each message.
+
+        :return: List of responses, each of which is passed into the ``process`` method. Messages
+                 which failed to process should be left out.
+        :rtype: ``list``
+        """
+        responses = []
+
+        for message in messages:
+            try:
+                responses.append(self.pre_ack_process(message))
+            except:
+                LOG.exception('%s failed to process message: %s', self.__class__.__name__,
+                              message)
+
+        return responses
+
     def get_queue_consumer(self, connection, queues):
         return StagedQueueConsumer(connection=connection, queues=queues, handler=self)
@@ -146,16 +146,20 @@ def get_action_by_ref(ref):
         return None
 
 
-def get_liveaction_by_id(liveaction_id):
+def get_liveaction_by_id(liveaction_id, only_fields=None):
     """
         Get LiveAction by id.
 
         On error, raise ST2DBObjectNotFoundError.
+
+        :param only_fields: Optional list of fields to retrieve. If not provided, the whole
+                            object is retrieved.
+        :type only_fields: ``list``
     """
     liveaction = None
 
     try:
-        liveaction = LiveAction.get_by_id(liveaction_id)
+        liveaction = LiveAction.get_by_id(liveaction_id, only_fields=only_fields)
     except (ValidationError, ValueError) as e:
         LOG.error('Database lookup for LiveAction with id="%s" resulted in '
                   'exception: %s', liveaction_id, e)
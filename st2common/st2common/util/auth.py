@@ -14,9 +14,13 @@
 # limitations under the License.
 
 import base64
+import collections
 import hashlib
 import os
 import random
+import time
+
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.persistence.auth import Token, ApiKey
@@ -29,12 +33,99 @@ __all__ = [
     'validate_token_and_source',
     'generate_api_key',
     'validate_api_key',
-    'validate_api_key_and_source'
+    'validate_api_key_and_source',
+
+    'invalidate_token',
+    'invalidate_api_key',
+    'clear_validation_cache',
+
+    'ValidationCache'
 ]
 
 LOG = logging.getLogger(__name__)
 
 
+class ValidationCache(object):
+    """
+    Bounded cache for validated objects (tokens, API keys) with a TTL.
+
+    Values are cached for ``ttl`` seconds. Once the cache holds more than ``max_size`` values,
+    the least recently used values are evicted.
+    """
+
+    def __init__(self, ttl=10, max_size=1000):
+        self._ttl = ttl
+        self._max_size = max_size
+
+        # Maps key to a (value, expire_timestamp) tuple
+        self._values = collections.OrderedDict()
+
+    def get(self, key):
+        """
+        Return cached value for the provided key or ``None`` if it's not cached or it has expired.
+        """
+        entry = self._values.pop(key, None)
+        if not entry or entry[1] <= time.time():
+            return None
+
+        # Move the entry to the end so it's evicted last
+        self._values[key] = entry
+        return entry[0]
+
+    def set(self, key, value):
+        if self._ttl <= 0:
+            return
+
+        self._values.pop(key, None)
+        self._values[key] = (value, time.time() + self._ttl)
+
+        while len(self._values) > self._max_size:
+            self._values.popitem(last=False)
+
+    def invalidate(self, key):
+        self._values.pop(key, None)
+
+    def invalidate_values(self, predicate):
+        """
+        Invalidate all the cached values for which the provided function returns True.
+        """
+        keys = [key for key, (value, _) in self._values.items() if predicate(value)]
+        for key in keys:
+            self._values.pop(key, None)
+
+    def clear(self):
+        self._values.clear()
+
+    def __len__(self):
+        return len(self._values)
+
+
+# Process wide caches for validated tokens (keyed by the token string) and API keys (keyed by the
+# key itself so we don't need to hash it on each request)
+_TOKEN_CACHE = None
+_API_KEY_CACHE = None
+
+
+def _get_token_cache():
+    global _TOKEN_CACHE
+
+    if _TOKEN_CACHE is None:
+        _TOKEN_CACHE = ValidationCache(ttl=cfg.CONF.auth.validation_cache_ttl,
+                                       max_size=cfg.CONF.auth.validation_cache_max_size)
+
+    return _TOKEN_CACHE
+
+
+def _get_api_key_cache():
+    global _API_KEY_CACHE
+
+    if _API_KEY_CACHE is None:
+        _API_KEY_CACHE = ValidationCache(ttl=cfg.CONF.auth.validation_cache_ttl,
+                                         max_size=cfg.CONF.auth.validation_cache_max_size)
+
+    return _API_KEY_CACHE
+
+
 def validate_token(token_string):
     """
     Validate the provided authentication token.
@@ -45,7 +136,12 @@ def validate_token(token_string):
     :return: TokenDB object on success.
     :rtype: :class:`.TokenDB`
     """
-    token = Token.get(token_string)
+    token_cache = _get_token_cache()
+    token = token_cache.get(token_string)
+
+    if not token:
+        token = Token.get(token_string)
+        token_cache.set(token_string, token)
 
     if token.expiry <= date_utils.get_datetime_utc_now():
         # TODO: purge expired tokens
@@ -115,10 +211,17 @@ def validate_api_key(api_key):
     :return: TokenDB object on success.
     :rtype: :class:`.ApiKeyDB`
     """
-    api_key_db = ApiKey.get(api_key)
+    api_key_cache = _get_api_key_cache()
+    api_key_db = api_key_cache.get(api_key)
+
+    if not api_key_db:
+        api_key_db = ApiKey.get(api_key)
 
-    if not api_key_db.enabled:
-        raise exceptions.ApiKeyDisabledError('API key is disabled.')
+        if not api_key_db.enabled:
+            raise exceptions.ApiKeyDisabledError('API key is disabled.')
+
+        # Note: Only enabled API keys are cached so re-enabling a key takes effect right away
+        api_key_cache.set(api_key, api_key_db)
 
     LOG.audit('API key with id "%s" is validated.' % (api_key_db.id))
 
@@ -149,3 +252,32 @@ def validate_api_key_and_source(api_key_in_headers, api_key_query_params):
         LOG.audit('API key provided in query parameters')
 
     return validate_api_key(api_key_in_headers or api_key_query_params)
+
+
+def invalidate_token(token_string):
+    """
+    Remove the provided token from the validation cache. Needs to be called when a token is
+    deleted.
+    """
+    if _TOKEN_CACHE is not None:
+        _TOKEN_CACHE.invalidate(token_string)
+
+
+def invalidate_api_key(api_key_db):
+    """
+    Remove the provided API key from the validation cache. Needs to be called when an API key is
+    updated (e.g. disabled) or deleted.
+
+    :type api_key_db: :class:`.ApiKeyDB`
+    """
+    if _API_KEY_CACHE is not None:
+        _API_KEY_CACHE.invalidate_values(
+            lambda cached_api_key_db: cached_api_key_db.id == api_key_db.id)
+
+
+def clear_validation_cache():
+    if _TOKEN_CACHE is not None:
+        _TOKEN_CACHE.clear()
+
+    if _API_KEY_CACHE is not None:
+        _API_KEY_CACHE.clear()
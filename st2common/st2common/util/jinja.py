@@ -13,17 +13,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import json
 import six
 
 from st2common import log as logging
+from st2common.constants.keyvalue import DATASTORE_PARENT_SCOPE, SYSTEM_SCOPE
 from st2common.util.compat import to_unicode
 
 
 __all__ = [
     'get_jinja_environment',
+    'get_template',
+    'get_template_cache_stats',
+    'clear_template_cache',
     'render_values',
-    'is_jinja_expression'
+    'is_jinja_expression',
+    'get_datastore_keys'
 ]
 
 # Magic string to which None type is serialized when using use_none filter
@@ -36,6 +42,18 @@ JINJA_EXPRESSIONS_START_MARKERS = [
 
 LOG = logging.getLogger(__name__)
 
+# Process wide Jinja environments used by get_template. Environments are keyed by the value of
+# "allow_undefined" argument.
+_ENVIRONMENTS = {}
+
+# LRU cache of compiled templates keyed by ("allow_undefined", template source string)
+_TEMPLATE_CACHE = collections.OrderedDict()
+_TEMPLATE_CACHE_MAX_SIZE = 1000
+_TEMPLATE_CACHE_STATS = {
+    'hits': 0,
+    'misses': 0
+}
+
 
 def use_none(value):
     if value is None:
@@ -102,6 +120,63 @@ def get_jinja_environment(allow_undefined=False, trim_blocks=True, lstrip_blocks
     return env
 
 
+def get_template(value, allow_undefined=False):
+    """
+    Return compiled template for the provided template string.
+
+    Templates are compiled using process wide environments and the compiled templates are
+    cached so each template string is only compiled once.
+
+    :param value: Template string.
+    :type value: ``str``
+
+    :param allow_undefined: True to allow undefined variables in the template.
+    :type allow_undefined: ``bool``
+
+    :rtype: :class:`jinja2.Template`
+    """
+    key = (allow_undefined, value)
+
+    template = _TEMPLATE_CACHE.pop(key, None)
+    if template is not None:
+        _TEMPLATE_CACHE_STATS['hits'] += 1
+        # Move the template to the end so it's evicted last
+        _TEMPLATE_CACHE[key] = template
+        return template
+
+    _TEMPLATE_CACHE_STATS['misses'] += 1
+
+    env = _ENVIRONMENTS.get(allow_undefined, None)
+    if not env:
+        env = get_jinja_environment(allow_undefined=allow_undefined)
+        _ENVIRONMENTS[allow_undefined] = env
+
+    template = env.from_string(value)
+
+    if len(_TEMPLATE_CACHE) >= _TEMPLATE_CACHE_MAX_SIZE:
+        _TEMPLATE_CACHE.popitem(last=False)
+    _TEMPLATE_CACHE[key] = template
+
+    return template
+
+
+def get_template_cache_stats():
+    """
+    Return compiled templates cache statistics.
+
+    :rtype: ``dict``
+    """
+    stats = dict(_TEMPLATE_CACHE_STATS)
+    stats['size'] = len(_TEMPLATE_CACHE)
+    return stats
+
+
+def clear_template_cache():
+    _TEMPLATE_CACHE.clear()
+    _TEMPLATE_CACHE_STATS['hits'] = 0
+    _TEMPLATE_CACHE_STATS['misses'] = 0
+
+
 def render_values(mapping=None, context=None, allow_undefined=False):
     """
     Render an incoming mapping using context provided in context using Jinja2. Returns a dict
@@ -126,7 +201,6 @@ def render_values(mapping=None, context=None, allow_undefined=False):
     super_context['__context'] = context
     super_context.update(context)
 
-    env = get_jinja_environment(allow_undefined=allow_undefined)
     rendered_mapping = {}
     for k, v in six.iteritems(mapping):
         # jinja2 works with string so transform list and dict to strings.
@@ -144,7 +218,8 @@ def render_values(mapping=None, context=None, allow_undefined=False):
 
         try:
             LOG.info('Rendering string %s. Super context=%s', v, super_context)
-            rendered_v = env.from_string(v).render(super_context)
+            template = get_template(v, allow_undefined=allow_undefined)
+            rendered_v = template.render(super_context)
         except Exception as e:
             # Attach key and value which failed the rendering
             e.key = k
@@ -176,3 +251,61 @@ def is_jinja_expression(value):
             return True
 
     return False
+
+
+def get_datastore_keys(template_ast, scope=SYSTEM_SCOPE):
+    """
+    Return names of all the datastore keys in the provided scope which are referenced in the
+    template (e.g. "foo" and "foo.bar" for "{{ st2kv.system.foo.bar }}").
+
+    Only static references are returned. References which use a variable as a key (e.g.
+    "{{ st2kv.system[name] }}") are ignored.
+
+    :param template_ast: Parsed template.
+    :type template_ast: :class:`jinja2.nodes.Template`
+
+    :rtype: ``set``
+    """
+    from jinja2 import nodes
+
+    result = set()
+
+    for node in template_ast.find_all((nodes.Getattr, nodes.Getitem)):
+        path = _get_attribute_path(node)
+
+        if not path or len(path) < 3:
+            continue
+
+        if path[0] != DATASTORE_PARENT_SCOPE or path[1] != scope:
+            continue
+
+        result.add('.'.join(path[2:]))
+
+    return result
+
+
+def _get_attribute_path(node):
+    """
+    Return a list of names for a chain of static attribute / item lookups (e.g.
+    ['st2kv', 'system', 'foo'] for "st2kv.system['foo']").
+    """
+    from jinja2 import nodes
+
+    path = []
+
+    while isinstance(node, (nodes.Getattr, nodes.Getitem)):
+        if isinstance(node, nodes.Getattr):
+            path.append(node.attr)
+        elif isinstance(node.arg, nodes.Const) and isinstance(node.arg.value, six.string_types):
+            path.append(node.arg.value)
+        else:
+            return None
+
+        node = node.node
+
+    if not isinstance(node, nodes.Name):
+        return None
+
+    path.append(node.name)
+    path.reverse()
+    return path
@@ -13,9 +13,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
+import re
+
 import six
 
+__all__ = [
+    'escape_chars',
+    'unescape_chars'
+]
+
 # http://docs.mongodb.org/manual/faq/developers/#faq-dollar-sign-escaping
 UNESCAPED = ['.', '$']
 ESCAPED = [u'\uFF0E', u'\uFF04']
@@ -30,49 +36,103 @@ RULE_CRITERIA_ESCAPE_TRANSLATION = dict(zip(RULE_CRITERIA_UNESCAPED,
 RULE_CRITERIA_UNESCAPE_TRANSLATION = dict(zip(RULE_CRITERIA_ESCAPED,
                                               RULE_CRITERIA_UNESCAPED))
 
+# Translation used when unescaping - both, the current and the old rule criteria escape characters
+# are translated in a single pass
+_ALL_UNESCAPE_TRANSLATION = dict(UNESCAPE_TRANSLATION)
+_ALL_UNESCAPE_TRANSLATION.update(RULE_CRITERIA_UNESCAPE_TRANSLATION)
 
-def _prep_work_items(d):
-    return [(k, v, d) for k, v in six.iteritems(d)]
 
+def _get_translation_regex(translation):
+    return re.compile(u'|'.join([re.escape(char) for char in translation.keys()]), re.UNICODE)
+
+
+_ESCAPE_REGEX = _get_translation_regex(ESCAPE_TRANSLATION)
+_UNESCAPE_REGEX = _get_translation_regex(_ALL_UNESCAPE_TRANSLATION)
 
-def _translate_chars(field, translation):
-    # Only translate the fields of a dict
-    if not isinstance(field, dict):
-        return field
 
-    work_items = _prep_work_items(field)
+def _translate_key(key, regex, translation):
+    if not isinstance(key, six.string_types) or not regex.search(key):
+        return key
 
-    while len(work_items) > 0:
-        work_item = work_items.pop(0)
-        oldkey = work_item[0]
-        value = work_item[1]
-        work_field = work_item[2]
-        newkey = oldkey
+    return regex.sub(lambda match: translation[match.group(0)], key)
 
-        for t_k, t_v in six.iteritems(translation):
-            newkey = newkey.replace(t_k, t_v)
 
-        if newkey != oldkey:
-            work_field[newkey] = value
-            del work_field[oldkey]
+def _translate_dict(field, regex, translation):
+    """
+    Translate keys of the provided dictionary and all the nested dictionaries.
+
+    The input is never modified. A dictionary is only copied if it (or any of the nested values)
+    contains a key which needs to be translated, otherwise the original object is returned.
+    """
+    result = None
+
+    for key, value in six.iteritems(field):
+        new_key = _translate_key(key, regex, translation)
 
         if isinstance(value, dict):
-            work_items.extend(_prep_work_items(value))
+            new_value = _translate_dict(value, regex, translation)
         elif isinstance(value, list):
-            for item in value:
-                if isinstance(item, dict):
-                    work_items.extend(_prep_work_items(item))
+            new_value = _translate_list(value, regex, translation)
+        else:
+            new_value = value
+
+        if result is None:
+            if new_key is key and new_value is value:
+                continue
+
+            # First change, copy the container
+            result = dict(field)
+
+        if new_key is not key:
+            del result[key]
+
+        result[new_key] = new_value
+
+    return field if result is None else result
 
-    return field
+
+def _translate_list(field, regex, translation):
+    """
+    Translate keys of the dictionaries which are items of the provided list. Lists which don't
+    contain dictionaries are returned as-is.
+    """
+    result = None
+
+    for index, item in enumerate(field):
+        if not isinstance(item, dict):
+            continue
+
+        new_item = _translate_dict(item, regex, translation)
+
+        if new_item is not item:
+            if result is None:
+                result = list(field)
+
+            result[index] = new_item
+
+    return field if result is None else result
+
+
+def _translate_chars(field, regex, translation):
+    # Only translate the fields of a dict
+    if not isinstance(field, dict):
+        return field
+
+    return _translate_dict(field, regex, translation)
 
 
 def escape_chars(field):
-    value = copy.deepcopy(field)
-    return _translate_chars(value, ESCAPE_TRANSLATION)
+    """
+    Escape "." and "$" characters in the dictionary keys.
+
+    Note: The provided value is not modified, but the returned value shares all the nested values
+    which don't need escaping with it.
+    """
+    return _translate_chars(field, _ESCAPE_REGEX, ESCAPE_TRANSLATION)
 
 
 def unescape_chars(field):
-    value = copy.deepcopy(field)
-    translated = _translate_chars(value, UNESCAPE_TRANSLATION)
-    translated = _translate_chars(value, RULE_CRITERIA_UNESCAPE_TRANSLATION)
-    return translated
+    """
+    Reverse of escape_chars.
+    """
+    return _translate_chars(field, _UNESCAPE_REGEX, _ALL_UNESCAPE_TRANSLATION)
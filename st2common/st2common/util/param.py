@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import copy
 import json
 import re
 import six
@@ -32,6 +34,18 @@ from st2common.util import jinja as jinja_utils
 LOG = logging.getLogger(__name__)
 ENV = jinja_utils.get_jinja_environment()
 
+# Placeholder for the value which is only known when rendering (provided parameter value or base
+# context variable)
+_PARAM_VALUE = object()
+
+_STEP_PARAM = 'param'
+_STEP_VALUE = 'value'
+_STEP_TEMPLATE = 'template'
+
+# Render plans keyed by the parameter schemas and the shape of the provided parameters
+_PLAN_CACHE = collections.OrderedDict()
+_PLAN_CACHE_MAX_SIZE = 500
+
 __all__ = [
     'render_live_params',
     'render_final_params',
@@ -71,17 +85,25 @@ def _cast(v, parameter_schema):
     return cast(v)
 
 
-def _create_graph(action_context):
+def _create_graph():
     '''
     Creates a generic directed graph for depencency tree and fills it with basic context variables
     '''
     G = nx.DiGraph()
-    system_keyvalue_context = {SYSTEM_SCOPE: KeyValueLookup(scope=FULL_SYSTEM_SCOPE)}
-    G.add_node(DATASTORE_PARENT_SCOPE, value=system_keyvalue_context)
-    G.add_node(ACTION_CONTEXT_KV_PREFIX, value=action_context)
+    G.add_node(DATASTORE_PARENT_SCOPE, value=_PARAM_VALUE)
+    G.add_node(ACTION_CONTEXT_KV_PREFIX, value=_PARAM_VALUE)
     return G
 
 
+def _is_template(value):
+    complex_value_str = None
+    if isinstance(value, list) or isinstance(value, dict):
+        complex_value_str = str(value)
+
+    return (jinja_utils.is_jinja_expression(value) or
+            jinja_utils.is_jinja_expression(complex_value_str))
+
+
 def _process(G, name, value):
     '''
     Determines whether parameter is a template or a value. Adds graph nodes and edges accordingly.
@@ -91,17 +113,7 @@ def _process(G, name, value):
     if isinstance(value, str):
         value = to_unicode(value)
 
-    complex_value_str = None
-    if isinstance(value, list) or isinstance(value, dict):
-        complex_value_str = str(value)
-
-    is_jinja_expr = (
-        jinja_utils.is_jinja_expression(value) or jinja_utils.is_jinja_expression(
-            complex_value_str
-        )
-    )
-
-    if is_jinja_expr:
+    if _is_template(value):
         G.add_node(name, template=value)
 
         template_ast = ENV.parse(value)
@@ -115,6 +127,11 @@ def _process(G, name, value):
         if dependencies:
             for dependency in dependencies:
                 G.add_edge(dependency, name)
+
+        # Remember datastore keys used in the template so they can be retrieved in one go
+        if DATASTORE_PARENT_SCOPE in dependencies:
+            datastore_keys = G.graph.setdefault('datastore_keys', set())
+            datastore_keys.update(jinja_utils.get_datastore_keys(template_ast))
     else:
         G.add_node(name, value=value)
 
@@ -146,57 +163,169 @@ def _validate(G):
         raise ParamException(msg)
 
 
-def _render(node, render_context):
+def _compile(name, template):
     '''
-    Render the node depending on its type
+    Compile the node template. Returns compiled template and a flag telling whether the rendered
+    template represents a complex type.
     '''
-    if 'template' in node:
-        complex_type = False
+    complex_type = False
 
-        if isinstance(node['template'], list) or isinstance(node['template'], dict):
-            node['template'] = json.dumps(node['template'])
+    if isinstance(template, list) or isinstance(template, dict):
+        template = json.dumps(template)
 
-            # Finds occourances of "{{variable}}" and adds `to_complex` filter
-            # so types are honored. If it doesn't follow that syntax then it's
-            # rendered as a string.
-            node['template'] = re.sub(
-                r'"{{([A-z0-9_-]+)}}"', r'{{\1 | to_complex}}',
-                node['template']
-            )
-            LOG.debug('Rendering complex type: %s', node['template'])
-            complex_type = True
+        # Finds occourances of "{{variable}}" and adds `to_complex` filter
+        # so types are honored. If it doesn't follow that syntax then it's
+        # rendered as a string.
+        template = re.sub(
+            r'"{{([A-z0-9_-]+)}}"', r'{{\1 | to_complex}}',
+            template
+        )
+        LOG.debug('Compiling complex type: %s', template)
+        complex_type = True
+
+    try:
+        return ENV.from_string(str(template)), complex_type
+    except Exception as e:
+        LOG.debug('Failed to render %s: %s', name, e, exc_info=True)
+        msg = 'Failed to render parameter "%s": %s' % (name, str(e))
+        raise ParamException(msg)
 
-        LOG.debug('Rendering node: %s with context: %s', node, render_context)
 
-        result = ENV.from_string(str(node['template'])).render(render_context)
+class RenderPlan(object):
+    '''
+    Precomputed way of rendering a set of parameters - compiled templates of all the parameters
+    in the order they need to be rendered in.
 
-        LOG.debug('Render complete: %s', result)
+    Plan only depends on the parameter schemas, templates and names of the provided parameters so
+    it can be built once and then reused for rendering the values of all the executions of the
+    same action.
+    '''
 
-        if complex_type:
-            result = json.loads(result)
-            LOG.debug('Complex Type Rendered: %s', result)
+    def __init__(self, G):
+        self.steps = []
+        self.datastore_keys = G.graph.get('datastore_keys', set())
+
+        for name in nx.topological_sort(G):
+            node = G.node[name]
+
+            if 'template' in node:
+                template, complex_type = _compile(name, node['template'])
+                self.steps.append((name, _STEP_TEMPLATE, (template, complex_type)))
+            elif node['value'] is _PARAM_VALUE:
+                self.steps.append((name, _STEP_PARAM, None))
+            else:
+                self.steps.append((name, _STEP_VALUE, node['value']))
+
+    def render(self, values):
+        '''
+        Render the parameters using the provided values of the (non-template) parameters and base
+        context variables.
+        '''
+        context = {}
+        for name, step_type, data in self.steps:
+            try:
+                if step_type == _STEP_PARAM:
+                    context[name] = values[name]
+                elif step_type == _STEP_VALUE:
+                    # Values are shared by all the renders so they shouldn't be modified in place
+                    context[name] = copy.deepcopy(data)
+                else:
+                    context[name] = _render(data[0], data[1], context)
+            except Exception as e:
+                LOG.debug('Failed to render %s: %s', name, e, exc_info=True)
+                msg = 'Failed to render parameter "%s": %s' % (name, str(e))
+                raise ParamException(msg)
+
+        return context
+
+
+def _render(template, complex_type, render_context):
+    '''
+    Render the compiled template
+    '''
+    LOG.debug('Rendering template with context: %s', render_context)
 
-        return result
-    if 'value' in node:
-        return node['value']
+    result = template.render(render_context)
+
+    LOG.debug('Render complete: %s', result)
+
+    if complex_type:
+        result = json.loads(result)
+        LOG.debug('Complex Type Rendered: %s', result)
+
+    return result
 
 
-def _resolve_dependencies(G):
+def _get_plan_key(runner_parameters, action_parameters, params, templates):
     '''
-    Traverse the dependency graph starting from resolved nodes
+    Return key which identifies the render plan. Schemas are part of the key so the plan is
+    rebuilt when the action or runner parameters change.
     '''
-    context = {}
-    for name in nx.topological_sort(G):
-        node = G.node[name]
-        try:
-            context[name] = _render(node, context)
-
-        except Exception as e:
-            LOG.debug('Failed to render %s: %s', name, e, exc_info=True)
-            msg = 'Failed to render parameter "%s": %s' % (name, str(e))
-            raise ParamException(msg)
+    params_key = []
+    for name, value in sorted(six.iteritems(params)):
+        if value is None:
+            params_key.append((name, None))
+        elif templates and _is_template(value):
+            params_key.append((name, json.dumps(value, sort_keys=True, default=str)))
+        else:
+            params_key.append((name, _STEP_PARAM))
+
+    return (templates,
+            json.dumps(runner_parameters, sort_keys=True, default=str),
+            json.dumps(action_parameters, sort_keys=True, default=str),
+            tuple(params_key))
+
+
+def _get_render_plan(runner_parameters, action_parameters, params, templates):
+    '''
+    Retrieve render plan from the cache or build and cache a new one.
+
+    :param templates: True if the parameter values can be templates which need to be rendered.
+    :type templates: ``bool``
+    '''
+    key = _get_plan_key(runner_parameters, action_parameters, params, templates)
+
+    plan = _PLAN_CACHE.get(key, None)
+    if plan is not None:
+        return plan
+
+    G = _create_graph()
+
+    for name, value in six.iteritems(params):
+        if value is None or (templates and _is_template(value)):
+            _process(G, name, value)
+        else:
+            # Actual value is provided when rendering
+            G.add_node(name, value=_PARAM_VALUE)
+
+    _process_defaults(G, [action_parameters, runner_parameters])
+    _validate(G)
+
+    plan = RenderPlan(G)
+
+    if len(_PLAN_CACHE) >= _PLAN_CACHE_MAX_SIZE:
+        _PLAN_CACHE.popitem(last=False)
+    _PLAN_CACHE[key] = plan
+
+    return plan
 
-    return context
+
+def _get_render_values(params, action_context, datastore_keys):
+    '''
+    Return values of the base context variables and of the provided parameters.
+    '''
+    values = dict(params)
+
+    kv_lookup = KeyValueLookup(scope=FULL_SYSTEM_SCOPE)
+    if datastore_keys:
+        # Retrieve values of all the datastore keys referenced in the templates using a single
+        # query
+        kv_lookup.prefetch(datastore_keys)
+
+    values[DATASTORE_PARENT_SCOPE] = {SYSTEM_SCOPE: kv_lookup}
+    values[ACTION_CONTEXT_KV_PREFIX] = action_context
+
+    return values
 
 
 def _cast_params_from(params, context, schemas):
@@ -218,13 +347,14 @@ def render_live_params(runner_parameters, action_parameters, params, action_cont
     Renders list of parameters. Ensures that there's no cyclic or missing dependencies. Returns a
     dict of plain rendered parameters.
     '''
-    G = _create_graph(action_context)
+    plan = _get_render_plan(runner_parameters, action_parameters, params, templates=True)
 
-    [_process(G, name, value) for name, value in six.iteritems(params)]
-    _process_defaults(G, [action_parameters, runner_parameters])
-    _validate(G)
+    # Jinja defaults to ascii parser in python 2.x unless you set utf-8 support on per module level
+    # Instead we're just assuming every string to be a unicode string
+    params = dict([(name, to_unicode(value) if isinstance(value, str) else value)
+                   for name, value in six.iteritems(params)])
 
-    context = _resolve_dependencies(G)
+    context = plan.render(_get_render_values(params, action_context, plan.datastore_keys))
     live_params = _cast_params_from(params, context, [action_parameters, runner_parameters])
 
     return live_params
@@ -236,14 +366,10 @@ def render_final_params(runner_parameters, action_parameters, params, action_con
     plain values instead of trying to render them again. Returns dicts for action and runner
     parameters.
     '''
-    G = _create_graph(action_context)
-
     # by that point, all params should already be resolved so any template should be treated value
-    [G.add_node(name, value=value) for name, value in six.iteritems(params)]
-    _process_defaults(G, [action_parameters, runner_parameters])
-    _validate(G)
+    plan = _get_render_plan(runner_parameters, action_parameters, params, templates=False)
 
-    context = _resolve_dependencies(G)
+    context = plan.render(_get_render_values(params, action_context, plan.datastore_keys))
     context = _cast_params_from(context, context, [action_parameters, runner_parameters])
 
     return _split_params(runner_parameters, action_parameters, context)
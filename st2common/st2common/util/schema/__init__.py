@@ -15,6 +15,8 @@
 
 import os
 import copy
+import json
+import collections
 
 import six
 import jsonschema
@@ -38,7 +40,8 @@ __all__ = [
     'is_property_nullable',
     'is_attribute_type_array',
     'is_attribute_type_object',
-    'validate'
+    'validate',
+    'clear_validator_cache'
 ]
 
 # https://github.com/json-schema/json-schema/blob/master/draft-04/schema
@@ -66,6 +69,11 @@ SCHEMA_ANY_TYPE = {
     ]
 }
 
+# LRU cache of prepared schemas and validator objects which have already been checked against
+# the meta schema. Keyed by the validator class, schema modification flags and schema content
+_VALIDATOR_CACHE = collections.OrderedDict()
+_VALIDATOR_CACHE_MAX_SIZE = 500
+
 RUNNER_PARAM_OVERRIDABLE_ATTRS = [
     'default',
     'description',
@@ -182,13 +190,14 @@ def assign_default_values(instance, schema):
 
         # Assign default value on the instance so the validation doesn't fail if requires is true
         # but the value is not provided
+        # Note: Default value is copied since the (cached) schema is shared between callers
         if has_default_value:
             if instance_is_dict and instance.get(property_name, None) is None:
-                instance[property_name] = default_value
+                instance[property_name] = copy.deepcopy(default_value)
             elif instance_is_array:
                 for index, _ in enumerate(instance):
                     if instance[index].get(property_name, None) is None:
-                        instance[index][property_name] = default_value
+                        instance[index][property_name] = copy.deepcopy(default_value)
 
         # Support for nested properties (array and object)
         attribute_type = property_data.get('type', None)
@@ -278,23 +287,75 @@ def validate(instance, schema, cls=None, use_default=True, allow_default_none=Fa
     :param use_default: True to support the use of the optional "default" property.
     :type use_default: ``bool``
     """
-
-    instance = copy.deepcopy(instance)
     schema_type = schema.get('type', None)
     instance_is_dict = isinstance(instance, dict)
 
-    if use_default and allow_default_none:
-        schema = modify_schema_allow_default_none(schema=schema)
+    if args or kwargs:
+        # Custom validator arguments, validator can't be cached
+        if use_default and allow_default_none:
+            schema = modify_schema_allow_default_none(schema=schema)
+
+        validator = None
+    else:
+        schema, validator = _get_cached_validator(schema=schema, cls=cls,
+                                                  allow_default_none=(use_default and
+                                                                      allow_default_none))
 
+    # Note: assign_default_values returns a copy of the instance
     if use_default and schema_type == 'object' and instance_is_dict:
         instance = assign_default_values(instance=instance, schema=schema)
+    else:
+        instance = copy.deepcopy(instance)
 
-    # pylint: disable=assignment-from-no-return
-    jsonschema.validate(instance=instance, schema=schema, cls=cls, *args, **kwargs)
+    if validator:
+        validator.validate(instance)
+    else:
+        # pylint: disable=assignment-from-no-return
+        jsonschema.validate(instance=instance, schema=schema, cls=cls, *args, **kwargs)
 
     return instance
 
 
+def clear_validator_cache():
+    _VALIDATOR_CACHE.clear()
+
+
+def _get_cached_validator(schema, cls=None, allow_default_none=False):
+    """
+    Return prepared schema and a validator object for it.
+
+    Checking schema against the meta schema, manipulating schema to allow default None values and
+    building a validator object is expensive so the result is cached. The cache is keyed by the
+    schema content so the same schema which is constructed over and over again (e.g. action
+    parameters or trigger payload schema) only needs to be processed once.
+
+    :rtype: ``tuple`` of (``dict``, ``object``)
+    """
+    cls = cls or jsonschema.validators.validator_for(schema)
+    key = (cls, allow_default_none, json.dumps(schema, sort_keys=True, default=str))
+
+    entry = _VALIDATOR_CACHE.pop(key, None)
+    if entry:
+        # Move the entry to the end so it's evicted last
+        _VALIDATOR_CACHE[key] = entry
+        return entry
+
+    if allow_default_none:
+        schema = modify_schema_allow_default_none(schema=schema)
+    else:
+        # Copy the schema so a change to the original object doesn't affect the cached validator
+        schema = copy.deepcopy(schema)
+
+    cls.check_schema(schema)
+    entry = (schema, cls(schema))
+
+    if len(_VALIDATOR_CACHE) >= _VALIDATOR_CACHE_MAX_SIZE:
+        _VALIDATOR_CACHE.popitem(last=False)
+    _VALIDATOR_CACHE[key] = entry
+
+    return entry
+
+
 VALIDATORS = {
     'draft4': jsonschema.Draft4Validator,
     'custom': CustomValidator
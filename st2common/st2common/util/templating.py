@@ -15,7 +15,7 @@
 
 import six
 
-from st2common.util.jinja import get_jinja_environment
+from st2common.util.jinja import get_template
 from st2common.constants.keyvalue import DATASTORE_PARENT_SCOPE
 from st2common.constants.keyvalue import SYSTEM_SCOPE, FULL_SYSTEM_SCOPE
 from st2common.constants.keyvalue import USER_SCOPE, FULL_USER_SCOPE
@@ -42,8 +42,7 @@ def render_template(value, context=None):
     assert isinstance(value, six.string_types)
     context = context or {}
 
-    env = get_jinja_environment(allow_undefined=False)  # nosec
-    template = env.from_string(value)
+    template = get_template(value, allow_undefined=False)  # nosec
     rendered = template.render(context)
 
     return rendered
@@ -124,6 +124,14 @@ def validate_trigger_payload(trigger_type_ref, payload):
         return None
 
     is_system_trigger = trigger_type_ref in SYSTEM_TRIGGER_TYPES
+
+    # We only validate non-system triggers if config option is set (enabled). This check is
+    # performed first so we don't need to retrieve the trigger type if validation is disabled
+    if not is_system_trigger and not cfg.CONF.system.validate_trigger_payload:
+        LOG.debug('Got non-system trigger "%s", but trigger payload validation for non-system'
+                  'triggers is disabled, skipping validation.' % (trigger_type_ref))
+        return None
+
     if is_system_trigger:
         # System trigger
         payload_schema = SYSTEM_TRIGGER_TYPES[trigger_type_ref]['payload_schema']
@@ -138,12 +146,6 @@ def validate_trigger_payload(trigger_type_ref, payload):
             # Payload schema not defined for the this trigger
             return None
 
-    # We only validate non-system triggers if config option is set (enabled)
-    if not is_system_trigger and not cfg.CONF.system.validate_trigger_payload:
-        LOG.debug('Got non-system trigger "%s", but trigger payload validation for non-system'
-                  'triggers is disabled, skipping validation.' % (trigger_type_ref))
-        return None
-
     cleaned = util_schema.validate(instance=payload, schema=payload_schema,
                                    cls=util_schema.CustomValidator, use_default=True,
                                    allow_default_none=True)
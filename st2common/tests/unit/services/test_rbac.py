@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import mock
+from oslo_config import cfg
 from pymongo import MongoClient
 
 from st2tests.base import CleanDbTestCase
@@ -22,6 +24,7 @@ from st2common.rbac.types import ResourceType
 from st2common.rbac.types import SystemRole
 from st2common.persistence.auth import User
 from st2common.persistence.rbac import UserRoleAssignment
+from st2common.persistence.rbac import PermissionGrant
 from st2common.persistence.rule import Rule
 from st2common.models.db.auth import UserDB
 from st2common.models.db.rbac import UserRoleAssignmentDB
@@ -232,6 +235,92 @@ class RBACServicesTestCase(CleanDbTestCase):
             resource_types=[ResourceType.RULE])
         self.assertItemsEqual(permission_grants, [permission_grant])
 
+    def test_get_all_permission_grants_for_user_with_cache(self):
+        user_db = self.users['1_custom_role']
+        role_db = self.roles['custom_role_1']
+        cache = rbac_services.UserPermissionsCache()
+
+        with mock.patch.object(rbac_services, '_CACHE', cache):
+            permission_grants = rbac_services.get_all_permission_grants_for_user(user_db=user_db)
+            self.assertItemsEqual(permission_grants, [])
+            self.assertEqual(len(cache), 1)
+
+            # Creating a grant clears the cache
+            resource_db = self.resources['rule_1']
+            permission_types = [PermissionType.RULE_CREATE, PermissionType.RULE_MODIFY]
+            permission_grant = rbac_services.create_permission_grant_for_resource_db(
+                role_db=role_db,
+                resource_db=resource_db,
+                permission_types=permission_types)
+            self.assertEqual(len(cache), 0)
+
+            role_dbs = rbac_services.get_roles_for_user(user_db=user_db)
+            self.assertEqual([role.name for role in role_dbs], ['custom_role_1'])
+
+            # Subsequent lookups are served from the cache
+            with mock.patch.object(PermissionGrant, 'query') as mock_query:
+                permission_grants = rbac_services.get_all_permission_grants_for_user(
+                    user_db=user_db,
+                    resource_uid=resource_db.get_uid(),
+                    resource_types=[ResourceType.RULE],
+                    permission_types=[PermissionType.RULE_ALL, PermissionType.RULE_MODIFY])
+                self.assertItemsEqual(permission_grants, [permission_grant])
+
+                permission_grants = rbac_services.get_all_permission_grants_for_user(
+                    user_db=user_db,
+                    resource_uid=resource_db.get_uid(),
+                    resource_types=[ResourceType.PACK],
+                    permission_types=[PermissionType.RULE_MODIFY])
+                self.assertItemsEqual(permission_grants, [])
+
+                permission_grants = rbac_services.get_all_permission_grants_for_user(
+                    user_db=user_db,
+                    resource_uid='rule:test1:rule2',
+                    permission_types=[PermissionType.RULE_MODIFY])
+                self.assertItemsEqual(permission_grants, [])
+
+                permission_grants = rbac_services.get_all_permission_grants_for_user(
+                    user_db=user_db,
+                    permission_types=[PermissionType.RULE_CREATE])
+                self.assertItemsEqual(permission_grants, [permission_grant])
+
+                self.assertEqual(mock_query.call_count, 0)
+
+            # CUD event clears the cache
+            cache.invalidate(role_db)
+            self.assertEqual(len(cache), 0)
+
+    @mock.patch('st2common.services.rbac_watcher.RBACWatcher')
+    def test_get_all_permission_grants_for_user_with_setup_cache(self, mock_watcher_cls):
+        cfg.CONF.set_override(name='enable', override=True, group='rbac')
+        cfg.CONF.set_override(name='permission_cache_enabled', override=True, group='rbac')
+        self.addCleanup(cfg.CONF.clear_override, name='enable', group='rbac')
+        self.addCleanup(cfg.CONF.clear_override, name='permission_cache_enabled', group='rbac')
+        self.addCleanup(rbac_services.teardown_cache)
+
+        # Empty cache is set up only once
+        cache = rbac_services.setup_cache()
+        self.assertEqual(rbac_services.setup_cache(), cache)
+        self.assertEqual(mock_watcher_cls.call_count, 1)
+
+        user_db = self.users['1_custom_role']
+        role_db = self.roles['custom_role_1']
+        resource_db = self.resources['rule_1']
+        permission_grant = rbac_services.create_permission_grant_for_resource_db(
+            role_db=role_db,
+            resource_db=resource_db,
+            permission_types=[PermissionType.RULE_CREATE])
+
+        permission_grants = rbac_services.get_all_permission_grants_for_user(user_db=user_db)
+        self.assertItemsEqual(permission_grants, [permission_grant])
+        self.assertEqual(len(cache), 1)
+
+        # Second lookup doesn't hit the database
+        with mock.patch.object(PermissionGrant, 'query') as mock_query:
+            permission_grants = rbac_services.get_all_permission_grants_for_user(user_db=user_db)
+            self.assertItemsEqual(permission_grants, [permission_grant])
+            self.assertEqual(mock_query.call_count, 0)
+
     def test_create_and_remove_permission_grant(self):
         role_db = self.roles['custom_role_2']
         resource_db = self.resources['rule_1']
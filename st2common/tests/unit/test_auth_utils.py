@@ -0,0 +1,118 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+import mock
+import unittest2
+from oslo_config import cfg
+
+from st2common.exceptions import auth as exceptions
+from st2common.models.db.auth import ApiKeyDB
+from st2common.models.db.auth import TokenDB
+from st2common.persistence.auth import ApiKey
+from st2common.persistence.auth import Token
+from st2common.util import auth as auth_utils
+from st2common.util import date as date_utils
+import st2tests.config as tests_config
+
+
+class ValidationCacheTestCase(unittest2.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        tests_config.parse_args()
+
+    def setUp(self):
+        super(ValidationCacheTestCase, self).setUp()
+
+        cfg.CONF.set_override(name='validation_cache_ttl', override=10, group='auth')
+        self.addCleanup(cfg.CONF.clear_override, name='validation_cache_ttl', group='auth')
+
+        self._reset_caches()
+        self.addCleanup(self._reset_caches)
+
+    def _reset_caches(self):
+        auth_utils._TOKEN_CACHE = None
+        auth_utils._API_KEY_CACHE = None
+
+    def test_validate_token_is_cached(self):
+        expiry = date_utils.get_datetime_utc_now() + datetime.timedelta(seconds=60)
+        token_db = TokenDB(user='user1', token='token1', expiry=expiry)
+
+        with mock.patch.object(Token, 'get', mock.Mock(return_value=token_db)) as mock_get:
+            self.assertEqual(auth_utils.validate_token('token1'), token_db)
+            self.assertEqual(auth_utils.validate_token('token1'), token_db)
+            self.assertEqual(mock_get.call_count, 1)
+
+            # Deleted token is retrieved from the database again
+            auth_utils.invalidate_token('token1')
+            self.assertEqual(auth_utils.validate_token('token1'), token_db)
+            self.assertEqual(mock_get.call_count, 2)
+
+    def test_validate_cached_token_expiry(self):
+        expiry = date_utils.get_datetime_utc_now() + datetime.timedelta(seconds=60)
+        token_db = TokenDB(user='user1', token='token1', expiry=expiry)
+
+        with mock.patch.object(Token, 'get', mock.Mock(return_value=token_db)):
+            self.assertEqual(auth_utils.validate_token('token1'), token_db)
+
+        # Token expiry is checked on each validation, even when the token is cached
+        now = expiry + datetime.timedelta(seconds=1)
+        with mock.patch.object(date_utils, 'get_datetime_utc_now', mock.Mock(return_value=now)):
+            self.assertRaises(exceptions.TokenExpiredError, auth_utils.validate_token, 'token1')
+
+    def test_validate_api_key_is_cached(self):
+        api_key_db = ApiKeyDB(id='5c5ddd776cb8de530e0a1391', user='user1', key_hash='hash',
+                              enabled=True)
+
+        with mock.patch.object(ApiKey, 'get', mock.Mock(return_value=api_key_db)) as mock_get:
+            self.assertEqual(auth_utils.validate_api_key('key1'), api_key_db)
+            self.assertEqual(auth_utils.validate_api_key('key1'), api_key_db)
+            self.assertEqual(mock_get.call_count, 1)
+
+            # Disabled API key is not cached
+            api_key_db.enabled = False
+            auth_utils.invalidate_api_key(api_key_db)
+            self.assertRaises(exceptions.ApiKeyDisabledError, auth_utils.validate_api_key, 'key1')
+            self.assertRaises(exceptions.ApiKeyDisabledError, auth_utils.validate_api_key, 'key1')
+            self.assertEqual(mock_get.call_count, 3)
+
+    def test_cache_is_disabled(self):
+        cfg.CONF.set_override(name='validation_cache_ttl', override=0, group='auth')
+        expiry = date_utils.get_datetime_utc_now() + datetime.timedelta(seconds=60)
+        token_db = TokenDB(user='user1', token='token1', expiry=expiry)
+
+        with mock.patch.object(Token, 'get', mock.Mock(return_value=token_db)) as mock_get:
+            auth_utils.validate_token('token1')
+            auth_utils.validate_token('token1')
+            self.assertEqual(mock_get.call_count, 2)
+
+        # Empty cache object is created only once
+        token_cache = auth_utils._TOKEN_CACHE
+        self.assertEqual(len(token_cache), 0)
+        self.assertIs(auth_utils._get_token_cache(), token_cache)
+
+    def test_cache_max_size(self):
+        cache = auth_utils.ValidationCache(ttl=10, max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        # Least recently used value is evicted
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('c'), 3)
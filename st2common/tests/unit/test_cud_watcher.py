@@ -0,0 +1,67 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from kombu.message import Message
+import mock
+import unittest2
+
+from st2common.models.db.rule import RuleDB
+from st2common.services.rule_watcher import RuleWatcher
+from st2common.transport import reactor
+
+MOCK_RULE_DB = RuleDB(name='foo', pack='test')
+
+
+class CUDWatcherTests(unittest2.TestCase):
+
+    def test_queue_is_bound_to_exchange(self):
+        watcher = RuleWatcher(mock.Mock(), mock.Mock(), mock.Mock(), queue_suffix='test',
+                              exclusive=True)
+        queue = watcher._watch_q
+
+        self.assertEqual(queue.exchange, reactor.RULE_CUD_XCHG)
+        self.assertEqual(queue.routing_key, '#')
+        self.assertTrue(queue.exclusive)
+        self.assertTrue(queue.name.startswith('st2.rule.watch.test'))
+
+    @mock.patch.object(Message, 'ack', mock.MagicMock())
+    def test_handlers_called_and_message_acked(self):
+        create_handler = mock.Mock()
+        update_handler = mock.Mock()
+        delete_handler = mock.Mock(side_effect=Exception('failure'))
+
+        watcher = RuleWatcher(create_handler, update_handler, delete_handler)
+
+        message = Message(None, delivery_info={'routing_key': 'create'})
+        watcher.process_task(MOCK_RULE_DB, message)
+        create_handler.assert_called_once_with(MOCK_RULE_DB)
+        self.assertEqual(Message.ack.call_count, 1)
+
+        message = Message(None, delivery_info={'routing_key': 'update'})
+        watcher.process_task(MOCK_RULE_DB, message)
+        update_handler.assert_called_once_with(MOCK_RULE_DB)
+        self.assertEqual(Message.ack.call_count, 2)
+
+        # Failing handler and unknown routing key still ack the message
+        message = Message(None, delivery_info={'routing_key': 'delete'})
+        watcher.process_task(MOCK_RULE_DB, message)
+        delete_handler.assert_called_once_with(MOCK_RULE_DB)
+        self.assertEqual(Message.ack.call_count, 3)
+
+        message = Message(None, delivery_info={'routing_key': 'unknown'})
+        watcher.process_task(MOCK_RULE_DB, message)
+        self.assertEqual(Message.ack.call_count, 4)
+        self.assertEqual(create_handler.call_count, 1)
+        self.assertEqual(update_handler.call_count, 1)
@@ -90,6 +90,23 @@ class ReactorModelTest(DbTestCase):
             retrieved = None
         self.assertIsNone(retrieved, 'managed to retrieve after failure.')
 
+    def test_insert_many_partial_failure(self):
+        triggertype_1 = TriggerTypeDB(pack='dummy_pack_1', name='insert_many_1')
+        triggertype_2 = TriggerTypeDB(pack='dummy_pack_1', name='insert_many_2')
+        triggertype_3 = TriggerTypeDB(pack='dummy_pack_1', name='insert_many_1')
+
+        # Bulk insert is ordered so the objects before the duplicate one are inserted
+        triggertypes = [triggertype_1, triggertype_2, triggertype_3]
+        self.assertRaises(Exception, TriggerType.insert_many, triggertypes)
+
+        self.assertIsNotNone(triggertype_1.id)
+        self.assertIsNotNone(triggertype_2.id)
+        self.assertIsNone(triggertype_3.id)
+
+        retrieved = TriggerType.get_by_id(triggertype_1.id)
+        self.assertEqual(retrieved.name, 'insert_many_1')
+        ReactorModelTest._delete([triggertype_1, triggertype_2])
+
     def test_triggerinstance_crud(self):
         triggertype = ReactorModelTest._create_save_triggertype()
         trigger = ReactorModelTest._create_save_trigger(triggertype)
@@ -13,10 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bson
 import mock
 import six
+from oslo_config import cfg
 
 from st2common.constants import action as action_constants
+from st2common.exceptions.db import StackStormDBObjectNotFoundError
 from st2common.models.api.action import RunnerTypeAPI, ActionAPI, LiveActionAPI
 from st2common.models.api.trigger import TriggerTypeAPI, TriggerAPI, TriggerInstanceAPI
 from st2common.models.api.rule import RuleAPI
@@ -136,6 +139,40 @@ class ExecutionsUtilTestCase(CleanDbTestCase):
         child_execs = parent_execution.children
         self.assertTrue(str(child_exec.id) in child_execs)
 
+    def test_execution_creation_with_parent_sets_children(self):
+        childliveaction = self.MODELS['liveactions']['childliveaction.yaml']
+        child_exec_1 = executions_util.create_execution_object(childliveaction)
+        child_exec_2 = executions_util.create_execution_object(childliveaction)
+
+        parent_execution_id = childliveaction.context['parent']['execution_id']
+        self.assertEqual(child_exec_1.parent, parent_execution_id)
+
+        parent_execution = ActionExecution.get_by_id(parent_execution_id)
+        self.assertTrue(str(child_exec_1.id) in parent_execution.children)
+        self.assertTrue(str(child_exec_2.id) in parent_execution.children)
+
+    def test_get_referenced_object_is_cached(self):
+        rule = self.MODELS['rules']['rule3.yaml']
+        get_model_func = mock.Mock(return_value=rule)
+
+        cfg.CONF.set_override(name='execution_references_cache_ttl', override=10, group='system')
+        try:
+            value_1 = executions_util._get_referenced_object(key=('rule', str(rule.id)),
+                                                             get_model_func=get_model_func,
+                                                             api_cls=RuleAPI)
+            value_2 = executions_util._get_referenced_object(key=('rule', str(rule.id)),
+                                                             get_model_func=get_model_func,
+                                                             api_cls=RuleAPI)
+        finally:
+            cfg.CONF.set_override(name='execution_references_cache_ttl', override=0,
+                                  group='system')
+            executions_util._REFERENCED_OBJECTS_CACHE.clear()
+
+        self.assertEqual(get_model_func.call_count, 1)
+        self.assertDictEqual(value_1, vars(RuleAPI.from_model(rule)))
+        self.assertDictEqual(value_2, value_1)
+        self.assertFalse(value_1 is value_2)
+
     def test_execution_update(self):
         liveaction = self.MODELS['liveactions']['liveaction1.yaml']
         executions_util.create_execution_object(liveaction)
@@ -150,6 +187,31 @@ class ExecutionsUtilTestCase(CleanDbTestCase):
         self.assertGreater(execution.log[1]['timestamp'], pre_update_timestamp)
         self.assertLess(execution.log[1]['timestamp'], post_update_timestamp)
 
+    def test_execution_update_status_not_changed(self):
+        liveaction = self.MODELS['liveactions']['liveaction1.yaml']
+        executions_util.create_execution_object(liveaction)
+        liveaction.status = 'running'
+        executions_util.update_execution(liveaction)
+
+        # Status hasn't changed, no new log entry should be added, but other attributes should
+        # still be updated
+        liveaction.result = {'stdout': 'foo'}
+        execution = executions_util.update_execution(liveaction)
+        self.assertEquals(execution.status, 'running')
+        self.assertDictEqual(execution.result, {'stdout': 'foo'})
+        self.assertEquals(len(execution.log), 2)
+
+        execution = self._get_action_execution(liveaction__id=str(liveaction.id),
+                                               raise_exception=True)
+        self.assertDictEqual(execution.result, {'stdout': 'foo'})
+        self.assertEquals(len(execution.log), 2)
+
+    def test_execution_update_execution_doesnt_exist(self):
+        liveaction = self.MODELS['liveactions']['liveaction1.yaml']
+        liveaction.id = bson.ObjectId()
+        self.assertRaises(StackStormDBObjectNotFoundError, executions_util.update_execution,
+                          liveaction)
+
     @mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
     @mock.patch.object(runners_utils, 'invoke_post_run', mock.MagicMock(return_value=None))
     def test_abandon_executions(self):
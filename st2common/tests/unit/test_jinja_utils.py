@@ -0,0 +1,65 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest2
+
+from st2common.constants.keyvalue import USER_SCOPE
+from st2common.util import jinja as jinja_utils
+
+
+class JinjaUtilsTestCase(unittest2.TestCase):
+
+    def test_get_datastore_keys(self):
+        env = jinja_utils.get_jinja_environment()
+
+        template = ('{{ st2kv.system.a.b }} {{ st2kv.system["c"] | decrypt_kv }} '
+                    '{% if st2kv.system.d == 1 %}{{ st2kv.user.e }}{% endif %} '
+                    '{{ st2kv.system[name].f }} {{ foo.system.g }}')
+        template_ast = env.parse(template)
+
+        self.assertEqual(jinja_utils.get_datastore_keys(template_ast),
+                         set(['a', 'a.b', 'c', 'd']))
+        self.assertEqual(jinja_utils.get_datastore_keys(template_ast, scope=USER_SCOPE),
+                         set(['e']))
+
+    def test_get_template_is_cached(self):
+        jinja_utils.clear_template_cache()
+
+        template_1 = jinja_utils.get_template('{{ a }}')
+        template_2 = jinja_utils.get_template('{{ a }}')
+        template_3 = jinja_utils.get_template('{{ a }}', allow_undefined=True)
+
+        self.assertTrue(template_1 is template_2)
+        self.assertFalse(template_1 is template_3)
+        self.assertEqual(template_1.render({'a': 'b'}), 'b')
+        self.assertEqual(template_3.render({}), '')
+        self.assertDictEqual(jinja_utils.get_template_cache_stats(),
+                             {'hits': 1, 'misses': 2, 'size': 2})
+
+    def test_get_template_cache_is_bounded(self):
+        jinja_utils.clear_template_cache()
+
+        max_size = jinja_utils._TEMPLATE_CACHE_MAX_SIZE
+        for index in range(0, max_size + 10):
+            jinja_utils.get_template('{{ a }} %s' % (index))
+
+        self.assertEqual(jinja_utils.get_template_cache_stats()['size'], max_size)
+
+        # Least recently used templates are evicted first
+        jinja_utils.get_template('{{ a }} %s' % (max_size + 9))
+        jinja_utils.get_template('{{ a }} 0')
+        stats = jinja_utils.get_template_cache_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], max_size + 11)
@@ -13,6 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+
+import mock
 from unittest2 import TestCase
 from jsonschema.exceptions import ValidationError
 
@@ -258,6 +261,61 @@ class JSONSchemaTestCase(TestCase):
         util_schema.validate(instance=instance, schema=TEST_SCHEMA_5, cls=validator,
                              use_default=True, allow_default_none=True)
 
+    def test_validator_is_cached(self):
+        util_schema.clear_validator_cache()
+        validator = util_schema.get_validator()
+        schema = copy.deepcopy(TEST_SCHEMA_3)
+        original_schema = copy.deepcopy(TEST_SCHEMA_3)
+
+        with mock.patch.object(validator, 'check_schema',
+                               mock.Mock(wraps=validator.check_schema)) as check_schema:
+            for index in range(0, 3):
+                util_schema.validate(instance=dict(), schema=schema, cls=validator,
+                                     use_default=True, allow_default_none=True)
+
+            # Same schema content, different object
+            util_schema.validate(instance=dict(), schema=copy.deepcopy(TEST_SCHEMA_3),
+                                 cls=validator, use_default=True, allow_default_none=True)
+            self.assertEqual(check_schema.call_count, 1)
+
+            # Provided schema is not modified
+            self.assertDictEqual(schema, original_schema)
+
+            # Modified schema is not served from the cache
+            schema['properties']['arg_required_new'] = {'type': 'string', 'required': True}
+            expected_msg = '\'arg_required_new\' is a required property'
+            self.assertRaisesRegexp(ValidationError, expected_msg, util_schema.validate,
+                                    instance=dict(), schema=schema, cls=validator,
+                                    use_default=True, allow_default_none=True)
+            self.assertEqual(check_schema.call_count, 2)
+
+    def test_validate_returned_default_values_are_copies(self):
+        util_schema.clear_validator_cache()
+        validator = util_schema.get_validator()
+        schema = {
+            'type': 'object',
+            'properties': {
+                'a': {'type': 'array', 'default': [1]}
+            }
+        }
+
+        result = util_schema.validate(instance={}, schema=copy.deepcopy(schema), cls=validator,
+                                      use_default=True, allow_default_none=True)
+        result['a'].append(2)
+
+        result = util_schema.validate(instance={}, schema=copy.deepcopy(schema), cls=validator,
+                                      use_default=True, allow_default_none=True)
+        self.assertDictEqual(result, {'a': [1]})
+
+    def test_validate_doesnt_modify_instance(self):
+        instance = {}
+        validator = util_schema.get_validator()
+
+        cleaned = util_schema.validate(instance=instance, schema=TEST_SCHEMA_2, cls=validator,
+                                       use_default=True)
+        self.assertDictEqual(cleaned, {'arg_required_default': 'date'})
+        self.assertDictEqual(instance, {})
+
     def test_is_property_type_single(self):
         typed_property = TEST_SCHEMA_1['properties']['arg_required_no_default']
         self.assertTrue(util_schema.is_property_type_single(typed_property))
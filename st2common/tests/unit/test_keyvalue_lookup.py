@@ -13,12 +13,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import time
+
+import mock
+from oslo_config import cfg
+
 from st2tests.base import CleanDbTestCase
 from st2common.constants.keyvalue import FULL_SYSTEM_SCOPE, FULL_USER_SCOPE
 from st2common.constants.keyvalue import SYSTEM_SCOPE, USER_SCOPE
 from st2common.models.db.keyvalue import KeyValuePairDB
 from st2common.persistence.keyvalue import KeyValuePair
+from st2common.services import keyvalues
 from st2common.services.keyvalues import KeyValueLookup, UserKeyValueLookup
+from st2common.services.keyvalues import KeyValuePairCache
+from st2common.util import date as date_utils
 
 
 class TestKeyValueLookup(CleanDbTestCase):
@@ -153,3 +162,135 @@ class TestKeyValueLookup(CleanDbTestCase):
         self.assertEqual(str(lookup.count), '5.5')
         self.assertEqual(float(lookup.count), 5.5)
         self.assertEqual(int(lookup.count), 5)
+
+    def test_lookup_value_is_retrieved_once(self):
+        KeyValuePair.add_or_update(KeyValuePairDB(name='a.b', value='v1'))
+
+        lookup = KeyValueLookup(scope=FULL_SYSTEM_SCOPE)
+
+        with mock.patch.object(KeyValuePair, 'get_by_scope_and_name',
+                               mock.MagicMock(wraps=KeyValuePair.get_by_scope_and_name)) as m:
+            self.assertEqual(str(lookup.a.b), 'v1')
+            self.assertEqual(str(lookup.a.b), 'v1')
+            self.assertEqual(m.call_count, 2)
+
+    def test_lookup_prefetch(self):
+        KeyValuePair.add_or_update(KeyValuePairDB(name='a.b', value='v1'))
+        KeyValuePair.add_or_update(KeyValuePairDB(name='c', value='v2'))
+
+        lookup = KeyValueLookup(scope=FULL_SYSTEM_SCOPE)
+        lookup.prefetch(['a', 'a.b', 'c', 'missing'])
+
+        with mock.patch.object(KeyValuePair, 'get_by_scope_and_name', mock.MagicMock()) as m:
+            self.assertEqual(str(lookup.a.b), 'v1')
+            self.assertEqual(str(lookup.c), 'v2')
+            self.assertEqual(str(lookup.missing), '')
+            self.assertFalse(m.called)
+
+
+class TestKeyValuePairCache(CleanDbTestCase):
+    def tearDown(self):
+        super(TestKeyValuePairCache, self).tearDown()
+        keyvalues._CACHE = None
+
+    def test_get_value_is_cached(self):
+        KeyValuePair.add_or_update(KeyValuePairDB(name='k1', value='v1'))
+        cache = KeyValuePairCache(ttl=60, max_size=10)
+
+        self.assertEqual(cache.get_value(scope=FULL_SYSTEM_SCOPE, name='k1'), 'v1')
+        self.assertEqual(cache.get_value(scope=FULL_SYSTEM_SCOPE, name='missing'), None)
+
+        with mock.patch.object(KeyValuePair, 'get_by_scope_and_name', mock.MagicMock()) as m:
+            self.assertEqual(cache.get_value(scope=FULL_SYSTEM_SCOPE, name='k1'), 'v1')
+            self.assertEqual(cache.get_value(scope=FULL_SYSTEM_SCOPE, name='missing'), None)
+            self.assertFalse(m.called)
+
+    def test_get_value_expired(self):
+        kvp_db = KeyValuePair.add_or_update(KeyValuePairDB(name='k1', value='v1'))
+        cache = KeyValuePairCache(ttl=0, max_size=10)
+
+        self.assertEqual(cache.get_value(scope=FULL_SYSTEM_SCOPE, name='k1'), 'v1')
+
+        kvp_db.value = 'v2'
+        KeyValuePair.add_or_update(kvp_db)
+        self.assertEqual(cache.get_value(scope=FULL_SYSTEM_SCOPE, name='k1'), 'v2')
+
+    def test_max_size_eviction(self):
+        cache = KeyValuePairCache(ttl=60, max_size=2)
+
+        cache.get_value(scope=FULL_SYSTEM_SCOPE, name='k1')
+        cache.get_value(scope=FULL_SYSTEM_SCOPE, name='k2')
+        cache.get_value(scope=FULL_SYSTEM_SCOPE, name='k3')
+        self.assertEqual(len(cache), 2)
+
+    def test_invalidate(self):
+        kvp_db = KeyValuePair.add_or_update(KeyValuePairDB(name='k1', value='v1'))
+        cache = KeyValuePairCache(ttl=60, max_size=10)
+        self.assertEqual(cache.get_value(scope=FULL_SYSTEM_SCOPE, name='k1'), 'v1')
+
+        kvp_db.value = 'v2'
+        kvp_db = KeyValuePair.add_or_update(kvp_db)
+        self.assertEqual(cache.get_value(scope=FULL_SYSTEM_SCOPE, name='k1'), 'v1')
+
+        cache.invalidate_kvp(kvp_db)
+        self.assertEqual(cache.get_value(scope=FULL_SYSTEM_SCOPE, name='k1'), 'v2')
+
+    def test_prefetch_values(self):
+        KeyValuePair.add_or_update(KeyValuePairDB(name='k1', value='v1'))
+        KeyValuePair.add_or_update(KeyValuePairDB(name='k2', value='v2'))
+        keyvalues._CACHE = KeyValuePairCache(ttl=60, max_size=10)
+
+        keyvalues.prefetch_values(scope=FULL_SYSTEM_SCOPE, names=['k1', 'k2', 'k3'])
+
+        with mock.patch.object(KeyValuePair, 'get_by_scope_and_name', mock.MagicMock()) as m:
+            lookup = KeyValueLookup(scope=FULL_SYSTEM_SCOPE)
+            self.assertEqual(str(lookup.k1), 'v1')
+            self.assertEqual(str(lookup.k2), 'v2')
+            self.assertEqual(str(lookup.k3), '')
+            self.assertFalse(m.called)
+
+    def test_get_value_key_expired(self):
+        expire_timestamp = date_utils.get_datetime_utc_now() + datetime.timedelta(seconds=10)
+        KeyValuePair.add_or_update(KeyValuePairDB(name='k1', value='v1',
+                                                  expire_timestamp=expire_timestamp))
+        cache = KeyValuePairCache(ttl=60, max_size=10)
+        self.assertEqual(cache.get_value(scope=FULL_SYSTEM_SCOPE, name='k1'), 'v1')
+
+        # Expired keys emit no CUD event, value is not served from the cache once the key expires
+        kvp_db = KeyValuePair.get_by_scope_and_name(scope=FULL_SYSTEM_SCOPE, name='k1')
+        KeyValuePair.delete(kvp_db, publish=False)
+
+        with mock.patch('time.time', mock.MagicMock(return_value=time.time() + 20)):
+            self.assertEqual(cache.get_value(scope=FULL_SYSTEM_SCOPE, name='k1'), None)
+
+    @mock.patch('st2common.services.keyvalue_watcher.KeyValuePairWatcher')
+    def test_module_level_functions_use_cache(self, mock_watcher_cls):
+        cfg.CONF.set_override(name='cache_enabled', override=True, group='keyvalue')
+        self.addCleanup(cfg.CONF.clear_override, name='cache_enabled', group='keyvalue')
+        self.addCleanup(keyvalues.teardown_cache)
+
+        # Empty cache is set up only once
+        cache = keyvalues.setup_cache()
+        self.assertEqual(keyvalues.setup_cache(), cache)
+        self.assertEqual(mock_watcher_cls.call_count, 1)
+
+        KeyValuePair.add_or_update(KeyValuePairDB(name='k1', value='v1'))
+        KeyValuePair.add_or_update(KeyValuePairDB(name='k2', value='v2'))
+
+        value = keyvalues.get_value_for_scope_and_name(scope=FULL_SYSTEM_SCOPE, name='k1')
+        self.assertEqual(value, 'v1')
+        self.assertEqual(len(cache), 1)
+
+        with mock.patch.object(KeyValuePair, 'get_by_scope_and_name', mock.MagicMock()) as m:
+            value = keyvalues.get_value_for_scope_and_name(scope=FULL_SYSTEM_SCOPE, name='k1')
+            self.assertEqual(value, 'v1')
+            self.assertFalse(m.called)
+
+        keyvalues.prefetch_values(scope=FULL_SYSTEM_SCOPE, names=['k2'])
+        self.assertEqual(len(cache), 2)
+
+        with mock.patch.object(KeyValuePair, 'get_by_names', mock.MagicMock()) as m:
+            lookup = KeyValueLookup(scope=FULL_SYSTEM_SCOPE)
+            lookup.prefetch(names=['k1', 'k2'])
+            self.assertEqual(str(lookup.k2), 'v2')
+            self.assertFalse(m.called)
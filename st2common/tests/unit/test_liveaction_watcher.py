@@ -0,0 +1,45 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bson
+import eventlet
+from kombu.message import Message
+import mock
+import unittest2
+
+from st2common.constants.action import LIVEACTION_STATUS_SUCCEEDED
+from st2common.models.db.liveaction import LiveActionDB
+from st2common.services.liveaction_watcher import LiveActionCompletionWatcher
+
+
+class LiveActionCompletionWatcherTests(unittest2.TestCase):
+
+    @mock.patch.object(Message, 'ack', mock.MagicMock())
+    def test_waiter_is_woken_up_on_completion(self):
+        watcher = LiveActionCompletionWatcher()
+        liveaction_db = LiveActionDB(id=bson.ObjectId(), status=LIVEACTION_STATUS_SUCCEEDED)
+
+        event = watcher.add_waiter(liveaction_db.id)
+        other_event = watcher.add_waiter(bson.ObjectId())
+
+        message = Message(None, delivery_info={'routing_key': LIVEACTION_STATUS_SUCCEEDED})
+        eventlet.spawn_after(0.1, watcher.process_task, liveaction_db, message)
+
+        self.assertTrue(watcher.wait(event, timeout=5))
+        self.assertFalse(watcher.wait(other_event, timeout=0.1))
+
+        watcher.remove_waiter(liveaction_db.id, event)
+        self.assertNotIn(str(liveaction_db.id), watcher._waiters)
+        self.assertEqual(len(watcher._waiters), 1)
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import unittest
 
 from st2common.util import mongoescape
@@ -89,3 +90,34 @@ class TestMongoEscape(unittest.TestCase):
 
         unescaped = mongoescape.unescape_chars(escaped)
         self.assertDictEqual(field, unescaped)
+
+    def test_values_which_dont_need_translation_are_not_copied(self):
+        field = {
+            'k1': {'k2': [{'k3': 'v3'}, 'v4']},
+            'k5': ['a', 'b']
+        }
+
+        self.assertTrue(mongoescape.escape_chars(field) is field)
+        self.assertTrue(mongoescape.unescape_chars(field) is field)
+
+        field['k6'] = {'k7.k8': 'v8'}
+        escaped = mongoescape.escape_chars(field)
+
+        self.assertFalse(escaped is field)
+        self.assertTrue(escaped['k1'] is field['k1'])
+        self.assertTrue(escaped['k5'] is field['k5'])
+        self.assertEqual(escaped['k6'], {u'k7\uff0ek8': 'v8'})
+
+        # Original value is not modified
+        self.assertEqual(field['k6'], {'k7.k8': 'v8'})
+
+    def test_nested_list_items(self):
+        field = {'k1': [{'k2': [{'k3.k4': 'v4'}]}, 'v5']}
+        original = copy.deepcopy(field)
+
+        escaped = mongoescape.escape_chars(field)
+        self.assertEqual(escaped, {'k1': [{'k2': [{u'k3\uff0ek4': 'v4'}]}, 'v5']})
+        self.assertEqual(field, original)
+
+        unescaped = mongoescape.unescape_chars(escaped)
+        self.assertEqual(unescaped, original)
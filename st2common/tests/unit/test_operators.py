@@ -80,6 +80,21 @@ class OperatorTest(unittest2.TestCase):
         string = 'fooPONIESbarfooooo'
         self.assertFalse(op(string, 'ponies'), 'Passed regex.')
 
+    def test_regex_operators_precompiled_pattern(self):
+        op = operators.get_operator('iregex')
+        pattern = operators.compile_regex_pattern('IREGEX', 'ponies')
+        self.assertTrue(op('fooPONIESbar', pattern), 'Failed iregex.')
+
+        op = operators.get_operator('regex')
+        pattern = operators.compile_regex_pattern('regex', 'ponies')
+        self.assertFalse(op('fooPONIESbar', pattern), 'Passed regex.')
+
+        op = operators.get_operator('matchregex')
+        pattern = operators.compile_regex_pattern('matchregex', '.*bar.*')
+        self.assertTrue(op('ponies\nbar\n', pattern), 'Failed matchregex.')
+
+        self.assertEqual(operators.compile_regex_pattern('equals', 'ponies'), None)
+
     def test_matchregex_case_variants(self):
         op = operators.get_operator('MATCHREGEX')
         self.assertTrue(op('v1', 'v1$'), 'Failed matchregex.')
@@ -552,6 +552,38 @@ class ParamsUtilsTest(DbTestCase):
         }
         self.assertEqual(r_action_params['params'], expected_params)
 
+    def test_render_plan_is_reused(self):
+        runner_param_info = {'r1': {'default': '{{a1}}-suffix'}}
+        action_param_info = {'a1': {}, 'a2': {'default': ['x']}}
+
+        with mock.patch.object(param_utils, 'RenderPlan', wraps=param_utils.RenderPlan) as plan:
+            r_runner_params, r_action_params = param_utils.render_final_params(
+                runner_param_info, action_param_info, {'a1': 'foo'}, {})
+            self.assertEqual(r_runner_params, {'r1': 'foo-suffix'})
+            self.assertEqual(r_action_params, {'a1': 'foo', 'a2': ['x']})
+
+            # Default values are not shared between the renders
+            r_action_params['a2'].append('y')
+
+            r_runner_params, r_action_params = param_utils.render_final_params(
+                runner_param_info, action_param_info, {'a1': 'bar'}, {})
+            self.assertEqual(r_runner_params, {'r1': 'bar-suffix'})
+            self.assertEqual(r_action_params, {'a1': 'bar', 'a2': ['x']})
+
+            self.assertEqual(plan.call_count, 1)
+
+            # Different set of provided parameters requires a new plan
+            param_utils.render_final_params(runner_param_info, action_param_info,
+                                            {'a1': 'foo', 'r1': 'baz'}, {})
+            self.assertEqual(plan.call_count, 2)
+
+            # Change in the schema requires a new plan
+            action_param_info['a2']['default'] = ['z']
+            r_runner_params, r_action_params = param_utils.render_final_params(
+                runner_param_info, action_param_info, {'a1': 'foo'}, {})
+            self.assertEqual(r_action_params, {'a1': 'foo', 'a2': ['z']})
+            self.assertEqual(plan.call_count, 3)
+
     def test_cast_param_referenced_action_doesnt_exist(self):
         # Make sure the function throws if the action doesnt exist
         expected_msg = 'Action with ref "foo.doesntexist" doesn\'t exist'
@@ -20,8 +20,11 @@ import bson
 
 from st2common import log as logging
 from st2common.garbage_collection.executions import purge_executions
+from st2common.garbage_collection.executions import purge_orphaned_execution_states
 from st2common.constants import action as action_constants
+from st2common.models.db.executionstate import ActionExecutionStateDB
 from st2common.persistence.execution import ActionExecution
+from st2common.persistence.executionstate import ActionExecutionState
 from st2common.persistence.liveaction import LiveAction
 from st2common.util import date as date_utils
 from st2tests.base import CleanDbTestCase
@@ -137,7 +140,8 @@ class TestPurgeExecutions(CleanDbTestCase):
         executions = ActionExecution.get_all()
         self.assertEqual(len(liveactions), 1)
         self.assertEqual(len(executions), 1)
-        purge_executions(logger=LOG, timestamp=now - timedelta(days=10))
+        deleted_count = purge_executions(logger=LOG, timestamp=now - timedelta(days=10))
+        self.assertEqual(deleted_count, 1)
         liveactions = LiveAction.get_all()
         executions = ActionExecution.get_all()
         self.assertEqual(len(executions), 0)
@@ -183,3 +187,50 @@ class TestPurgeExecutions(CleanDbTestCase):
         self.assertEqual(len(ActionExecution.get_all()), 5)
         purge_executions(logger=LOG, timestamp=now - timedelta(days=10), purge_incomplete=True)
         self.assertEqual(len(ActionExecution.get_all()), 0)
+
+    def test_purge_executions_in_batches(self):
+        now = date_utils.get_datetime_utc_now()
+
+        # Write executions before cut-off threshold
+        for index in range(0, 5):
+            exec_model = copy.deepcopy(self.models['executions']['execution1.yaml'])
+            exec_model['start_timestamp'] = now - timedelta(days=15)
+            exec_model['end_timestamp'] = now - timedelta(days=14)
+            exec_model['status'] = action_constants.LIVEACTION_STATUS_SUCCEEDED
+            exec_model['id'] = bson.ObjectId()
+            ActionExecution.add_or_update(exec_model)
+
+        # Write one execution after cut-off threshold
+        exec_model = copy.deepcopy(self.models['executions']['execution1.yaml'])
+        exec_model['start_timestamp'] = now - timedelta(days=5)
+        exec_model['end_timestamp'] = now - timedelta(days=4)
+        exec_model['status'] = action_constants.LIVEACTION_STATUS_SUCCEEDED
+        exec_model['id'] = bson.ObjectId()
+        ActionExecution.add_or_update(exec_model)
+
+        self.assertEqual(len(ActionExecution.get_all()), 6)
+        purge_executions(logger=LOG, timestamp=now - timedelta(days=10), batch_size=2,
+                         batch_sleep_delay=0)
+        self.assertEqual(len(ActionExecution.get_all()), 1)
+
+    def test_purge_orphaned_execution_states(self):
+        liveaction_model = copy.deepcopy(self.models['liveactions']['liveaction4.yaml'])
+        liveaction = LiveAction.add_or_update(liveaction_model)
+
+        state_db = ActionExecutionStateDB(execution_id=liveaction.id, query_module='dummy',
+                                          query_context={'id': 'dummy'})
+        ActionExecutionState.add_or_update(state_db)
+
+        for index in range(0, 3):
+            state_db = ActionExecutionStateDB(execution_id=bson.ObjectId(),
+                                              query_module='dummy', query_context={'id': 'dummy'})
+            ActionExecutionState.add_or_update(state_db)
+
+        self.assertEqual(len(ActionExecutionState.get_all()), 4)
+        deleted_count = purge_orphaned_execution_states(logger=LOG, batch_size=2,
+                                                        batch_sleep_delay=0)
+        self.assertEqual(deleted_count, 3)
+
+        states = ActionExecutionState.get_all()
+        self.assertEqual(len(states), 1)
+        self.assertEqual(states[0].execution_id, liveaction.id)
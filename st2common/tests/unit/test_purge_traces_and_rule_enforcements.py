@@ -0,0 +1,89 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import timedelta
+
+from st2common import log as logging
+from st2common.garbage_collection.rule_enforcements import purge_rule_enforcements
+from st2common.garbage_collection.traces import purge_traces
+from st2common.models.db.rule_enforcement import RuleEnforcementDB
+from st2common.models.db.rule_enforcement import RuleReferenceSpecDB
+from st2common.models.db.trace import TraceDB
+from st2common.persistence.rule_enforcement import RuleEnforcement
+from st2common.persistence.trace import Trace
+from st2common.util import date as date_utils
+from st2tests.base import CleanDbTestCase
+
+LOG = logging.getLogger(__name__)
+
+
+class TestPurgeTracesAndRuleEnforcements(CleanDbTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        CleanDbTestCase.setUpClass()
+        super(TestPurgeTracesAndRuleEnforcements, cls).setUpClass()
+
+    def setUp(self):
+        super(TestPurgeTracesAndRuleEnforcements, self).setUp()
+
+    def test_no_timestamp_doesnt_delete(self):
+        now = date_utils.get_datetime_utc_now()
+
+        Trace.add_or_update(TraceDB(trace_tag='purge-1', start_timestamp=now - timedelta(days=20)))
+
+        expected_msg = 'Specify a valid timestamp'
+        self.assertRaisesRegexp(ValueError, expected_msg, purge_traces,
+                                logger=LOG, timestamp=None)
+        self.assertEqual(len(Trace.get_all()), 1)
+
+    def test_purge_traces(self):
+        now = date_utils.get_datetime_utc_now()
+
+        for index in range(0, 3):
+            trace_db = TraceDB(trace_tag='purge-%s' % (index),
+                               start_timestamp=now - timedelta(days=20))
+            Trace.add_or_update(trace_db)
+
+        Trace.add_or_update(TraceDB(trace_tag='keep', start_timestamp=now - timedelta(days=5)))
+
+        self.assertEqual(len(Trace.get_all()), 4)
+        purge_traces(logger=LOG, timestamp=now - timedelta(days=10), batch_size=2,
+                     batch_sleep_delay=0)
+
+        traces = Trace.get_all()
+        self.assertEqual(len(traces), 1)
+        self.assertEqual(traces[0].trace_tag, 'keep')
+
+    def test_purge_rule_enforcements(self):
+        now = date_utils.get_datetime_utc_now()
+        rule = RuleReferenceSpecDB(ref='purge_tool.dummy_rule', id='1', uid='rule:purge_tool:1')
+
+        for index in range(0, 3):
+            enforcement_db = RuleEnforcementDB(trigger_instance_id=str(index), rule=rule,
+                                               enforced_at=now - timedelta(days=20))
+            RuleEnforcement.add_or_update(enforcement_db)
+
+        enforcement_db = RuleEnforcementDB(trigger_instance_id='keep', rule=rule,
+                                           enforced_at=now - timedelta(days=5))
+        RuleEnforcement.add_or_update(enforcement_db)
+
+        self.assertEqual(len(RuleEnforcement.get_all()), 4)
+        purge_rule_enforcements(logger=LOG, timestamp=now - timedelta(days=10), batch_size=2,
+                                batch_sleep_delay=0)
+
+        enforcements = RuleEnforcement.get_all()
+        self.assertEqual(len(enforcements), 1)
+        self.assertEqual(enforcements[0].trigger_instance_id, 'keep')
@@ -100,3 +100,119 @@ class StagedQueueConsumerTest(DbTestCase):
         mock_message = mock.MagicMock()
         handler._queue_consumer.process(payload, mock_message)
         self.assertTrue(mock_message.ack.called)
+
+
+def get_batched_staged_handler(batch_size=3):
+    handler = get_staged_handler()
+    handler._queue_consumer = consumers.StagedQueueConsumer(
+        connection=mock.MagicMock(), queues=[FAKE_WORK_Q], handler=handler,
+        batch_size=batch_size, batch_flush_interval=60)
+    return handler
+
+
+class BatchedStagedQueueConsumerTest(DbTestCase):
+
+    @mock.patch.object(BufferedDispatcher, 'dispatch', mock.MagicMock())
+    @mock.patch.object(FakeStagedMessageHandler, 'pre_ack_process_batch',
+                       mock.MagicMock(side_effect=lambda messages: messages))
+    def test_process_full_batch(self):
+        handler = get_batched_staged_handler(batch_size=3)
+        channel = mock.MagicMock()
+        payloads = [FakeModelDB(), FakeModelDB(), FakeModelDB()]
+        messages = [mock.MagicMock(channel=channel, delivery_tag=index)
+                    for index in range(len(payloads))]
+
+        handler._queue_consumer.process(payloads[0], messages[0])
+        handler._queue_consumer.process(payloads[1], messages[1])
+        self.assertFalse(FakeStagedMessageHandler.pre_ack_process_batch.called)
+        self.assertFalse(channel.basic_ack.called)
+
+        handler._queue_consumer.process(payloads[2], messages[2])
+        FakeStagedMessageHandler.pre_ack_process_batch.assert_called_once_with(payloads)
+        channel.basic_ack.assert_called_once_with(2, multiple=True)
+        self.assertEqual(BufferedDispatcher.dispatch.call_count, 3)
+
+    @mock.patch.object(BufferedDispatcher, 'dispatch', mock.MagicMock())
+    @mock.patch.object(FakeStagedMessageHandler, 'pre_ack_process_batch',
+                       mock.MagicMock(side_effect=lambda messages: messages))
+    def test_partial_batch_flushed_on_iteration(self):
+        handler = get_batched_staged_handler(batch_size=3)
+        channel = mock.MagicMock()
+        payload = FakeModelDB()
+
+        handler._queue_consumer.process(payload, mock.MagicMock(channel=channel, delivery_tag=1))
+        handler._queue_consumer.on_iteration()
+        self.assertFalse(channel.basic_ack.called)
+
+        handler._queue_consumer._batch_start_ts -= 60
+        handler._queue_consumer.on_iteration()
+        FakeStagedMessageHandler.pre_ack_process_batch.assert_called_once_with([payload])
+        channel.basic_ack.assert_called_once_with(1, multiple=True)
+        BufferedDispatcher.dispatch.assert_called_once_with(
+            handler._queue_consumer._process_message, payload)
+
+    @mock.patch.object(BufferedDispatcher, 'dispatch', mock.MagicMock())
+    @mock.patch.object(FakeStagedMessageHandler, 'pre_ack_process_batch',
+                       mock.MagicMock(side_effect=Exception('db down')))
+    def test_failed_batch_is_processed_message_by_message(self):
+        handler = get_batched_staged_handler(batch_size=3)
+        channel = mock.MagicMock()
+        payloads = [FakeModelDB(), FakeModelDB()]
+
+        handler._queue_consumer.process(payloads[0], mock.MagicMock(channel=channel,
+                                                                    delivery_tag=1))
+        handler._queue_consumer.process(100, mock.MagicMock(channel=channel, delivery_tag=2))
+
+        with mock.patch.object(FakeStagedMessageHandler, 'pre_ack_process',
+                               mock.MagicMock(side_effect=[Exception('fail'), 'response'])):
+            handler._queue_consumer.process(payloads[1], mock.MagicMock(channel=channel,
+                                                                        delivery_tag=3))
+            self.assertEqual(FakeStagedMessageHandler.pre_ack_process.call_count, 2)
+
+        channel.basic_ack.assert_called_once_with(3, multiple=True)
+        BufferedDispatcher.dispatch.assert_called_once_with(
+            handler._queue_consumer._process_message, 'response')
+
+    @mock.patch.object(BufferedDispatcher, 'dispatch', mock.MagicMock())
+    @mock.patch.object(FakeStagedMessageHandler, 'pre_ack_process_batch',
+                       mock.MagicMock(side_effect=lambda messages: messages))
+    def test_batch_is_not_dispatched_on_ack_failure(self):
+        handler = get_batched_staged_handler(batch_size=2)
+        channel = mock.MagicMock()
+        channel.basic_ack.side_effect = Exception('channel closed')
+
+        handler._queue_consumer.process(FakeModelDB(), mock.MagicMock(channel=channel,
+                                                                      delivery_tag=1))
+        handler._queue_consumer.process(FakeModelDB(), mock.MagicMock(channel=channel,
+                                                                      delivery_tag=2))
+
+        channel.basic_ack.assert_called_once_with(2, multiple=True)
+        self.assertFalse(BufferedDispatcher.dispatch.called)
+
+    def test_default_pre_ack_process_batch_skips_failures(self):
+        handler = get_staged_handler()
+        payloads = [FakeModelDB(), FakeModelDB()]
+
+        with mock.patch.object(FakeStagedMessageHandler, 'pre_ack_process',
+                               mock.MagicMock(side_effect=[Exception('fail'), 'response'])):
+            responses = handler.pre_ack_process_batch(payloads)
+
+        self.assertEqual(responses, ['response'])
+
+
+class ActionsQueueConsumerTest(DbTestCase):
+
+    def test_on_iteration(self):
+        handler = get_handler()
+        consumer = consumers.ActionsQueueConsumer(connection=mock.MagicMock(),
+                                                  queues=[FAKE_WORK_Q], handler=handler)
+
+        # Batching is not used so this should be a no-op
+        consumer.on_iteration()
+
+        with mock.patch.object(BufferedDispatcher, 'dispatch', mock.MagicMock()):
+            message = mock.MagicMock()
+            consumer.process(FakeModelDB(), message)
+            consumer.on_iteration()
+
+        self.assertTrue(message.ack.called)
@@ -0,0 +1,95 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import mock
+import unittest2
+from oslo_config import cfg
+
+from st2common.models.api.action import ActionAPI
+from st2common.router import Response
+from st2common.router import Router
+from st2common.router import StreamingJSONListResponse
+
+import st2tests.config as tests_config
+tests_config.parse_args()
+
+
+class RouterTestCase(unittest2.TestCase):
+    def tearDown(self):
+        super(RouterTestCase, self).tearDown()
+        cfg.CONF.set_override(name='response_validation', override='full', group='api')
+
+    def test_response_get_json_value_doesnt_parse_body(self):
+        value = [ActionAPI(name='foo', pack='bar', tags=('a', 'b')), {'a': {'b': 1}}]
+        resp = Response(json=value)
+
+        with mock.patch.object(Response, 'json', mock.PropertyMock()) as json_body:
+            json_value = resp.get_json_value()
+            self.assertFalse(json_body.called)
+
+        self.assertEqual(json_value, resp.json)
+
+        # Returned value is a copy which can be modified
+        json_value[1]['a']['c'] = 2
+        self.assertDictEqual(value[1], {'a': {'b': 1}})
+
+        resp.json = {'c': 'd'}
+        self.assertDictEqual(resp.get_json_value(), {'c': 'd'})
+
+        resp = Response(body='{"e": "f"}', content_type='application/json')
+        self.assertDictEqual(resp.get_json_value(), {'e': 'f'})
+
+    def test_should_validate_response(self):
+        router = Router()
+
+        cfg.CONF.set_override(name='response_validation', override='full', group='api')
+        self.assertTrue(router._should_validate_response())
+
+        cfg.CONF.set_override(name='response_validation', override='off', group='api')
+        self.assertFalse(router._should_validate_response())
+
+        cfg.CONF.set_override(name='response_validation', override='sampled', group='api')
+        cfg.CONF.set_override(name='response_validation_sample_rate', override=0.2, group='api')
+
+        with mock.patch('random.random', mock.Mock(return_value=0.1)):
+            self.assertTrue(router._should_validate_response())
+
+        with mock.patch('random.random', mock.Mock(return_value=0.5)):
+            self.assertFalse(router._should_validate_response())
+
+    def test_streaming_json_list_response(self):
+        items = [ActionAPI(name='foo', pack='bar'), {'a': {'b': 1}}]
+        consumed = []
+
+        def get_items():
+            for item in items:
+                consumed.append(item)
+                yield item
+
+        resp = StreamingJSONListResponse(items=get_items())
+        self.assertEqual(resp.content_type, 'application/json')
+
+        # Items are only serialized when the response body is consumed
+        self.assertEqual(consumed, [])
+
+        body = b''.join(resp.app_iter)
+        self.assertEqual(consumed, items)
+        self.assertEqual(json.loads(body), [items[0].__json__(), items[1]])
+        self.assertFalse(b'\n' in body)
+
+        resp = StreamingJSONListResponse(items=[])
+        self.assertEqual(resp.json, [])
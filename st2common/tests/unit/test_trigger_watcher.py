@@ -0,0 +1,55 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import unittest2
+
+from st2common.models.db.trigger import TriggerDB
+from st2common.persistence.trigger import Trigger
+from st2common.services.triggerwatcher import TriggerWatcher
+
+TRIGGER_1 = TriggerDB(pack='dummy_pack_1', name='trigger1', type='dummy_pack_1.trigger_type1')
+TRIGGER_2 = TriggerDB(pack='dummy_pack_1', name='trigger2', type='dummy_pack_1.trigger_type2')
+
+
+class TriggerWatcherTests(unittest2.TestCase):
+
+    @mock.patch.object(Trigger, 'query', mock.MagicMock(return_value=[TRIGGER_1]))
+    @mock.patch.object(Trigger, 'get_all', mock.MagicMock(return_value=[TRIGGER_1, TRIGGER_2]))
+    def test_load_triggers_from_db(self):
+        create_handler = mock.MagicMock()
+
+        # Only the triggers of the provided types are loaded
+        watcher = TriggerWatcher(create_handler=create_handler, update_handler=None,
+                                 delete_handler=None, trigger_types=[TRIGGER_1.type])
+        watcher._load_triggers_from_db()
+        create_handler.assert_called_once_with(TRIGGER_1)
+        Trigger.query.assert_called_once_with(type=TRIGGER_1.type)
+
+        # No trigger types, nothing is loaded
+        create_handler.reset_mock()
+        watcher = TriggerWatcher(create_handler=create_handler, update_handler=None,
+                                 delete_handler=None, trigger_types=[])
+        watcher._load_triggers_from_db()
+        self.assertFalse(create_handler.called)
+        self.assertFalse(Trigger.get_all.called)
+
+        # All the triggers are loaded when explicitly requested
+        watcher = TriggerWatcher(create_handler=create_handler, update_handler=None,
+                                 delete_handler=None, trigger_types=None,
+                                 load_all_triggers=True)
+        watcher._load_triggers_from_db()
+        self.assertEqual(create_handler.call_args_list,
+                         [mock.call(TRIGGER_1), mock.call(TRIGGER_2)])
@@ -27,7 +27,22 @@ LOG = logging.getLogger('st2reactor.sensor.container_utils')
 
 def create_trigger_instance(trigger, payload, occurrence_time, raise_on_no_trigger=False):
     """
-    This creates a trigger instance object given trigger and payload.
+    This creates a trigger instance object given trigger and payload and saves it in the database.
+    See ``build_trigger_instance`` for a description of the arguments.
+    """
+    trigger_instance = build_trigger_instance(trigger=trigger, payload=payload,
+                                              occurrence_time=occurrence_time,
+                                              raise_on_no_trigger=raise_on_no_trigger)
+
+    if not trigger_instance:
+        return None
+
+    return TriggerInstance.add_or_update(trigger_instance)
+
+
+def build_trigger_instance(trigger, payload, occurrence_time, raise_on_no_trigger=False):
+    """
+    This builds a trigger instance object given trigger and payload without saving it.
     Trigger can be just a string reference (pack.name) or a ``dict`` containing 'id' or
     'uid' or type' and 'parameters' keys.
 
@@ -77,7 +92,7 @@ def create_trigger_instance(trigger, payload, occurrence_time, raise_on_no_trigg
     trigger_instance.payload = payload
     trigger_instance.occurrence_time = occurrence_time
     trigger_instance.status = TRIGGER_INSTANCE_PENDING
-    return TriggerInstance.add_or_update(trigger_instance)
+    return trigger_instance
 
 
 def update_trigger_instance_status(trigger_instance, status):
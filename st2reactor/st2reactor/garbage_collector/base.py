@@ -32,7 +32,10 @@ from st2common.constants.garbage_collection import MINIMUM_TTL_DAYS
 from st2common.util import isotime
 from st2common.util.date import get_datetime_utc_now
 from st2common.garbage_collection.executions import purge_executions
+from st2common.garbage_collection.executions import purge_orphaned_execution_states
 from st2common.garbage_collection.trigger_instances import purge_trigger_instances
+from st2common.garbage_collection.traces import purge_traces
+from st2common.garbage_collection.rule_enforcements import purge_rule_enforcements
 
 __all__ = [
     'GarbageCollectorService'
@@ -52,8 +55,13 @@ class GarbageCollectorService(object):
 
         self._action_executions_ttl = cfg.CONF.garbagecollector.action_executions_ttl
         self._trigger_instances_ttl = cfg.CONF.garbagecollector.trigger_instances_ttl
+        self._traces_ttl = cfg.CONF.garbagecollector.traces_ttl
+        self._rule_enforcements_ttl = cfg.CONF.garbagecollector.rule_enforcements_ttl
         self._validate_ttl_values()
 
+        self._purge_batch_size = cfg.CONF.garbagecollector.purge_batch_size
+        self._purge_batch_sleep_delay = cfg.CONF.garbagecollector.purge_batch_sleep_delay
+
         self._running = True
 
     def run(self):
@@ -103,12 +111,19 @@ class GarbageCollectorService(object):
         if self._trigger_instances_ttl and self._trigger_instances_ttl < MINIMUM_TTL_DAYS:
             raise ValueError('Minimum possible TTL in days is %s' % (MINIMUM_TTL_DAYS))
 
+        if self._traces_ttl and self._traces_ttl < MINIMUM_TTL_DAYS:
+            raise ValueError('Minimum possible TTL in days is %s' % (MINIMUM_TTL_DAYS))
+
+        if self._rule_enforcements_ttl and self._rule_enforcements_ttl < MINIMUM_TTL_DAYS:
+            raise ValueError('Minimum possible TTL in days is %s' % (MINIMUM_TTL_DAYS))
+
     def _perform_garbage_collection(self):
         LOG.info('Performing garbage collection...')
 
-        # todo sleep between queries to avoid busy waiting
+        deleted_liveaction_count = 0
+
         if self._action_executions_ttl >= MINIMUM_TTL_DAYS:
-            self._purge_action_executions()
+            deleted_liveaction_count = self._purge_action_executions()
         else:
             LOG.debug('Skipping garbage collection for action executions since it\'s not '
                       'configured')
@@ -121,10 +136,33 @@ class GarbageCollectorService(object):
             LOG.debug('Skipping garbage collection for trigger instances since it\'s not '
                       'configured')
 
+        if self._traces_ttl >= MINIMUM_TTL_DAYS:
+            self._purge_traces()
+        else:
+            LOG.debug('Skipping garbage collection for traces since it\'s not configured')
+
+        if self._rule_enforcements_ttl >= MINIMUM_TTL_DAYS:
+            self._purge_rule_enforcements()
+        else:
+            LOG.debug('Skipping garbage collection for rule enforcements since it\'s not '
+                      'configured')
+
+        # Execution state objects which reference deleted live actions are never used again. They
+        # only become orphaned when live actions are deleted so there is no need to scan the whole
+        # collection on each run.
+        if deleted_liveaction_count:
+            self._purge_orphaned_execution_states()
+        else:
+            LOG.debug('Skipping garbage collection for orphaned execution states since no live '
+                      'actions were deleted')
+
     def _purge_action_executions(self):
         """
         Purge action executions and corresponding live actions which match the criteria defined in
         the config.
+
+        :return: Number of deleted live action objects.
+        :rtype: ``int``
         """
         LOG.info('Performing garbage collection for action executions')
 
@@ -140,12 +178,16 @@ class GarbageCollectorService(object):
 
         assert timestamp < utc_now
 
+        deleted_liveaction_count = 0
+
         try:
-            purge_executions(logger=LOG, timestamp=timestamp)
+            deleted_liveaction_count = purge_executions(
+                logger=LOG, timestamp=timestamp, batch_size=self._purge_batch_size,
+                batch_sleep_delay=self._purge_batch_sleep_delay)
         except Exception as e:
             LOG.exception('Failed to delete executions: %s' % (str(e)))
 
-        return True
+        return deleted_liveaction_count
 
     def _purge_trigger_instances(self):
         """
@@ -166,8 +208,76 @@ class GarbageCollectorService(object):
         assert timestamp < utc_now
 
         try:
-            purge_trigger_instances(logger=LOG, timestamp=timestamp)
+            purge_trigger_instances(logger=LOG, timestamp=timestamp,
+                                    batch_size=self._purge_batch_size,
+                                    batch_sleep_delay=self._purge_batch_sleep_delay)
         except Exception as e:
             LOG.exception('Failed to trigger instances: %s' % (str(e)))
 
         return True
+
+    def _purge_traces(self):
+        """
+        Purge traces which match the criteria defined in the config.
+        """
+        LOG.info('Performing garbage collection for traces')
+
+        timestamp = self._get_purge_timestamp(ttl=self._traces_ttl)
+        LOG.info('Deleting traces older than: %s' % (isotime.format(dt=timestamp)))
+
+        try:
+            purge_traces(logger=LOG, timestamp=timestamp,
+                         batch_size=self._purge_batch_size,
+                         batch_sleep_delay=self._purge_batch_sleep_delay)
+        except Exception as e:
+            LOG.exception('Failed to delete traces: %s' % (str(e)))
+
+        return True
+
+    def _purge_rule_enforcements(self):
+        """
+        Purge rule enforcements which match the criteria defined in the config.
+        """
+        LOG.info('Performing garbage collection for rule enforcements')
+
+        timestamp = self._get_purge_timestamp(ttl=self._rule_enforcements_ttl)
+        LOG.info('Deleting rule enforcements older than: %s' % (isotime.format(dt=timestamp)))
+
+        try:
+            purge_rule_enforcements(logger=LOG, timestamp=timestamp,
+                                    batch_size=self._purge_batch_size,
+                                    batch_sleep_delay=self._purge_batch_sleep_delay)
+        except Exception as e:
+            LOG.exception('Failed to delete rule enforcements: %s' % (str(e)))
+
+        return True
+
+    def _purge_orphaned_execution_states(self):
+        """
+        Purge execution state objects which reference live actions which don't exist anymore.
+        """
+        LOG.info('Performing garbage collection for orphaned execution states')
+
+        try:
+            purge_orphaned_execution_states(logger=LOG,
+                                            batch_size=self._purge_batch_size,
+                                            batch_sleep_delay=self._purge_batch_sleep_delay)
+        except Exception as e:
+            LOG.exception('Failed to delete orphaned execution states: %s' % (str(e)))
+
+        return True
+
+    def _get_purge_timestamp(self, ttl):
+        """
+        Return timestamp for the provided TTL (in days) and make sure it doesn't violate the
+        minimum TTL constraint.
+        """
+        utc_now = get_datetime_utc_now()
+        timestamp = (utc_now - datetime.timedelta(days=ttl))
+
+        # Another sanity check to make sure we don't delete new objects
+        if timestamp > (utc_now - datetime.timedelta(days=MINIMUM_TTL_DAYS)):
+            raise ValueError('Calculated timestamp would violate the minimum TTL constraint')
+
+        assert timestamp < utc_now
+        return timestamp
@@ -18,6 +18,8 @@ from oslo_config import cfg
 import st2common.config as common_config
 from st2common.constants.system import VERSION_STRING
 from st2common.constants.garbage_collection import DEFAULT_COLLECTION_INTERVAL
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SIZE
+from st2common.constants.garbage_collection import DEFAULT_PURGE_BATCH_SLEEP_DELAY
 common_config.register_opts()
 
 CONF = cfg.CONF
@@ -49,7 +51,13 @@ def _register_garbage_collector_opts():
 
     common_opts = [
         cfg.IntOpt('collection_interval', default=DEFAULT_COLLECTION_INTERVAL,
-                   help='How often to check database for old data and perform garbage collection.')
+                   help='How often to check database for old data and perform garbage collection.'),
+        cfg.IntOpt('purge_batch_size', default=DEFAULT_PURGE_BATCH_SIZE,
+                   help='Maximum number of objects which are deleted with a single query.'),
+        cfg.FloatOpt('purge_batch_sleep_delay', default=DEFAULT_PURGE_BATCH_SLEEP_DELAY,
+                     help=('How long to sleep (in seconds) between deleting two batches of '
+                           'objects. Used to limit the load garbage collection puts on the '
+                           'database.'))
     ]
     CONF.register_opts(common_opts, group='garbagecollector')
 
@@ -59,6 +67,11 @@ def _register_garbage_collector_opts():
                          'deleted.')),
         cfg.IntOpt('trigger_instances_ttl', default=None,
                    help=('Trigger instances older than this value (days) will be automatically '
+                         'deleted.')),
+        cfg.IntOpt('traces_ttl', default=None,
+                   help=('Traces older than this value (days) will be automatically deleted.')),
+        cfg.IntOpt('rule_enforcements_ttl', default=None,
+                   help=('Rule enforcements older than this value (days) will be automatically '
                          'deleted.'))
     ]
     CONF.register_opts(ttl_opts, group='garbagecollector')
@@ -0,0 +1,191 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+
+import six
+from jsonpath_rw import parse
+
+from st2common import log as logging
+import st2common.operators as criteria_operators
+from st2common.constants.rules import MATCH_CRITERIA
+from st2common.util import jinja as jinja_utils
+
+__all__ = [
+    'CompiledRule',
+    'CompiledCriterion',
+
+    'get_compiled_rule'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Markers which indicate a string needs to be rendered with Jinja. Jinja also normalizes new
+# lines and strips a single trailing new line so values which contain those are rendered as
+# well to preserve the existing behavior.
+JINJA_MARKERS = ['{{', '{%', '{#', '\r']
+
+# Environment which is only used for parsing the criteria patterns
+_JINJA_ENV = None
+
+
+def is_templated(value):
+    """
+    Return True if the provided criteria pattern needs to be rendered with Jinja.
+
+    :rtype: ``bool``
+    """
+    if not isinstance(value, six.string_types):
+        return False
+
+    if value.endswith('\n'):
+        return True
+
+    for marker in JINJA_MARKERS:
+        if marker in value:
+            return True
+
+    return False
+
+
+class CompiledCriterion(object):
+    """
+    Pre-processed version of a single rule criterion.
+
+    All the work which only depends on the criterion definition (parsing of the JSONPath lookup
+    key, operator resolution, regex compilation, detection if the pattern needs to be rendered)
+    is performed once when the object is constructed.
+    """
+
+    def __init__(self, key, criterion):
+        """
+        :param key: Payload lookup key (JSONPath expression).
+        :type key: ``str``
+
+        :param criterion: Criterion definition with "type" and "pattern" attribute.
+        :type criterion: ``dict``
+        """
+        self.key = key
+        self.operator = criterion.get('type', None)
+        self.pattern = criterion.get('pattern', None)
+
+        self.is_templated = is_templated(self.pattern)
+
+        # Version of the pattern with to_complex filter applied to the jinja expressions
+        self.complex_pattern = None
+
+        # Compiled pattern for regex based operators with a static pattern
+        self.compiled_pattern = None
+
+        self.lookup_expr = None
+        self.op_func = None
+
+        # Names of the system scope datastore keys referenced in the pattern
+        self.datastore_keys = set()
+
+        self._compile()
+
+    def _compile(self):
+        try:
+            self.lookup_expr = parse(self.key)
+        except Exception:
+            # Error will be logged when the criterion is evaluated
+            LOG.debug('Failed to parse criteria key "%s"', self.key, exc_info=True)
+
+        if self.is_templated and re.search(MATCH_CRITERIA, self.pattern):
+            self.complex_pattern = re.sub(MATCH_CRITERIA, r'\1\2 | to_complex\3',
+                                          self.pattern)
+
+        if self.is_templated:
+            try:
+                template_ast = _get_jinja_environment().parse(self.pattern)
+                self.datastore_keys = jinja_utils.get_datastore_keys(template_ast)
+            except Exception:
+                # Error will be logged when the pattern is rendered
+                LOG.debug('Failed to parse pattern "%s" for key "%s"', self.pattern, self.key,
+                          exc_info=True)
+
+        if not self.operator:
+            return
+
+        try:
+            self.op_func = criteria_operators.get_operator(self.operator)
+        except Exception:
+            # Error will be propagated when the criterion is evaluated
+            LOG.debug('Invalid operator "%s" for key "%s"', self.operator, self.key)
+            return
+
+        if not self.is_templated and isinstance(self.pattern, six.string_types):
+            try:
+                self.compiled_pattern = criteria_operators.compile_regex_pattern(
+                    op=self.operator, criteria_pattern=self.pattern)
+            except Exception:
+                # Invalid regex, error will be logged when the criterion is evaluated
+                LOG.debug('Failed to compile pattern "%s" for key "%s"', self.pattern, self.key,
+                          exc_info=True)
+
+
+class CompiledRule(object):
+    """
+    Pre-processed version of a rule which is used for matching.
+
+    Compiled rule is built once per rule revision (e.g. when a rule is loaded into the rules
+    index) so per trigger instance matching doesn't need to parse the same criteria over and
+    over again.
+    """
+
+    def __init__(self, rule):
+        """
+        :param rule: Rule DB object.
+        :type rule: :class:`RuleDB`
+        """
+        self.rule = rule
+        self.criteria = []
+
+        # Names of the system scope datastore keys referenced in all the criteria patterns
+        self.datastore_keys = set()
+
+        criteria = rule.criteria or {}
+        for criterion_k in criteria.keys():
+            criterion = CompiledCriterion(key=criterion_k, criterion=criteria[criterion_k])
+            self.criteria.append(criterion)
+            self.datastore_keys.update(criterion.datastore_keys)
+
+    def __repr__(self):
+        return 'CompiledRule(rule=%s)' % (self.rule.ref)
+
+
+def _get_jinja_environment():
+    global _JINJA_ENV
+
+    if not _JINJA_ENV:
+        _JINJA_ENV = jinja_utils.get_jinja_environment()
+
+    return _JINJA_ENV
+
+
+def get_compiled_rule(rule):
+    """
+    Return compiled version of the provided rule.
+
+    :param rule: Rule DB object or an already compiled rule.
+    :type rule: :class:`RuleDB` or :class:`CompiledRule`
+
+    :rtype: :class:`CompiledRule`
+    """
+    if isinstance(rule, CompiledRule):
+        return rule
+
+    return CompiledRule(rule)
@@ -46,6 +46,20 @@ def _register_rules_engine_opts():
     ]
     CONF.register_opts(logging_opts, group='rulesengine')
 
+    rules_engine_opts = [
+        cfg.BoolOpt('use_rules_index', default=True,
+                    help='True to keep an in-memory index of enabled rules and triggers which '
+                         'is updated from the rule and trigger CUD events instead of querying '
+                         'the database for each trigger instance.'),
+        cfg.IntOpt('batch_size', default=1,
+                   help='Number of trigger instance messages to prefetch, insert into the '
+                        'database and acknowledge together. 1 disables batching.'),
+        cfg.FloatOpt('batch_flush_interval', default=1,
+                     help='Maximum number of seconds to wait for a partial batch to fill up '
+                          'before processing it.')
+    ]
+    CONF.register_opts(rules_engine_opts, group='rulesengine')
+
     timer_opts = [
         cfg.StrOpt('local_timezone', default='America/Los_Angeles',
                    help='Timezone pertaining to the location where st2 is run.'),
@@ -23,6 +23,15 @@ LOG = logging.getLogger('st2reactor.rules.RulesEngine')
 
 
 class RulesEngine(object):
+    def __init__(self, rules_index=None):
+        """
+        :param rules_index: Optional in-memory index which is used to look up triggers and
+                            rules. If not provided, database is queried for each trigger
+                            instance.
+        :type rules_index: :class:`st2reactor.rules.index.RulesIndex`
+        """
+        self._rules_index = rules_index
+
     def handle_trigger_instance(self, trigger_instance):
         # Find matching rules for trigger instance.
         matching_rules = self.get_matching_rules_for_trigger(trigger_instance)
@@ -39,13 +48,21 @@ class RulesEngine(object):
     def get_matching_rules_for_trigger(self, trigger_instance):
         trigger = trigger_instance.trigger
 
-        trigger_db = get_trigger_db_by_ref(trigger_instance.trigger)
+        if self._rules_index:
+            trigger_db = self._rules_index.get_trigger_db(trigger_ref=trigger)
+        else:
+            trigger_db = get_trigger_db_by_ref(trigger)
 
         if not trigger_db:
             LOG.error('No matching trigger found in db for trigger instance %s.', trigger_instance)
             return None
 
-        rules = get_rules_given_trigger(trigger=trigger)
+        if self._rules_index:
+            rules_network = self._rules_index.get_rules_network(trigger_ref=trigger)
+            rules = rules_network.rules
+        else:
+            rules_network = None
+            rules = get_rules_given_trigger(trigger=trigger)
 
         LOG.info('Found %d rules defined for trigger %s', len(rules),
                  trigger_db.get_reference().ref)
@@ -54,7 +71,8 @@ class RulesEngine(object):
             return rules
 
         matcher = RulesMatcher(trigger_instance=trigger_instance,
-                               trigger=trigger_db, rules=rules)
+                               trigger=trigger_db, rules=rules,
+                               rules_network=rules_network)
 
         matching_rules = matcher.get_matching_rules()
         LOG.info('Matched %s rule(s) for trigger_instance %s (trigger=%s)', len(matching_rules),
@@ -15,22 +15,22 @@
 
 import six
 import json
-import re
 from jsonpath_rw import parse
 
 from st2common import log as logging
 import st2common.operators as criteria_operators
-from st2common.constants.rules import TRIGGER_PAYLOAD_PREFIX, RULE_TYPE_BACKSTOP, MATCH_CRITERIA
+from st2common.constants.rules import TRIGGER_PAYLOAD_PREFIX, RULE_TYPE_BACKSTOP
 from st2common.constants.keyvalue import SYSTEM_SCOPES
 from st2common.services.keyvalues import KeyValueLookup
 from st2common.util.templating import render_template_with_system_context
+from st2reactor.rules.compiled import get_compiled_rule
 
 
 LOG = logging.getLogger('st2reactor.ruleenforcement.filter')
 
 
 class RuleFilter(object):
-    def __init__(self, trigger_instance, trigger, rule, extra_info=False):
+    def __init__(self, trigger_instance, trigger, rule, extra_info=False, compiled_rule=None):
         """
         :param trigger_instance: TriggerInstance DB object.
         :type trigger_instance: :class:`TriggerInstanceDB``
@@ -40,11 +40,16 @@ class RuleFilter(object):
 
         :param rule: Rule DB object.
         :type rule: :class:`RuleDB`
+
+        :param compiled_rule: Optional pre-compiled version of the rule. If not provided, rule
+                              is compiled on instantiation.
+        :type compiled_rule: :class:`CompiledRule`
         """
         self.trigger_instance = trigger_instance
         self.trigger = trigger
         self.rule = rule
         self.extra_info = extra_info
+        self.compiled_rule = compiled_rule or get_compiled_rule(rule)
 
         # Base context used with a logger
         self._base_logger_context = {
@@ -67,7 +72,7 @@ class RuleFilter(object):
                 LOG.info('Validation failed for rule %s as it is disabled.', self.rule.ref)
             return False
 
-        criteria = self.rule.criteria
+        criteria = self.compiled_rule.criteria
         is_rule_applicable = True
 
         if criteria and not self.trigger_instance.payload:
@@ -78,19 +83,17 @@ class RuleFilter(object):
         LOG.debug('Trigger payload: %s', self.trigger_instance.payload,
                   extra=self._base_logger_context)
 
-        for criterion_k in criteria.keys():
-            criterion_v = criteria[criterion_k]
+        for criterion in criteria:
             is_rule_applicable, payload_value, criterion_pattern = self._check_criterion(
-                criterion_k,
-                criterion_v,
+                criterion,
                 payload_lookup
             )
             if not is_rule_applicable:
                 if self.extra_info:
                     criteria_extra_info = '\n'.join([
-                        '  key: %s' % criterion_k,
+                        '  key: %s' % criterion.key,
                         '  pattern: %s' % criterion_pattern,
-                        '  type: %s' % criterion_v['type'],
+                        '  type: %s' % criterion.operator,
                         '  payload: %s' % payload_value
                     ])
                     LOG.info('Validation for rule %s failed on criteria -\n%s', self.rule.ref,
@@ -104,41 +107,48 @@ class RuleFilter(object):
 
         return is_rule_applicable
 
-    def _check_criterion(self, criterion_k, criterion_v, payload_lookup):
-        if 'type' not in criterion_v:
+    def _check_criterion(self, criterion, payload_lookup):
+        """
+        :param criterion: Compiled criterion to check.
+        :type criterion: :class:`st2reactor.rules.compiled.CompiledCriterion`
+        """
+        if not criterion.operator:
             # Comparison operator type not specified, can't perform a comparison
             return (False, None, None)
 
-        criteria_operator = criterion_v['type']
-        criteria_pattern = criterion_v.get('pattern', None)
-
         # Render the pattern (it can contain a jinja expressions)
         try:
             criteria_pattern = self._render_criteria_pattern(
-                criteria_pattern=criteria_pattern,
+                criterion=criterion,
                 criteria_context=payload_lookup.context
             )
         except Exception:
             LOG.exception('Failed to render pattern value "%s" for key "%s"' %
-                          (criteria_pattern, criterion_k), extra=self._base_logger_context)
+                          (criterion.pattern, criterion.key), extra=self._base_logger_context)
             return (False, None, None)
 
         try:
-            matches = payload_lookup.get_value(criterion_k)
+            matches = payload_lookup.get_value(criterion.lookup_expr or criterion.key)
             # pick value if only 1 matches else will end up being an array match.
             if matches:
                 payload_value = matches[0] if len(matches) > 0 else matches
             else:
                 payload_value = None
         except:
-            LOG.exception('Failed transforming criteria key %s', criterion_k,
+            LOG.exception('Failed transforming criteria key %s', criterion.key,
                           extra=self._base_logger_context)
             return (False, None, None)
 
-        op_func = criteria_operators.get_operator(criteria_operator)
+        op_func = criterion.op_func or criteria_operators.get_operator(criterion.operator)
+
+        # Use pre-compiled regex for static patterns
+        if criterion.compiled_pattern is not None:
+            op_pattern = criterion.compiled_pattern
+        else:
+            op_pattern = criteria_pattern
 
         try:
-            result = op_func(value=payload_value, criteria_pattern=criteria_pattern)
+            result = op_func(value=payload_value, criteria_pattern=op_pattern)
         except:
             LOG.exception('There might be a problem with the criteria in rule %s.', self.rule,
                           extra=self._base_logger_context)
@@ -146,7 +156,9 @@ class RuleFilter(object):
 
         return result, payload_value, criteria_pattern
 
-    def _render_criteria_pattern(self, criteria_pattern, criteria_context):
+    def _render_criteria_pattern(self, criterion, criteria_context):
+        criteria_pattern = criterion.pattern
+
         # Note: Here we want to use strict comparison to None to make sure that
         # other falsy values such as integer 0 are handled correctly.
         if criteria_pattern is None:
@@ -157,6 +169,10 @@ class RuleFilter(object):
             # makes no sense
             return criteria_pattern
 
+        if not criterion.is_templated:
+            # Static pattern, rendering it would result in the same value
+            return criteria_pattern
+
         LOG.debug(
             'Rendering criteria pattern (%s) with context: %s',
             criteria_pattern,
@@ -167,12 +183,9 @@ class RuleFilter(object):
 
         # Check if jinja variable is in criteria_pattern and if so lets ensure
         # the proper type is applied to it using to_complex jinja filter
-        if len(re.findall(MATCH_CRITERIA, criteria_pattern)) > 0:
+        complex_criteria_pattern = criterion.complex_pattern
+        if complex_criteria_pattern:
             LOG.debug("Rendering Complex")
-            complex_criteria_pattern = re.sub(
-                MATCH_CRITERIA, r'\1\2 | to_complex\3',
-                criteria_pattern
-            )
 
             try:
                 criteria_rendered = render_template_with_system_context(
@@ -203,7 +216,7 @@ class SecondPassRuleFilter(RuleFilter):
     Special filter that handles all second pass rules. For not these are only
     backstop rules i.e. those that can match when no other rule has matched.
     """
-    def __init__(self, trigger_instance, trigger, rule, first_pass_matched):
+    def __init__(self, trigger_instance, trigger, rule, first_pass_matched, compiled_rule=None):
         """
         :param trigger_instance: TriggerInstance DB object.
         :type trigger_instance: :class:`TriggerInstanceDB``
@@ -216,8 +229,12 @@ class SecondPassRuleFilter(RuleFilter):
 
         :param first_pass_matched: Rules that matched in the first pass.
         :type first_pass_matched: `list`
+
+        :param compiled_rule: Optional pre-compiled version of the rule.
+        :type compiled_rule: :class:`CompiledRule`
         """
-        super(SecondPassRuleFilter, self).__init__(trigger_instance, trigger, rule)
+        super(SecondPassRuleFilter, self).__init__(trigger_instance, trigger, rule,
+                                                   compiled_rule=compiled_rule)
         self.first_pass_matched = first_pass_matched
 
     def filter(self):
@@ -241,7 +258,14 @@ class PayloadLookup(object):
             self.context[system_scope] = KeyValueLookup(scope=system_scope)
 
     def get_value(self, lookup_key):
-        expr = parse(lookup_key)
+        """
+        :param lookup_key: JSONPath expression string or an already parsed expression.
+        """
+        if isinstance(lookup_key, six.string_types):
+            expr = parse(lookup_key)
+        else:
+            expr = lookup_key
+
         matches = [match.value for match in expr.find(self.context)]
         if not matches:
             return None
@@ -0,0 +1,227 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+
+from st2common import log as logging
+from st2common.persistence.rule import Rule
+from st2common.services.rule_watcher import RuleWatcher
+from st2common.services.triggers import get_trigger_db_by_ref
+from st2common.services.triggerwatcher import TriggerWatcher
+from st2reactor.rules.compiled import CompiledRule
+from st2reactor.rules.network import RulesNetwork
+
+__all__ = [
+    'RulesIndex'
+]
+
+LOG = logging.getLogger(__name__)
+
+
+class RulesIndex(object):
+    """
+    In-memory index of enabled rules keyed by trigger reference and of the trigger objects
+    those rules refer to.
+
+    Index is populated from the database once on start and afterwards kept up to date by
+    consuming rule and trigger CUD events. This way the rules engine doesn't need to hit the
+    database for every trigger instance it processes.
+
+    Rules are stored in the compiled form which is built once per rule revision.
+    """
+
+    def __init__(self):
+        # Maps trigger ref -> OrderedDict(rule id -> CompiledRule)
+        self._rules_by_trigger_ref = collections.defaultdict(collections.OrderedDict)
+
+        # Maps rule id -> trigger ref. Used to locate stale entries on update / delete since the
+        # rule trigger can change between revisions.
+        self._trigger_ref_by_rule_id = {}
+
+        # Maps trigger ref -> TriggerDB
+        self._triggers_by_ref = {}
+
+        # Maps trigger ref -> RulesNetwork. Networks are built lazily and invalidated when a
+        # rule for that trigger changes.
+        self._networks_by_trigger_ref = {}
+
+        # True while the initial load from the database is in progress
+        self._loading = False
+
+        # Ids of the rules which have been deleted or disabled by a watcher event while the
+        # initial load was in progress. Result of the load query could be stale for those.
+        self._removed_rule_ids = set()
+
+        self._rule_watcher = RuleWatcher(create_handler=self._handle_create_rule,
+                                         update_handler=self._handle_update_rule,
+                                         delete_handler=self._handle_delete_rule,
+                                         queue_suffix='rules_index',
+                                         exclusive=True)
+        self._trigger_watcher = TriggerWatcher(create_handler=self._handle_create_trigger,
+                                               update_handler=self._handle_update_trigger,
+                                               delete_handler=self._handle_delete_trigger,
+                                               trigger_types=None,
+                                               queue_suffix='rules_index',
+                                               exclusive=True,
+                                               load_all_triggers=True)
+
+    def start(self):
+        # Note: Watchers are started before the rules are loaded from the database so no CUD
+        # event which happens while the rules are being loaded is lost.
+        self._loading = True
+        self._rule_watcher.start()
+        self._trigger_watcher.start()
+        self._load_rules_from_db()
+
+    def stop(self):
+        self._rule_watcher.stop()
+        self._trigger_watcher.stop()
+
+    def get_trigger_db(self, trigger_ref):
+        """
+        Retrieve TriggerDB object for the provided reference.
+
+        If trigger is not in the index yet (e.g. initial load hasn't finished yet), it's
+        retrieved from the database and added to the index.
+
+        :rtype: :class:`TriggerDB` or ``None``
+        """
+        trigger_db = self._triggers_by_ref.get(trigger_ref, None)
+
+        if not trigger_db:
+            trigger_db = get_trigger_db_by_ref(trigger_ref)
+
+            if trigger_db:
+                self._triggers_by_ref[trigger_ref] = trigger_db
+
+        return trigger_db
+
+    def get_rules_for_trigger(self, trigger_ref):
+        """
+        Retrieve all the enabled rules for the provided trigger reference.
+
+        :rtype: ``list`` of :class:`RuleDB`
+        """
+        compiled_rules = self.get_compiled_rules_for_trigger(trigger_ref=trigger_ref)
+        return [compiled_rule.rule for compiled_rule in compiled_rules]
+
+    def get_compiled_rules_for_trigger(self, trigger_ref):
+        """
+        Retrieve compiled versions of all the enabled rules for the provided trigger reference.
+
+        :rtype: ``list`` of :class:`CompiledRule`
+        """
+        compiled_rules = self._rules_by_trigger_ref.get(trigger_ref, None)
+
+        if not compiled_rules:
+            return []
+
+        return list(compiled_rules.values())
+
+    def get_rules_network(self, trigger_ref):
+        """
+        Retrieve discrimination network for all the enabled rules of the provided trigger.
+
+        :rtype: :class:`RulesNetwork`
+        """
+        network = self._networks_by_trigger_ref.get(trigger_ref, None)
+
+        if not network:
+            compiled_rules = self.get_compiled_rules_for_trigger(trigger_ref=trigger_ref)
+            network = RulesNetwork(rules=compiled_rules)
+            self._networks_by_trigger_ref[trigger_ref] = network
+
+        return network
+
+    def add_rule(self, rule_db):
+        # Rule could have been updated to reference a different trigger so we always remove
+        # a previous revision first
+        self.remove_rule(rule_db)
+
+        if not rule_db.enabled:
+            LOG.debug('Rule "%s" is disabled, not adding it to the index.', rule_db.ref)
+            return
+
+        rule_id = str(rule_db.id)
+        self._rules_by_trigger_ref[rule_db.trigger][rule_id] = CompiledRule(rule_db)
+        self._trigger_ref_by_rule_id[rule_id] = rule_db.trigger
+        self._networks_by_trigger_ref.pop(rule_db.trigger, None)
+
+    def remove_rule(self, rule_db):
+        rule_id = str(rule_db.id)
+        trigger_ref = self._trigger_ref_by_rule_id.pop(rule_id, None)
+
+        if not trigger_ref:
+            return
+
+        rules = self._rules_by_trigger_ref.get(trigger_ref, {})
+        rules.pop(rule_id, None)
+        self._networks_by_trigger_ref.pop(trigger_ref, None)
+
+        if not rules:
+            self._rules_by_trigger_ref.pop(trigger_ref, None)
+
+    def _load_rules_from_db(self):
+        self._loading = True
+
+        try:
+            rule_dbs = Rule.query(enabled=True)
+
+            for rule_db in rule_dbs:
+                rule_id = str(rule_db.id)
+
+                # Rule could have been already added, deleted or disabled by a watcher event in
+                # the mean time. In that case the event version is at least as new as the one
+                # loaded from the database.
+                if rule_id in self._trigger_ref_by_rule_id or rule_id in self._removed_rule_ids:
+                    continue
+
+                self.add_rule(rule_db)
+        finally:
+            self._loading = False
+            self._removed_rule_ids = set()
+
+        LOG.info('Loaded %s enabled rule(s) into the rules index.',
+                 len(self._trigger_ref_by_rule_id))
+
+    def _handle_create_rule(self, rule_db):
+        LOG.debug('Adding rule "%s" to the rules index.', rule_db.ref)
+        self.add_rule(rule_db)
+
+    def _handle_update_rule(self, rule_db):
+        LOG.debug('Updating rule "%s" in the rules index.', rule_db.ref)
+
+        if not rule_db.enabled:
+            self._record_removed_rule(rule_db)
+
+        self.add_rule(rule_db)
+
+    def _handle_delete_rule(self, rule_db):
+        LOG.debug('Removing rule "%s" from the rules index.', rule_db.ref)
+        self._record_removed_rule(rule_db)
+        self.remove_rule(rule_db)
+
+    def _record_removed_rule(self, rule_db):
+        if self._loading:
+            self._removed_rule_ids.add(str(rule_db.id))
+
+    def _handle_create_trigger(self, trigger_db):
+        self._triggers_by_ref[trigger_db.get_reference().ref] = trigger_db
+
+    def _handle_update_trigger(self, trigger_db):
+        self._triggers_by_ref[trigger_db.get_reference().ref] = trigger_db
+
+    def _handle_delete_trigger(self, trigger_db):
+        self._triggers_by_ref.pop(trigger_db.get_reference().ref, None)
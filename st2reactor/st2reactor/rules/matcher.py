@@ -14,34 +14,51 @@
 # limitations under the License.
 
 from st2common import log as logging
+from st2common.constants.keyvalue import FULL_SYSTEM_SCOPE
 from st2common.constants.rules import RULE_TYPE_BACKSTOP
+from st2common.services import keyvalues
+from st2reactor.rules.compiled import get_compiled_rule
 from st2reactor.rules.filter import RuleFilter, SecondPassRuleFilter
 
 LOG = logging.getLogger('st2reactor.rules.RulesMatcher')
 
 
 class RulesMatcher(object):
-    def __init__(self, trigger_instance, trigger, rules, extra_info=False):
+    def __init__(self, trigger_instance, trigger, rules, extra_info=False, rules_network=None):
+        """
+        :param rules: Rules to match. Items can either be RuleDB objects or already compiled
+                      rules.
+        :type rules: ``list`` of :class:`RuleDB` or :class:`CompiledRule`
+
+        :param rules_network: Optional discrimination network for the provided rules. If
+                              provided, it's used to prune rules which can't match before
+                              evaluating the criteria.
+        :type rules_network: :class:`st2reactor.rules.network.RulesNetwork`
+        """
         self.trigger_instance = trigger_instance
         self.trigger = trigger
-        self.rules = rules
+        self.rules = [get_compiled_rule(rule) for rule in rules]
         self.extra_info = extra_info
+        self.rules_network = rules_network
 
     def get_matching_rules(self):
         first_pass, second_pass = self._split_rules_into_passes()
+        self._prefetch_datastore_values(first_pass + second_pass)
         # first pass
         rule_filters = [RuleFilter(trigger_instance=self.trigger_instance,
                                    trigger=self.trigger,
-                                   rule=rule,
-                                   extra_info=self.extra_info)
-                        for rule in first_pass]
+                                   rule=compiled_rule.rule,
+                                   extra_info=self.extra_info,
+                                   compiled_rule=compiled_rule)
+                        for compiled_rule in first_pass]
         matched_rules = [rule_filter.rule for rule_filter in rule_filters if rule_filter.filter()]
         LOG.debug('[1st_pass] %d rule(s) found to enforce for %s.', len(matched_rules),
                   self.trigger['name'])
         # second pass
-        rule_filters = [SecondPassRuleFilter(self.trigger_instance, self.trigger, rule,
-                                             matched_rules)
-                        for rule in second_pass]
+        rule_filters = [SecondPassRuleFilter(self.trigger_instance, self.trigger,
+                                             compiled_rule.rule, matched_rules,
+                                             compiled_rule=compiled_rule)
+                        for compiled_rule in second_pass]
         matched_in_second_pass = [rule_filter.rule for rule_filter in rule_filters
                                   if rule_filter.filter()]
         LOG.debug('[2nd_pass] %d rule(s) found to enforce for %s.', len(matched_in_second_pass),
@@ -59,12 +76,30 @@ class RulesMatcher(object):
         """
         first_pass = []
         second_pass = []
-        for rule in self.rules:
-            if self._is_first_pass_rule(rule):
-                first_pass.append(rule)
+
+        if self.rules_network:
+            # Note: Pruned rules can't match so this doesn't affect the backstop rules semantics
+            rules = self.rules_network.get_candidate_rules(self.trigger_instance.payload)
+        else:
+            rules = self.rules
+
+        for compiled_rule in rules:
+            if self._is_first_pass_rule(compiled_rule.rule):
+                first_pass.append(compiled_rule)
             else:
-                second_pass.append(rule)
+                second_pass.append(compiled_rule)
         return first_pass, second_pass
 
+    def _prefetch_datastore_values(self, compiled_rules):
+        """
+        Populate the datastore cache with values for all the keys referenced by the rules using a
+        single query instead of a query per key and rule.
+        """
+        datastore_keys = set()
+        for compiled_rule in compiled_rules:
+            datastore_keys.update(compiled_rule.datastore_keys)
+
+        keyvalues.prefetch_values(scope=FULL_SYSTEM_SCOPE, names=datastore_keys)
+
     def _is_first_pass_rule(self, rule):
         return rule.type['ref'] != RULE_TYPE_BACKSTOP
@@ -0,0 +1,219 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+
+import six
+
+from st2common import log as logging
+import st2common.operators as criteria_operators
+from st2common.constants.rules import TRIGGER_PAYLOAD_PREFIX
+from st2reactor.rules.filter import PayloadLookup
+
+__all__ = [
+    'RulesNetwork'
+]
+
+LOG = logging.getLogger(__name__)
+
+# Operators which can be used to discriminate rules using a table lookup. Order in which they
+# are listed is also the order of preference when a rule has multiple suitable criteria.
+EQUALS = 'equals'
+IEQUALS = 'iequals'
+STARTSWITH = 'startswith'
+
+DISCRIMINATING_OPERATORS = collections.OrderedDict([
+    (criteria_operators.EQUALS_LONG, EQUALS),
+    (criteria_operators.EQUALS_SHORT, EQUALS),
+    (criteria_operators.IEQUALS_LONG, IEQUALS),
+    (criteria_operators.IEQUALS_SHORT, IEQUALS),
+    (criteria_operators.STARTSWITH_LONG, STARTSWITH)
+])
+
+DISCRIMINATION_PREFERENCE = [EQUALS, IEQUALS, STARTSWITH]
+
+# Static pattern types which can be used as a hash table key for the "equals" operator
+EQUALS_PATTERN_TYPES = six.string_types + six.integer_types + (float, bool)
+
+
+class KeyNode(object):
+    """
+    Discrimination node for a single payload key.
+
+    Node maps static criteria patterns to the positions of the rules which use them so the rules
+    which can't possibly match a payload value can be pruned with a single table lookup.
+    """
+
+    def __init__(self, key, lookup_expr):
+        self.key = key
+        self.lookup_expr = lookup_expr
+
+        self._equals = collections.defaultdict(list)
+        self._iequals = collections.defaultdict(list)
+        self._prefixes = collections.defaultdict(list)
+        self._prefix_lengths = set()
+
+        # Positions of all the rules which are discriminated by this node
+        self._positions = []
+
+    def add(self, operator, pattern, position):
+        if operator == EQUALS:
+            self._equals[pattern].append(position)
+        elif operator == IEQUALS:
+            self._iequals[pattern.lower()].append(position)
+        elif operator == STARTSWITH:
+            self._prefixes[pattern].append(position)
+            self._prefix_lengths.add(len(pattern))
+        else:
+            raise ValueError('Unsupported operator: %s' % (operator))
+
+        self._positions.append(position)
+
+    def get_candidates(self, payload_lookup):
+        """
+        Return positions of the rules which can match the payload value for this key.
+
+        :rtype: ``list`` of ``int``
+        """
+        try:
+            matches = payload_lookup.get_value(self.lookup_expr)
+        except Exception:
+            # Can't decide, let the filter evaluate (and log) it
+            return self._positions
+
+        # Note: Same value selection as in RuleFilter
+        value = matches[0] if matches else None
+
+        try:
+            candidates = list(self._equals.get(value, []))
+        except TypeError:
+            # Unhashable value, let the filter decide
+            candidates = [position for positions in self._equals.values()
+                          for position in positions]
+
+        # Case insensitive and prefix comparison only succeeds for string values
+        if not isinstance(value, six.string_types):
+            return candidates
+
+        candidates.extend(self._iequals.get(value.lower(), []))
+
+        for prefix_length in self._prefix_lengths:
+            candidates.extend(self._prefixes.get(value[:prefix_length], []))
+
+        return candidates
+
+
+class RulesNetwork(object):
+    """
+    Discrimination network which prunes the rules that can't match a trigger instance payload
+    before the full criteria evaluation.
+
+    Each rule which has at least one static "equals", "iequals" or "startswith" criterion on a
+    trigger payload key is indexed on one of those criteria. Rules which can't be indexed are
+    always returned as candidates. Candidates still go through the full criteria evaluation so
+    the matching result is the same as if all the rules were evaluated.
+    """
+
+    def __init__(self, rules):
+        """
+        :param rules: Compiled rules for a single trigger.
+        :type rules: ``list`` of :class:`CompiledRule`
+        """
+        self.rules = list(rules)
+
+        self._nodes = collections.OrderedDict()
+        self._unindexed_positions = []
+
+        for position, compiled_rule in enumerate(self.rules):
+            self._add_rule(position=position, compiled_rule=compiled_rule)
+
+    def get_candidate_rules(self, payload):
+        """
+        Return rules which can possibly match the provided payload.
+
+        Rules are returned in the same order as they were passed to the constructor.
+
+        :rtype: ``list`` of :class:`CompiledRule`
+        """
+        if not self._nodes:
+            return list(self.rules)
+
+        positions = set(self._unindexed_positions)
+
+        # Rules with criteria never match an empty payload (see RuleFilter.filter) and all the
+        # indexed rules have criteria
+        if payload:
+            payload_lookup = PayloadLookup(payload)
+
+            for node in self._nodes.values():
+                positions.update(node.get_candidates(payload_lookup))
+
+        candidates = [self.rules[position] for position in sorted(positions)]
+        LOG.debug('Network pruned %s rule(s) to %s candidate(s).', len(self.rules),
+                  len(candidates))
+        return candidates
+
+    def _add_rule(self, position, compiled_rule):
+        criterion, operator = self._get_discriminating_criterion(compiled_rule)
+
+        if not criterion:
+            self._unindexed_positions.append(position)
+            return
+
+        node = self._nodes.get(criterion.key, None)
+
+        if not node:
+            node = KeyNode(key=criterion.key, lookup_expr=criterion.lookup_expr)
+            self._nodes[criterion.key] = node
+
+        node.add(operator=operator, pattern=criterion.pattern, position=position)
+
+    def _get_discriminating_criterion(self, compiled_rule):
+        """
+        Select the criterion on which the rule is indexed.
+
+        :rtype: ``tuple`` (criterion, operator)
+        """
+        candidates = {}
+
+        for criterion in compiled_rule.criteria:
+            operator = self._get_discriminating_operator(criterion)
+
+            if operator and operator not in candidates:
+                candidates[operator] = criterion
+
+        for operator in DISCRIMINATION_PREFERENCE:
+            if operator in candidates:
+                return candidates[operator], operator
+
+        return None, None
+
+    def _get_discriminating_operator(self, criterion):
+        if not criterion.operator or criterion.is_templated or not criterion.lookup_expr:
+            return None
+
+        if not criterion.key.startswith(TRIGGER_PAYLOAD_PREFIX + '.'):
+            return None
+
+        operator = DISCRIMINATING_OPERATORS.get(criterion.operator.lower(), None)
+
+        if operator == EQUALS and isinstance(criterion.pattern, EQUALS_PATTERN_TYPES):
+            return operator
+
+        if operator in [IEQUALS, STARTSWITH] and \
+                isinstance(criterion.pattern, six.string_types):
+            return operator
+
+        return None
@@ -14,16 +14,20 @@
 # limitations under the License.
 
 from kombu import Connection
+from oslo_config import cfg
 
 from st2common import log as logging
 from st2common.constants.trace import TRACE_CONTEXT, TRACE_ID
 from st2common.constants import triggers as trigger_constants
 from st2common.util import date as date_utils
+from st2common.persistence.trigger import TriggerInstance
+from st2common.services import keyvalues
 from st2common.services import trace as trace_service
 from st2common.transport import consumers, reactor
 from st2common.transport import utils as transport_utils
 import st2reactor.container.utils as container_utils
 from st2reactor.rules.engine import RulesEngine
+from st2reactor.rules.index import RulesIndex
 
 
 LOG = logging.getLogger(__name__)
@@ -37,26 +41,88 @@ class TriggerInstanceDispatcher(consumers.StagedMessageHandler):
 
     def __init__(self, connection, queues):
         super(TriggerInstanceDispatcher, self).__init__(connection, queues)
-        self.rules_engine = RulesEngine()
+
+        if cfg.CONF.rulesengine.use_rules_index:
+            self.rules_index = RulesIndex()
+        else:
+            self.rules_index = None
+
+        self.rules_engine = RulesEngine(rules_index=self.rules_index)
+
+    def start(self, wait=False):
+        # Index needs to be populated before we start processing trigger instances
+        if self.rules_index:
+            self.rules_index.start()
+
+        keyvalues.setup_cache()
+
+        super(TriggerInstanceDispatcher, self).start(wait=wait)
+
+    def shutdown(self):
+        super(TriggerInstanceDispatcher, self).shutdown()
+
+        if self.rules_index:
+            self.rules_index.stop()
+
+        keyvalues.teardown_cache()
 
     def pre_ack_process(self, message):
         '''
         TriggerInstance from message is create prior to acknowledging the message. This
         gets us a way to not acknowledge messages.
         '''
-        trigger = message['trigger']
-        payload = message['payload']
+        trigger_instance = self._build_trigger_instance(message)
+        trigger_instance = TriggerInstance.add_or_update(trigger_instance)
+        return self._compose_pre_ack_process_response(trigger_instance, message)
+
+    def pre_ack_process_batch(self, messages):
+        '''
+        Same as pre_ack_process, but all the TriggerInstances for a batch of messages are created
+        using a single bulk insert.
 
+        If the bulk insert fails, TriggerInstances which haven't been inserted before the failure
+        are inserted one by one.
+        '''
+        trigger_instances = []
+        processed_messages = []
+        for message in messages:
+            try:
+                trigger_instance = self._build_trigger_instance(message)
+            except:
+                LOG.exception('Failed to create trigger_instance for message: %s', message)
+                continue
+
+            trigger_instances.append(trigger_instance)
+            processed_messages.append(message)
+
+        try:
+            TriggerInstance.insert_many(trigger_instances)
+        except:
+            LOG.exception('Failed to insert batch of %s trigger instances, inserting remaining '
+                          'trigger instances one by one.', len(trigger_instances))
+
+        responses = []
+        for trigger_instance, message in zip(trigger_instances, processed_messages):
+            if not trigger_instance.id:
+                try:
+                    trigger_instance = TriggerInstance.add_or_update(trigger_instance)
+                except:
+                    LOG.exception('Failed to create trigger_instance for message: %s', message)
+                    continue
+
+            responses.append(self._compose_pre_ack_process_response(trigger_instance, message))
+
+        return responses
+
+    def _build_trigger_instance(self, message):
         # Accomodate for not being able to create a TrigegrInstance if a TriggerDB
         # is not found.
-        trigger_instance = container_utils.create_trigger_instance(
-            trigger,
-            payload or {},
+        return container_utils.build_trigger_instance(
+            message['trigger'],
+            message['payload'] or {},
             date_utils.get_datetime_utc_now(),
             raise_on_no_trigger=True)
 
-        return self._compose_pre_ack_process_response(trigger_instance, message)
-
     def process(self, pre_ack_response):
 
         trigger_instance, message = self._decompose_pre_ack_process_response(pre_ack_response)
@@ -109,6 +175,12 @@ class TriggerInstanceDispatcher(consumers.StagedMessageHandler):
         """
         return response.get('trigger_instance', None), response.get('message', None)
 
+    def get_queue_consumer(self, connection, queues):
+        return consumers.StagedQueueConsumer(
+            connection=connection, queues=queues, handler=self,
+            batch_size=cfg.CONF.rulesengine.batch_size,
+            batch_flush_interval=cfg.CONF.rulesengine.batch_flush_interval)
+
 
 def get_worker():
     with Connection(transport_utils.get_messaging_urls()) as conn:
@@ -0,0 +1,118 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bson
+import mock
+import unittest2
+
+from st2common.models.db.rule import RuleDB
+from st2common.models.db.trigger import TriggerDB, TriggerInstanceDB
+from st2common.util import date as date_utils
+from st2reactor.rules import filter as filter_module
+from st2reactor.rules.compiled import CompiledRule
+from st2reactor.rules.compiled import is_templated
+from st2reactor.rules.filter import RuleFilter
+
+__all__ = [
+    'CompiledRuleTestCase'
+]
+
+MOCK_TRIGGER = TriggerDB(pack='dummy_pack_1', name='trigger-test.name', type='system.test')
+
+MOCK_TRIGGER_INSTANCE = TriggerInstanceDB(
+    trigger=MOCK_TRIGGER.get_reference().ref,
+    occurrence_time=date_utils.get_datetime_utc_now(),
+    payload={
+        'p1': 'v1',
+        'p2': 'preYYYpost',
+        'int': 1
+    }
+)
+
+
+def _get_rule_db(criteria):
+    return RuleDB(id=bson.ObjectId(), pack='wolfpack', name='some1',
+                  trigger=MOCK_TRIGGER.get_reference().ref, criteria=criteria)
+
+
+class CompiledRuleTestCase(unittest2.TestCase):
+
+    def test_is_templated(self):
+        self.assertTrue(is_templated('{{ trigger.p1 }}'))
+        self.assertTrue(is_templated('pre{% if True %}post{% endif %}'))
+        self.assertTrue(is_templated('value\n'))
+        self.assertFalse(is_templated('v1'))
+        self.assertFalse(is_templated('{ "a": 1 }'))
+        self.assertFalse(is_templated(1))
+        self.assertFalse(is_templated(None))
+
+    def test_criteria_are_compiled_once(self):
+        rule = _get_rule_db(criteria={
+            'trigger.p1': {'type': 'regex', 'pattern': '^v1$'},
+            'trigger.p2': {'type': 'equals', 'pattern': 'pre{{trigger.p1}}post'},
+            'trigger.int': {'type': 'equals', 'pattern': 1}
+        })
+        compiled_rule = CompiledRule(rule)
+        criteria = dict([(criterion.key, criterion) for criterion in compiled_rule.criteria])
+
+        self.assertTrue(criteria['trigger.p1'].lookup_expr is not None)
+        self.assertFalse(criteria['trigger.p1'].is_templated)
+        self.assertEqual(criteria['trigger.p1'].compiled_pattern.pattern, '^v1$')
+
+        self.assertTrue(criteria['trigger.p2'].is_templated)
+        self.assertEqual(criteria['trigger.p2'].compiled_pattern, None)
+        self.assertEqual(criteria['trigger.p2'].complex_pattern,
+                         'pre{{trigger.p1 | to_complex}}post')
+
+        self.assertFalse(criteria['trigger.int'].is_templated)
+        self.assertEqual(criteria['trigger.int'].compiled_pattern, None)
+
+    def test_datastore_keys(self):
+        rule = _get_rule_db(criteria={
+            'trigger.p1': {'type': 'equals', 'pattern': '{{ st2kv.system.k1 }}'},
+            'trigger.p2': {'type': 'equals', 'pattern': 'pre{{ st2kv.system.a.b }}post'},
+            'trigger.int': {'type': 'equals', 'pattern': 'st2kv.system.k2'}
+        })
+        compiled_rule = CompiledRule(rule)
+
+        self.assertEqual(compiled_rule.datastore_keys, set(['k1', 'a', 'a.b']))
+
+    @mock.patch.object(filter_module, 'render_template_with_system_context')
+    @mock.patch.object(filter_module, 'parse')
+    def test_static_patterns_are_not_rendered(self, mock_parse, mock_render):
+        rule = _get_rule_db(criteria={
+            'trigger.p1': {'type': 'equals', 'pattern': 'v1'},
+            'trigger.p2': {'type': 'iregex', 'pattern': 'yyy'}
+        })
+        compiled_rule = CompiledRule(rule)
+
+        for _ in range(0, 2):
+            rule_filter = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule,
+                                     compiled_rule=compiled_rule)
+            self.assertTrue(rule_filter.filter())
+
+        self.assertFalse(mock_render.called)
+        self.assertFalse(mock_parse.called)
+
+    def test_invalid_regex_pattern_doesnt_match(self):
+        rule = _get_rule_db(criteria={
+            'trigger.p1': {'type': 'regex', 'pattern': '(v1'}
+        })
+        compiled_rule = CompiledRule(rule)
+        self.assertEqual(compiled_rule.criteria[0].compiled_pattern, None)
+
+        rule_filter = RuleFilter(MOCK_TRIGGER_INSTANCE, MOCK_TRIGGER, rule,
+                                 compiled_rule=compiled_rule)
+        self.assertFalse(rule_filter.filter())
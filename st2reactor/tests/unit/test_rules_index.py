@@ -0,0 +1,146 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bson
+import mock
+import unittest2
+
+from st2common.models.db.rule import RuleDB
+from st2common.models.db.trigger import TriggerDB
+from st2reactor.rules import index as index_module
+from st2reactor.rules.engine import RulesEngine
+from st2reactor.rules.index import RulesIndex
+
+__all__ = [
+    'RulesIndexTestCase'
+]
+
+TRIGGER_1 = TriggerDB(pack='dummy_pack_1', name='trigger1', type='dummy_pack_1.trigger_type1')
+TRIGGER_2 = TriggerDB(pack='dummy_pack_1', name='trigger2', type='dummy_pack_1.trigger_type1')
+
+
+def _get_rule_db(name, trigger, enabled=True):
+    return RuleDB(id=bson.ObjectId(), pack='dummy_pack_1', name=name, trigger=trigger,
+                  enabled=enabled, criteria={})
+
+
+class RulesIndexTestCase(unittest2.TestCase):
+
+    def test_add_update_and_remove_rule(self):
+        rules_index = RulesIndex()
+
+        rule_1 = _get_rule_db(name='rule1', trigger=TRIGGER_1.ref)
+        rule_2 = _get_rule_db(name='rule2', trigger=TRIGGER_1.ref)
+        rules_index._handle_create_rule(rule_1)
+        rules_index._handle_create_rule(rule_2)
+
+        rules = rules_index.get_rules_for_trigger(trigger_ref=TRIGGER_1.ref)
+        self.assertEqual([rule.name for rule in rules], ['rule1', 'rule2'])
+        self.assertEqual(rules_index.get_rules_for_trigger(trigger_ref=TRIGGER_2.ref), [])
+
+        # Rule moved to a different trigger
+        rule_1.trigger = TRIGGER_2.ref
+        rules_index._handle_update_rule(rule_1)
+
+        rules = rules_index.get_rules_for_trigger(trigger_ref=TRIGGER_1.ref)
+        self.assertEqual([rule.name for rule in rules], ['rule2'])
+        rules = rules_index.get_rules_for_trigger(trigger_ref=TRIGGER_2.ref)
+        self.assertEqual([rule.name for rule in rules], ['rule1'])
+
+        # Disabled rule is removed from the index
+        rule_2.enabled = False
+        rules_index._handle_update_rule(rule_2)
+        self.assertEqual(rules_index.get_rules_for_trigger(trigger_ref=TRIGGER_1.ref), [])
+
+        rules_index._handle_delete_rule(rule_1)
+        self.assertEqual(rules_index.get_rules_for_trigger(trigger_ref=TRIGGER_2.ref), [])
+
+    @mock.patch.object(index_module, 'get_trigger_db_by_ref', mock.MagicMock(return_value=None))
+    def test_trigger_handlers(self):
+        rules_index = RulesIndex()
+
+        rules_index._handle_create_trigger(TRIGGER_1)
+        self.assertEqual(rules_index.get_trigger_db(trigger_ref=TRIGGER_1.ref), TRIGGER_1)
+
+        rules_index._handle_delete_trigger(TRIGGER_1)
+        self.assertEqual(rules_index.get_trigger_db(trigger_ref=TRIGGER_1.ref), None)
+
+    @mock.patch.object(index_module, 'get_trigger_db_by_ref',
+                       mock.MagicMock(return_value=TRIGGER_2))
+    def test_get_trigger_db_falls_back_to_db(self):
+        rules_index = RulesIndex()
+
+        self.assertEqual(rules_index.get_trigger_db(trigger_ref=TRIGGER_2.ref), TRIGGER_2)
+        self.assertEqual(index_module.get_trigger_db_by_ref.call_count, 1)
+
+        # Second lookup is served from the index
+        self.assertEqual(rules_index.get_trigger_db(trigger_ref=TRIGGER_2.ref), TRIGGER_2)
+        self.assertEqual(index_module.get_trigger_db_by_ref.call_count, 1)
+
+    @mock.patch.object(index_module.Rule, 'query')
+    def test_load_rules_from_db_doesnt_override_watcher_updates(self, mock_query):
+        rules_index = RulesIndex()
+
+        rule_1 = _get_rule_db(name='rule1', trigger=TRIGGER_1.ref)
+        rule_1_updated = _get_rule_db(name='rule1', trigger=TRIGGER_2.ref)
+        rule_1_updated.id = rule_1.id
+        rules_index._handle_update_rule(rule_1_updated)
+
+        mock_query.return_value = [rule_1]
+        rules_index._load_rules_from_db()
+
+        self.assertEqual(rules_index.get_rules_for_trigger(trigger_ref=TRIGGER_1.ref), [])
+        rules = rules_index.get_rules_for_trigger(trigger_ref=TRIGGER_2.ref)
+        self.assertEqual(rules, [rule_1_updated])
+
+    @mock.patch.object(index_module.Rule, 'query')
+    def test_load_rules_from_db_skips_rules_removed_during_load(self, mock_query):
+        rules_index = RulesIndex()
+        rules_index._loading = True
+
+        rule_1 = _get_rule_db(name='rule1', trigger=TRIGGER_1.ref)
+        rule_2 = _get_rule_db(name='rule2', trigger=TRIGGER_1.ref)
+        rule_3 = _get_rule_db(name='rule3', trigger=TRIGGER_1.ref)
+
+        # Events received after the load query has been issued but before it's applied
+        rules_index._handle_delete_rule(rule_1)
+        rule_2_disabled = _get_rule_db(name='rule2', trigger=TRIGGER_1.ref, enabled=False)
+        rule_2_disabled.id = rule_2.id
+        rules_index._handle_update_rule(rule_2_disabled)
+
+        mock_query.return_value = [rule_1, rule_2, rule_3]
+        rules_index._load_rules_from_db()
+
+        rules = rules_index.get_rules_for_trigger(trigger_ref=TRIGGER_1.ref)
+        self.assertEqual(rules, [rule_3])
+        self.assertFalse(rules_index._loading)
+        self.assertEqual(rules_index._removed_rule_ids, set())
+
+        # Once loaded, removals are not tracked anymore
+        rules_index._handle_delete_rule(rule_3)
+        self.assertEqual(rules_index._removed_rule_ids, set())
+
+    @mock.patch('st2reactor.rules.engine.get_rules_given_trigger')
+    @mock.patch('st2reactor.rules.engine.get_trigger_db_by_ref')
+    def test_rules_engine_uses_index(self, mock_get_trigger_db, mock_get_rules):
+        rules_index = RulesIndex()
+        rules_index._handle_create_trigger(TRIGGER_1)
+
+        trigger_instance = mock.Mock(trigger=TRIGGER_1.ref, payload={})
+        rules_engine = RulesEngine(rules_index=rules_index)
+        self.assertEqual(rules_engine.get_matching_rules_for_trigger(trigger_instance), [])
+
+        self.assertFalse(mock_get_trigger_db.called)
+        self.assertFalse(mock_get_rules.called)
@@ -0,0 +1,111 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+
+import bson
+import unittest2
+
+from st2common.constants.rules import RULE_TYPE_BACKSTOP
+from st2common.models.db.rule import RuleDB, RuleTypeSpecDB
+from st2common.models.db.trigger import TriggerDB, TriggerInstanceDB
+from st2common.util import date as date_utils
+from st2reactor.rules.compiled import CompiledRule
+from st2reactor.rules.matcher import RulesMatcher
+from st2reactor.rules.network import RulesNetwork
+
+__all__ = [
+    'RulesNetworkTestCase'
+]
+
+MOCK_TRIGGER = TriggerDB(pack='dummy_pack_1', name='trigger-test.name', type='system.test')
+
+VALUES = ['foo', 'FOO', 'foobar', 'bar', 'Bar', 1, 1.0, True, None, ['foo'], {'a': 'foo'}]
+
+
+def _get_rule_db(name, criteria, rule_type='standard'):
+    return RuleDB(id=bson.ObjectId(), pack='wolfpack', name=name,
+                  trigger=MOCK_TRIGGER.get_reference().ref, criteria=criteria,
+                  type=RuleTypeSpecDB(ref=rule_type))
+
+
+def _get_trigger_instance(payload):
+    return TriggerInstanceDB(trigger=MOCK_TRIGGER.get_reference().ref,
+                             occurrence_time=date_utils.get_datetime_utc_now(),
+                             payload=payload)
+
+
+class RulesNetworkTestCase(unittest2.TestCase):
+
+    def test_rules_are_pruned_using_key_tables(self):
+        rules = [
+            _get_rule_db('equals_foo', {'trigger.k1': {'type': 'equals', 'pattern': 'foo'}}),
+            _get_rule_db('equals_bar', {'trigger.k1': {'type': 'eq', 'pattern': 'bar'}}),
+            _get_rule_db('iequals_bar', {'trigger.k1': {'type': 'iequals', 'pattern': 'BAR'}}),
+            _get_rule_db('startswith_fo', {'trigger.k2': {'type': 'startswith', 'pattern': 'fo'}}),
+            _get_rule_db('regex', {'trigger.k1': {'type': 'regex', 'pattern': '.*'}}),
+            _get_rule_db('templated', {'trigger.k1': {'type': 'equals',
+                                                      'pattern': '{{ trigger.k2 }}'}})
+        ]
+        network = RulesNetwork(rules=[CompiledRule(rule) for rule in rules])
+
+        candidates = network.get_candidate_rules({'k1': 'bar', 'k2': 'foobar'})
+        self.assertEqual([rule.rule.name for rule in candidates],
+                         ['equals_bar', 'iequals_bar', 'startswith_fo', 'regex', 'templated'])
+
+        candidates = network.get_candidate_rules({'k1': 'foo'})
+        self.assertEqual([rule.rule.name for rule in candidates],
+                         ['equals_foo', 'regex', 'templated'])
+
+        candidates = network.get_candidate_rules({})
+        self.assertEqual([rule.rule.name for rule in candidates], ['regex', 'templated'])
+
+    def test_matching_results_are_identical_to_linear_evaluation(self):
+        random.seed(42)
+
+        operators = ['equals', 'eq', 'iequals', 'ieq', 'startswith', 'nequals', 'contains',
+                     'exists', 'regex']
+        patterns = ['foo', 'FOO', 'fo', 'bar', 1, True, None, '^f']
+
+        rules = []
+        for index in range(0, 200):
+            criteria = {}
+            for key in random.sample(['trigger.k1', 'trigger.k2', 'trigger.k3'],
+                                     random.randint(0, 2)):
+                criteria[key] = {'type': random.choice(operators),
+                                 'pattern': random.choice(patterns)}
+
+            rule_type = RULE_TYPE_BACKSTOP if index % 50 == 0 else 'standard'
+            rules.append(_get_rule_db('rule%s' % (index), criteria, rule_type=rule_type))
+
+        compiled_rules = [CompiledRule(rule) for rule in rules]
+        network = RulesNetwork(rules=compiled_rules)
+
+        for _ in range(0, 50):
+            payload = {}
+            for key in random.sample(['k1', 'k2', 'k3'], random.randint(0, 3)):
+                payload[key] = random.choice(VALUES)
+
+            trigger_instance = _get_trigger_instance(payload=payload)
+
+            matcher = RulesMatcher(trigger_instance=trigger_instance, trigger=MOCK_TRIGGER,
+                                   rules=compiled_rules)
+            expected = [rule.name for rule in matcher.get_matching_rules()]
+
+            matcher = RulesMatcher(trigger_instance=trigger_instance, trigger=MOCK_TRIGGER,
+                                   rules=compiled_rules, rules_network=network)
+            actual = [rule.name for rule in matcher.get_matching_rules()]
+
+            self.assertEqual(actual, expected, 'Mismatch for payload: %s' % (payload))
@@ -0,0 +1,126 @@
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+import mock
+from kombu import Connection
+from oslo_config import cfg
+
+from st2common.models.db.trigger import TriggerDB
+from st2common.persistence.trigger import Trigger
+from st2common.persistence.trigger import TriggerInstance
+from st2common.transport.publishers import PoolPublisher
+from st2common.util import date as date_utils
+from st2common.util.greenpooldispatch import BufferedDispatcher
+from st2reactor.rules import worker
+from st2tests.base import CleanDbTestCase
+
+
+@mock.patch.object(PoolPublisher, 'publish', mock.MagicMock())
+class TriggerInstanceDispatcherBatchTestCase(CleanDbTestCase):
+    def setUp(self):
+        super(TriggerInstanceDispatcherBatchTestCase, self).setUp()
+
+        cfg.CONF.set_override(name='batch_size', override=3, group='rulesengine')
+        cfg.CONF.set_override(name='batch_flush_interval', override=60, group='rulesengine')
+        cfg.CONF.set_override(name='use_rules_index', override=False, group='rulesengine')
+
+        trigger_db = TriggerDB(name='name1', pack='pack1', type='pack1.type1', parameters={})
+        self.trigger_db = Trigger.add_or_update(trigger_db, publish=False)
+
+    def tearDown(self):
+        super(TriggerInstanceDispatcherBatchTestCase, self).tearDown()
+
+        cfg.CONF.clear_override(name='batch_size', group='rulesengine')
+        cfg.CONF.clear_override(name='batch_flush_interval', group='rulesengine')
+        cfg.CONF.clear_override(name='use_rules_index', group='rulesengine')
+
+    def _process_batch(self, dispatcher):
+        channel = mock.MagicMock()
+        consumer = dispatcher._queue_consumer
+
+        for index in range(0, 3):
+            body = {'trigger': self.trigger_db.ref, 'payload': {'index': index}}
+            consumer.process(body, mock.MagicMock(channel=channel, delivery_tag=index))
+
+        return channel
+
+    @mock.patch.object(BufferedDispatcher, 'dispatch', mock.MagicMock())
+    def test_process_batch(self):
+        dispatcher = worker.TriggerInstanceDispatcher(Connection('memory://'),
+                                                      [worker.RULESENGINE_WORK_Q])
+
+        with mock.patch.object(TriggerInstance, 'insert_many',
+                               mock.MagicMock(wraps=TriggerInstance.insert_many)) as insert_many:
+            channel = self._process_batch(dispatcher)
+
+        # All the trigger instances are inserted at once and all the messages are acked at once
+        self.assertEqual(insert_many.call_count, 1)
+        self.assertEqual(len(TriggerInstance.get_all()), 3)
+        channel.basic_ack.assert_called_once_with(2, multiple=True)
+
+        self.assertEqual(BufferedDispatcher.dispatch.call_count, 3)
+        responses = [call[0][1] for call in BufferedDispatcher.dispatch.call_args_list]
+        payloads = [response['trigger_instance'].payload for response in responses]
+        self.assertEqual(payloads, [{'index': 0}, {'index': 1}, {'index': 2}])
+
+    @mock.patch.object(BufferedDispatcher, 'dispatch', mock.MagicMock())
+    @mock.patch.object(TriggerInstance, 'insert_many', mock.MagicMock(side_effect=Exception()))
+    def test_process_batch_bulk_insert_failure(self):
+        dispatcher = worker.TriggerInstanceDispatcher(Connection('memory://'),
+                                                      [worker.RULESENGINE_WORK_Q])
+
+        channel = self._process_batch(dispatcher)
+
+        # Trigger instances are inserted one by one if the bulk insert fails
+        self.assertEqual(len(TriggerInstance.get_all()), 3)
+        channel.basic_ack.assert_called_once_with(2, multiple=True)
+        self.assertEqual(BufferedDispatcher.dispatch.call_count, 3)
+
+    @mock.patch.object(BufferedDispatcher, 'dispatch', mock.MagicMock())
+    def test_process_batch_partial_bulk_insert_failure(self):
+        dispatcher = worker.TriggerInstanceDispatcher(Connection('memory://'),
+                                                      [worker.RULESENGINE_WORK_Q])
+        insert_many = TriggerInstance.insert_many
+
+        def mock_insert_many(trigger_instances):
+            # Ordered bulk insert which fails after inserting the first object
+            insert_many(trigger_instances[:1])
+            raise Exception('insert failed')
+
+        now = date_utils.get_datetime_utc_now()
+        times = [now + datetime.timedelta(seconds=index) for index in range(0, 3)]
+
+        with mock.patch.object(TriggerInstance, 'insert_many',
+                               mock.MagicMock(side_effect=mock_insert_many)):
+            with mock.patch.object(worker.date_utils, 'get_datetime_utc_now',
+                                   mock.MagicMock(side_effect=times)):
+                channel = self._process_batch(dispatcher)
+
+        # Only the trigger instances which haven't been inserted are inserted again
+        trigger_instances = TriggerInstance.get_all()
+        self.assertEqual(len(trigger_instances), 3)
+        payloads = sorted([trigger_instance.payload['index']
+                           for trigger_instance in trigger_instances])
+        self.assertEqual(payloads, [0, 1, 2])
+        channel.basic_ack.assert_called_once_with(2, multiple=True)
+        self.assertEqual(BufferedDispatcher.dispatch.call_count, 3)
+
+        # Each trigger instance has its own occurrence time
+        responses = [call[0][1] for call in BufferedDispatcher.dispatch.call_args_list]
+        occurrence_times = [response['trigger_instance'].occurrence_time
+                            for response in responses]
+        self.assertEqual(occurrence_times, times)
@@ -55,6 +55,19 @@ def _register_app_opts():
                    help='Send empty message every N seconds to keep connection open'),
         cfg.BoolOpt('debug', default=False,
                     help='Specify to enable debug mode.'),
+        cfg.IntOpt('max_queue_size', default=1000,
+                   help='Maximum number of events buffered for a single client. 0 means no '
+                        'limit.'),
+        cfg.StrOpt('queue_overflow_policy', default='drop_oldest',
+                   choices=['drop_oldest', 'coalesce', 'disconnect'],
+                   help='What to do when the client queue is full - drop the oldest event, '
+                        'replace queued update of the same object or close the connection.'),
+        cfg.IntOpt('replay_buffer_size', default=1000,
+                   help='Number of recent events kept in memory and replayed to the clients '
+                        'which reconnect with Last-Event-ID header.'),
+        cfg.IntOpt('stats_log_interval', default=60,
+                   help='Log queue depth and dropped event counts of the connected clients every '
+                        'N seconds. 0 disables it.'),
         cfg.StrOpt('logging', default='conf/logging.conf',
                    help='location of the logging.conf file')
     ]
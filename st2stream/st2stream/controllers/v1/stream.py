@@ -14,33 +14,61 @@
 # limitations under the License.
 
 import six
+from six.moves import http_client
 
 from st2common import log as logging
+from st2common.router import abort
 from st2common.router import Response
-from st2common.util.jsonify import json_encode
 from st2stream.listener import get_listener
 
 LOG = logging.getLogger(__name__)
 
 
 def format(gen):
-    message = '''event: %s\ndata: %s\n\n'''
-
-    for pack in gen:
-        if not pack:
+    for frame in gen:
+        if not frame:
             # Note: gunicorn wsgi handler expect bytes, not unicode
             yield six.binary_type('\n')
         else:
-            (event, body) = pack
-            # Note: gunicorn wsgi handler expect bytes, not unicode
-            yield six.binary_type(message % (event, json_encode(body, indent=None)))
+            # Listener already serialized the event into a frame
+            yield frame
 
 
 class StreamController(object):
-    def get_all(self):
+    def get_all(self, events=None, action_ref=None, user=None, status=None, execution_id=None,
+                max_result_size=None, last_event_id=None):
+        """
+        Stream events. Filter arguments are comma separated lists of values and only the events
+        which match all the provided filters are sent to the client.
+
+        Client which reconnects with the Last-Event-ID header first receives the events it has
+        missed in the meantime.
+        """
+        filters = {
+            'events': _split(events),
+            'action_ref': _split(action_ref),
+            'user': _split(user),
+            'status': _split(status),
+            'execution_id': _split(execution_id)
+        }
+
+        if max_result_size is not None:
+            try:
+                max_result_size = int(max_result_size)
+            except ValueError:
+                abort(http_client.BAD_REQUEST, 'max_result_size needs to be an integer')
+
+        if last_event_id is not None:
+            try:
+                last_event_id = int(last_event_id)
+            except ValueError:
+                abort(http_client.BAD_REQUEST, 'Last-Event-ID needs to be an integer')
+
         def make_response():
-            res = Response(content_type='text/event-stream',
-                           app_iter=format(get_listener().generator()))
+            app_iter = format(get_listener().generator(filters=filters,
+                                                       max_result_size=max_result_size,
+                                                       last_event_id=last_event_id))
+            res = Response(content_type='text/event-stream', app_iter=app_iter)
             return res
 
         stream = make_response()
@@ -48,4 +76,11 @@ class StreamController(object):
         return stream
 
 
+def _split(value):
+    if not value:
+        return []
+
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
 stream_controller = StreamController()
@@ -13,7 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import time
+
 import eventlet
+import six
 
 from kombu import Connection, Queue
 from kombu.mixins import ConsumerMixin
@@ -23,25 +27,255 @@ from st2common.models.api.action import LiveActionAPI
 from st2common.models.api.execution import ActionExecutionAPI
 from st2common.transport import announcement, liveaction, execution, publishers
 from st2common.transport import utils as transport_utils
+from st2common.util.jsonify import json_encode
 from st2common import log as logging
 
 __all__ = [
     'get_listener',
-    'get_listener_if_set'
+    'get_listener_if_set',
+
+    'encode_event',
+
+    'Subscription'
 ]
 
 LOG = logging.getLogger(__name__)
 
+EVENT_FORMAT = 'event: %s\ndata: %s\n\n'
+EVENT_ID_FORMAT = 'id: %s\n'
+
+# Attributes of an event subscribers can filter on
+FILTER_NAMES = [
+    'events',
+    'action_ref',
+    'user',
+    'status',
+    'execution_id'
+]
+
+# Policies applied when the client queue is full
+OVERFLOW_POLICY_DROP_OLDEST = 'drop_oldest'
+OVERFLOW_POLICY_COALESCE = 'coalesce'
+OVERFLOW_POLICY_DISCONNECT = 'disconnect'
+
+OVERFLOW_POLICIES = [
+    OVERFLOW_POLICY_DROP_OLDEST,
+    OVERFLOW_POLICY_COALESCE,
+    OVERFLOW_POLICY_DISCONNECT
+]
+
+# Event sent to the client right before the connection is closed because the client couldn't
+# keep up with the event rate
+OVERFLOW_EVENT = 'st2.stream__overflow'
+
+# Event sent to the reconnecting client when the events it missed are no longer available in the
+# replay buffer and the client needs to re-read the state from the API
+RESYNC_EVENT = 'st2.stream__resync'
+
+# Marks the position in the client queue at which the connection should be closed
+OVERFLOW_MARKER = object()
+
+# Replaces frame of the queue entry which has been discarded when coalescing
+DISCARDED_MARKER = object()
+
 _listener = None
 
 
+class Subscription(object):
+    """
+    Stream client subscription.
+
+    Subscription only receives the events which match all of its filters. Filter with no values
+    matches all the events.
+
+    Event frames are buffered in a per-client queue which holds at most ``max_queue_size``
+    frames. Once the queue is full, the provided overflow policy decides what happens with the
+    new frames:
+
+    * drop_oldest - the oldest queued frame is discarded.
+    * coalesce - if an object the new frame updates already has a frame waiting in the queue,
+      that (stale) frame is discarded. The new frame is added at the end of the queue so frames
+      are always sent in the event id order. If there is nothing to coalesce with, the oldest
+      queued frame is discarded.
+    * disconnect - all the queued frames are discarded and the client is sent an overflow event
+      after which the connection is closed. Client can reconnect and resume from there.
+    """
+
+    def __init__(self, filters=None, max_result_size=None, max_queue_size=None,
+                 overflow_policy=OVERFLOW_POLICY_DROP_OLDEST):
+        """
+        :param filters: Maps filter name (one of FILTER_NAMES) to a list of allowed values.
+        :type filters: ``dict``
+
+        :param max_result_size: If provided, "result" field of the events is omitted (0) or
+                                truncated to the provided number of characters.
+        :type max_result_size: ``int``
+
+        :param max_queue_size: Maximum number of frames waiting to be sent to the client. 0 or
+                               None means no limit.
+        :type max_queue_size: ``int``
+
+        :param overflow_policy: Policy applied when the queue is full (one of OVERFLOW_POLICIES).
+        :type overflow_policy: ``str``
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError('Invalid overflow policy "%s". Valid policies are: %s' %
+                             (overflow_policy, ', '.join(OVERFLOW_POLICIES)))
+
+        self.filters = dict([(name, set(values)) for name, values in six.iteritems(filters or {})
+                             if values])
+        self.max_result_size = max_result_size
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+
+        # Queue items are mutable [coalesce_key, frame] entries so the queued frame can be
+        # discarded when the policy is "coalesce"
+        self.queue = eventlet.queue.LightQueue()
+        self._pending = {}
+        self._discarded = 0
+
+        self.overflowed = False
+        self.dropped = 0
+        self.coalesced = 0
+
+    def matches(self, values):
+        """
+        Return True if the provided filter values (see get_filter_values) match all the
+        subscription filters.
+        """
+        for name, allowed in six.iteritems(self.filters):
+            if values.get(name, None) not in allowed:
+                return False
+
+        return True
+
+    def put(self, frame, coalesce_key=None):
+        """
+        Add frame to the queue, applying overflow policy if the queue is full.
+
+        :param coalesce_key: Key identifying the object the frame updates. Queued frame with the
+                             same key is replaced when the policy is "coalesce".
+        :type coalesce_key: ``str``
+        """
+        if self.overflowed:
+            self.dropped += 1
+            return
+
+        coalesce = coalesce_key is not None and \
+            self.overflow_policy == OVERFLOW_POLICY_COALESCE
+
+        if self.max_queue_size and self._get_queue_size() >= self.max_queue_size:
+            if self.overflow_policy == OVERFLOW_POLICY_DISCONNECT:
+                self._overflow()
+                return
+
+            entry = self._pending.get(coalesce_key, None) if coalesce else None
+
+            if entry is not None:
+                self._discard(entry)
+                self.coalesced += 1
+            else:
+                self._drop_oldest()
+
+        entry = [coalesce_key if coalesce else None, frame]
+        if coalesce:
+            self._pending[coalesce_key] = entry
+
+        self.queue.put(entry)
+
+    def get(self, timeout=None):
+        """
+        Retrieve next frame from the queue.
+
+        :raises: :class:`eventlet.queue.Empty` if no frame is available within the timeout.
+        """
+        while True:
+            entry = self.queue.get(timeout=timeout)
+
+            if entry[1] is DISCARDED_MARKER:
+                self._discarded -= 1
+                continue
+
+            self._forget(entry)
+            return entry[1]
+
+    def get_stats(self):
+        return {
+            'queue_size': self._get_queue_size(),
+            'dropped': self.dropped,
+            'coalesced': self.coalesced
+        }
+
+    def _get_queue_size(self):
+        return self.queue.qsize() - self._discarded
+
+    def _discard(self, entry):
+        entry[1] = DISCARDED_MARKER
+        self._discarded += 1
+        self._forget(entry)
+
+    def _drop_oldest(self):
+        while True:
+            try:
+                entry = self.queue.get_nowait()
+            except eventlet.queue.Empty:
+                return
+
+            if entry[1] is not DISCARDED_MARKER:
+                break
+
+            self._discarded -= 1
+
+        self._forget(entry)
+
+        if not self.dropped:
+            LOG.warning('Stream client queue is full, dropping events (filters=%s)',
+                        self.filters)
+        self.dropped += 1
+
+    def _overflow(self):
+        LOG.warning('Stream client queue is full, closing the connection (filters=%s)',
+                    self.filters)
+
+        # Queued frames and the new frame are all dropped, client is expected to reconnect
+        while self.queue.qsize():
+            entry = self.queue.get_nowait()
+            if entry[1] is not DISCARDED_MARKER:
+                self.dropped += 1
+
+        self.dropped += 1
+        self._pending = {}
+        self._discarded = 0
+
+        self.overflowed = True
+        self.queue.put([None, OVERFLOW_MARKER])
+
+    def _forget(self, entry):
+        key = entry[0]
+        if key is not None and self._pending.get(key, None) is entry:
+            del self._pending[key]
+
+
 class Listener(ConsumerMixin):
 
     def __init__(self, connection):
         self.connection = connection
-        self.queues = []
+        self.subscriptions = []
         self._stopped = False
 
+        # Maps filter name to a dict which maps filter value to subscriptions which filter on it
+        self._filter_index = dict([(name, {}) for name in FILTER_NAMES])
+
+        # Maps filter name to subscriptions which don't filter on that attribute
+        self._unfiltered = dict([(name, set()) for name in FILTER_NAMES])
+
+        # Ids are seeded with the current time so the ids a client received from the previous
+        # st2stream process are very unlikely to be mistaken for the ids of this process
+        self._last_event_id = int(time.time() * 1000)
+
+        # Recent events which are replayed to the clients which reconnect with Last-Event-ID
+        self._replay_buffer = collections.deque(maxlen=cfg.CONF.stream.replay_buffer_size)
+
     def get_consumers(self, consumer, channel):
         return [
             consumer(queues=[announcement.get_queue(routing_key=publishers.ANY_RK,
@@ -68,36 +302,304 @@ class Listener(ConsumerMixin):
             event_name = '%s__%s' % (meta.get('exchange'), meta.get('routing_key'))
 
             try:
+                event_id = self._record_event(event_name, body, model)
+
+                if not self.subscriptions:
+                    # Nobody is listening so there is no need to convert and serialize the model
+                    return
+
+                subscriptions = self.get_subscriptions(event_name, body, model)
+                if not subscriptions:
+                    return
+
+                coalesce_key = None
                 if model:
+                    # Only consecutive updates of the same object can be safely merged
+                    if meta.get('routing_key') == publishers.UPDATE_RK:
+                        coalesce_key = '%s:%s' % (event_name, body.id)
+
                     body = model.from_model(body, mask_secrets=cfg.CONF.api.mask_secrets)
 
-                self.emit(event_name, body)
+                self.emit(event_name, body, subscriptions=subscriptions,
+                          coalesce_key=coalesce_key, event_id=event_id)
             finally:
                 message.ack()
 
         return process
 
-    def emit(self, event, body):
-        pack = (event, body)
-        for queue in self.queues:
-            queue.put(pack)
+    def emit(self, event, body, subscriptions=None, coalesce_key=None, event_id=None):
+        if subscriptions is None:
+            subscriptions = self.subscriptions
+
+        # Event is serialized only once per result size option and the same frame is shared by
+        # all the clients
+        frames = {}
+        for subscription in subscriptions:
+            max_result_size = subscription.max_result_size
+
+            if max_result_size not in frames:
+                frames[max_result_size] = encode_event(event, body,
+                                                       max_result_size=max_result_size,
+                                                       event_id=event_id)
+
+            subscription.put(frames[max_result_size], coalesce_key=coalesce_key)
+
+    def get_subscriptions(self, event, body, model=None):
+        """
+        Return subscriptions whose filters match the provided event.
+
+        :rtype: ``set``
+        """
+        values = get_filter_values(event, body, model)
+        result = None
+
+        for name in FILTER_NAMES:
+            matching = set(self._unfiltered[name])
+            value = values.get(name, None)
 
-    def generator(self):
-        queue = eventlet.Queue()
-        queue.put('')
-        self.queues.append(queue)
+            if value is not None:
+                matching.update(self._filter_index[name].get(value, set()))
+
+            result = matching if result is None else result & matching
+
+            if not result:
+                break
+
+        return result
+
+    def subscribe(self, subscription):
+        self.subscriptions.append(subscription)
+
+        for name in FILTER_NAMES:
+            values = subscription.filters.get(name, None)
+
+            if not values:
+                self._unfiltered[name].add(subscription)
+                continue
+
+            for value in values:
+                self._filter_index[name].setdefault(value, set()).add(subscription)
+
+    def unsubscribe(self, subscription):
+        self.subscriptions.remove(subscription)
+
+        for name in FILTER_NAMES:
+            self._unfiltered[name].discard(subscription)
+
+            index = self._filter_index[name]
+            for value in subscription.filters.get(name, []):
+                subscriptions = index.get(value, None)
+                if subscriptions is None:
+                    continue
+
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del index[value]
+
+    def get_stats(self):
+        """
+        Return queue depth and dropped / coalesced event counts for each connected client.
+
+        :rtype: ``list`` of ``dict``
+        """
+        return [subscription.get_stats() for subscription in self.subscriptions]
+
+    def log_stats(self):
+        """
+        Log stats of the connected clients. Clients which are losing events or whose queue is at
+        least half full are logged separately so slow clients can be spotted before they start
+        losing events or are disconnected.
+        """
+        subscriptions = list(self.subscriptions)
+        if not subscriptions:
+            return
+
+        max_queue_size = cfg.CONF.stream.max_queue_size
+        total = {'queue_size': 0, 'dropped': 0, 'coalesced': 0}
+
+        for subscription in subscriptions:
+            stats = subscription.get_stats()
+
+            for key in total:
+                total[key] += stats[key]
+
+            queue_filling_up = max_queue_size and stats['queue_size'] * 2 >= max_queue_size
+            if queue_filling_up or stats['dropped'] or stats['coalesced']:
+                LOG.warning('Slow stream client (queue_size=%s, max_queue_size=%s, dropped=%s, '
+                            'coalesced=%s, filters=%s)', stats['queue_size'], max_queue_size,
+                            stats['dropped'], stats['coalesced'], subscription.filters)
+
+        LOG.info('Stream clients: %s (queue_size=%s, dropped=%s, coalesced=%s)',
+                 len(subscriptions), total['queue_size'], total['dropped'], total['coalesced'])
+
+    def get_replay_frames(self, subscription, last_event_id):
+        """
+        Return frames of the buffered events which match the subscription and were emitted after
+        the event with the provided id.
+
+        :return: List of frames or None if some of the events are no longer in the buffer.
+        :rtype: ``list``
+        """
+        if self._replay_buffer:
+            oldest_event_id = self._replay_buffer[0][0]
+        else:
+            oldest_event_id = self._last_event_id + 1
+
+        if not oldest_event_id - 1 <= last_event_id <= self._last_event_id:
+            return None
+
+        frames = []
+        for event_id, event, body, model in self._replay_buffer:
+            if event_id <= last_event_id:
+                continue
+
+            if not subscription.matches(get_filter_values(event, body, model)):
+                continue
+
+            if model:
+                body = model.from_model(body, mask_secrets=cfg.CONF.api.mask_secrets)
+
+            frames.append(encode_event(event, body,
+                                       max_result_size=subscription.max_result_size,
+                                       event_id=event_id))
+
+        return frames
+
+    def generator(self, filters=None, max_result_size=None, last_event_id=None):
+        subscription = Subscription(filters=filters, max_result_size=max_result_size,
+                                    max_queue_size=cfg.CONF.stream.max_queue_size,
+                                    overflow_policy=cfg.CONF.stream.queue_overflow_policy)
+        subscription.put('')
+
+        replay_frames = []
+        if last_event_id is not None:
+            replay_frames = self.get_replay_frames(subscription, last_event_id)
+
+            if replay_frames is None:
+                LOG.debug('Events after id %s are no longer available, client needs to resync',
+                          last_event_id)
+                replay_frames = [encode_event(RESYNC_EVENT, {'last_event_id': last_event_id})]
+
+        # Note: There is no context switch between building the replay frames and subscribing so
+        # no event can be missed or sent twice
+        self.subscribe(subscription)
         try:
+            for frame in replay_frames:
+                yield frame
+
             while not self._stopped:
                 try:
-                    yield queue.get(timeout=cfg.CONF.stream.heartbeat)
+                    frame = subscription.get(timeout=cfg.CONF.stream.heartbeat)
                 except eventlet.queue.Empty:
                     yield
+                    continue
+
+                if frame is OVERFLOW_MARKER:
+                    yield encode_event(OVERFLOW_EVENT, subscription.get_stats())
+                    break
+
+                yield frame
         finally:
-            self.queues.remove(queue)
+            self.unsubscribe(subscription)
+
+            stats = subscription.get_stats()
+            if stats['dropped'] or stats['coalesced']:
+                LOG.info('Stream client disconnected (dropped=%s, coalesced=%s)',
+                         stats['dropped'], stats['coalesced'])
 
     def shutdown(self):
         self._stopped = True
 
+    def _record_event(self, event, body, model=None):
+        """
+        Assign id to the event and store it in the replay buffer.
+
+        Events are stored as received from the message bus and only converted and serialized
+        when they are replayed.
+
+        :rtype: ``int``
+        """
+        self._last_event_id += 1
+        self._replay_buffer.append((self._last_event_id, event, body, model))
+        return self._last_event_id
+
+
+def get_filter_values(event, body, model=None):
+    """
+    Retrieve values of the filterable attributes from the event body (database model object).
+
+    :rtype: ``dict``
+    """
+    values = {
+        'events': event
+    }
+
+    if model is None:
+        # Announcements have no filterable attributes besides the event name
+        return values
+
+    action = getattr(body, 'action', None)
+    if isinstance(action, dict):
+        values['action_ref'] = action.get('ref', None)
+    else:
+        values['action_ref'] = action
+
+    context = getattr(body, 'context', None) or {}
+    values['user'] = context.get('user', None)
+    values['status'] = getattr(body, 'status', None)
+
+    if model is ActionExecutionAPI:
+        values['execution_id'] = str(body.id)
+
+    return values
+
+
+def encode_event(event, body, max_result_size=None, event_id=None):
+    """
+    Serialize event into a server-sent events frame which is ready to be sent to the client.
+
+    :param max_result_size: If provided, "result" field is omitted (0) or truncated to the
+                            provided number of characters.
+    :type max_result_size: ``int``
+
+    :param event_id: If provided, frame includes the id which client sends back in the
+                     Last-Event-ID header when it reconnects.
+    :type event_id: ``int``
+
+    :rtype: ``bytes``
+    """
+    if max_result_size is not None:
+        body = _get_body_with_truncated_result(body, max_result_size)
+
+    frame = EVENT_FORMAT % (event, json_encode(body, indent=None))
+
+    if event_id is not None:
+        frame = EVENT_ID_FORMAT % (event_id) + frame
+
+    # Note: gunicorn wsgi handler expect bytes, not unicode
+    return six.binary_type(frame)
+
+
+def _get_body_with_truncated_result(body, max_result_size):
+    if hasattr(body, '__json__'):
+        body = body.__json__()
+
+    if not isinstance(body, dict) or 'result' not in body:
+        return body
+
+    body = dict(body)
+
+    if max_result_size <= 0:
+        del body['result']
+        return body
+
+    result = json_encode(body['result'], indent=None)
+    if len(result) > max_result_size:
+        body['result'] = result[:max_result_size]
+        body['result_truncated'] = True
+
+    return body
+
 
 def listen(listener):
     try:
@@ -106,12 +608,27 @@ def listen(listener):
         listener.shutdown()
 
 
+def log_stats(listener):
+    interval = cfg.CONF.stream.stats_log_interval
+
+    while not listener._stopped:
+        eventlet.sleep(interval)
+
+        try:
+            listener.log_stats()
+        except Exception:
+            LOG.exception('Failed to log stream client stats.')
+
+
 def get_listener():
     global _listener
     if not _listener:
         with Connection(transport_utils.get_messaging_urls()) as conn:
             _listener = Listener(conn)
             eventlet.spawn_n(listen, _listener)
+
+            if cfg.CONF.stream.stats_log_interval > 0:
+                eventlet.spawn_n(log_stats, _listener)
     return _listener
 
 
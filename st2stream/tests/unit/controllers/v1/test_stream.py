@@ -13,10 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import bson
 import mock
+from oslo_config import cfg
 
 from st2common.models.api.action import ActionAPI, RunnerTypeAPI
+from st2common.models.api.execution import ActionExecutionAPI
 from st2common.models.api.execution import LiveActionAPI
+from st2common.models.db.execution import ActionExecutionDB
 from st2common.models.db.liveaction import LiveActionDB
 from st2common.persistence.action import Action, RunnerType
 from st2stream.controllers.v1 import stream
@@ -72,10 +76,11 @@ LIVE_ACTION_1 = {
 
 
 class META(object):
-    delivery_info = {
-        'exchange': 'some',
-        'routing_key': 'thing'
-    }
+    def __init__(self, exchange='some', routing_key='thing'):
+        self.delivery_info = {
+            'exchange': exchange,
+            'routing_key': routing_key
+        }
 
     def ack(self):
         pass
@@ -112,3 +117,250 @@ class TestStreamController(FunctionalTest):
         self.assertIn('event: some__thing', message)
         self.assertIn('data: {"', message)
         self.assertNotIn(SUPER_SECRET_PARAMETER, message)
+
+    def test_processor_skips_model_conversion_without_listeners(self):
+        listener = st2stream.listener.Listener(mock.Mock())
+        model = mock.Mock()
+
+        listener.processor(model)(LiveActionDB(**LIVE_ACTION_1), META())
+
+        self.assertFalse(model.from_model.called)
+
+    @mock.patch.object(st2stream.listener, 'json_encode', mock.Mock(return_value='{}'))
+    def test_emit_encodes_event_once(self):
+        listener = st2stream.listener.Listener(mock.Mock())
+        listener.subscribe(st2stream.listener.Subscription())
+        listener.subscribe(st2stream.listener.Subscription())
+
+        listener.emit('some__thing', {'a': 1})
+
+        self.assertEqual(st2stream.listener.json_encode.call_count, 1)
+        for subscription in listener.subscriptions:
+            self.assertEqual(subscription.get(), 'event: some__thing\ndata: {}\n\n')
+
+    def test_subscription_filters(self):
+        listener = st2stream.listener.Listener(mock.Mock())
+        all_events = st2stream.listener.Subscription()
+        by_action = st2stream.listener.Subscription(
+            filters={'action_ref': ['core.local', 'core.remote']})
+        by_action_and_status = st2stream.listener.Subscription(
+            filters={'action_ref': ['core.local'], 'status': ['succeeded']})
+        by_event = st2stream.listener.Subscription(
+            filters={'events': ['st2.announcement__chatops']})
+
+        for subscription in [all_events, by_action, by_action_and_status, by_event]:
+            listener.subscribe(subscription)
+
+        execution_db = ActionExecutionDB(id=bson.ObjectId(), action={'ref': 'core.local'},
+                                         context={'user': 'stanley'}, status='running')
+
+        subscriptions = listener.get_subscriptions('st2.execution__update', execution_db,
+                                                   ActionExecutionAPI)
+        self.assertEqual(subscriptions, set([all_events, by_action]))
+
+        execution_db.status = 'succeeded'
+        subscriptions = listener.get_subscriptions('st2.execution__update', execution_db,
+                                                   ActionExecutionAPI)
+        self.assertEqual(subscriptions, set([all_events, by_action, by_action_and_status]))
+
+        subscriptions = listener.get_subscriptions('st2.announcement__chatops', {})
+        self.assertEqual(subscriptions, set([all_events, by_event]))
+
+        listener.unsubscribe(by_action)
+        subscriptions = listener.get_subscriptions('st2.execution__update', execution_db,
+                                                   ActionExecutionAPI)
+        self.assertEqual(subscriptions, set([all_events, by_action_and_status]))
+        self.assertEqual(listener._filter_index['action_ref'].keys(), ['core.local'])
+
+    def test_encode_event_max_result_size(self):
+        body = {'id': '1', 'result': {'stdout': 'a' * 100}}
+
+        message = st2stream.listener.encode_event('some__thing', body, max_result_size=0)
+        self.assertNotIn('result', message)
+
+        message = st2stream.listener.encode_event('some__thing', body, max_result_size=20)
+        self.assertIn('"result_truncated": true', message)
+        self.assertNotIn('a' * 20, message)
+
+        message = st2stream.listener.encode_event('some__thing', body, max_result_size=1000)
+        self.assertIn('a' * 100, message)
+        self.assertNotIn('result_truncated', message)
+
+    def test_subscription_overflow_drop_oldest(self):
+        subscription = st2stream.listener.Subscription(max_queue_size=2)
+
+        for frame in ['a', 'b', 'c']:
+            subscription.put(frame)
+
+        self.assertEqual(subscription.get_stats(),
+                         {'queue_size': 2, 'dropped': 1, 'coalesced': 0})
+        self.assertEqual(subscription.get(), 'b')
+        self.assertEqual(subscription.get(), 'c')
+
+    def test_subscription_overflow_coalesce(self):
+        subscription = st2stream.listener.Subscription(max_queue_size=2,
+                                                       overflow_policy='coalesce')
+
+        # Frames are only coalesced when the queue is full
+        subscription.put('a1', coalesce_key='a')
+        subscription.put('a2', coalesce_key='a')
+        self.assertEqual(subscription.get(), 'a1')
+
+        # Stale frame is discarded and the new frame is added at the end of the queue
+        subscription.put('b1', coalesce_key='b')
+        subscription.put('a3', coalesce_key='a')
+
+        self.assertEqual(subscription.get_stats(),
+                         {'queue_size': 2, 'dropped': 0, 'coalesced': 1})
+        self.assertEqual(subscription.get(), 'b1')
+        self.assertEqual(subscription.get(), 'a3')
+
+        # Frame which has already been sent can't be coalesced
+        subscription.put('a4', coalesce_key='a')
+        subscription.put('c1')
+        subscription.put('a5', coalesce_key='a')
+
+        self.assertEqual(subscription.get_stats(),
+                         {'queue_size': 2, 'dropped': 0, 'coalesced': 2})
+        subscription.put('d1')
+
+        self.assertEqual(subscription.get_stats(),
+                         {'queue_size': 2, 'dropped': 1, 'coalesced': 2})
+        self.assertEqual(subscription.get(), 'a5')
+        self.assertEqual(subscription.get(), 'd1')
+
+    def test_subscription_overflow_disconnect(self):
+        subscription = st2stream.listener.Subscription(max_queue_size=2,
+                                                       overflow_policy='disconnect')
+
+        for frame in ['a', 'b', 'c', 'd']:
+            subscription.put(frame)
+
+        self.assertTrue(subscription.overflowed)
+        self.assertEqual(subscription.get_stats(),
+                         {'queue_size': 1, 'dropped': 4, 'coalesced': 0})
+        self.assertIs(subscription.get(), st2stream.listener.OVERFLOW_MARKER)
+
+    @mock.patch.object(st2stream.listener, 'LOG')
+    def test_log_stats(self, mock_log):
+        cfg.CONF.set_override(name='max_queue_size', override=4, group='stream')
+        self.addCleanup(cfg.CONF.clear_override, name='max_queue_size', group='stream')
+
+        listener = st2stream.listener.Listener(mock.Mock())
+
+        # No clients, nothing is logged
+        listener.log_stats()
+        self.assertFalse(mock_log.info.called)
+
+        fast_subscription = st2stream.listener.Subscription(max_queue_size=4)
+        fast_subscription.put('a')
+        slow_subscription = st2stream.listener.Subscription(filters={'user': ['stanley']},
+                                                            max_queue_size=4)
+        for frame in ['a', 'b', 'c']:
+            slow_subscription.put(frame)
+
+        listener.subscribe(fast_subscription)
+        listener.subscribe(slow_subscription)
+        listener.log_stats()
+
+        self.assertEqual(mock_log.warning.call_count, 1)
+        self.assertEqual(mock_log.warning.call_args[0][1:],
+                         (3, 4, 0, 0, {'user': set(['stanley'])}))
+        self.assertEqual(mock_log.info.call_args[0][1:], (2, 4, 0, 0))
+
+    def test_generator_overflow_closes_stream(self):
+        cfg.CONF.set_override(name='max_queue_size', override=1, group='stream')
+        cfg.CONF.set_override(name='queue_overflow_policy', override='disconnect',
+                              group='stream')
+        self.addCleanup(cfg.CONF.clear_override, name='max_queue_size', group='stream')
+        self.addCleanup(cfg.CONF.clear_override, name='queue_overflow_policy', group='stream')
+
+        listener = st2stream.listener.Listener(mock.Mock())
+        generator = listener.generator()
+
+        self.assertEqual(next(generator), '')
+
+        listener.emit('some__thing', {'a': 1})
+        listener.emit('some__thing', {'a': 2})
+
+        message = next(generator)
+        self.assertTrue(message.startswith('event: st2.stream__overflow\n'))
+        self.assertRaises(StopIteration, next, generator)
+        self.assertEqual(listener.subscriptions, [])
+
+    def test_encode_event_with_id(self):
+        message = st2stream.listener.encode_event('some__thing', {}, event_id=10)
+        self.assertEqual(message, 'id: 10\nevent: some__thing\ndata: {}\n\n')
+
+    def test_generator_replays_missed_events(self):
+        listener = st2stream.listener.Listener(mock.Mock())
+        process = listener.processor()
+
+        meta = META('st2.announcement', 'chatops')
+        process({'a': 1}, meta)
+        first_event_id = listener._last_event_id
+        process({'a': 2}, meta)
+        process({'a': 3}, META('st2.announcement', 'other'))
+
+        generator = listener.generator(filters={'events': ['st2.announcement__chatops']},
+                                       last_event_id=first_event_id)
+
+        self.assertEqual(next(generator), 'id: %s\nevent: st2.announcement__chatops\n'
+                                          'data: {"a": 2}\n\n' % (first_event_id + 1))
+        self.assertEqual(next(generator), '')
+
+    def test_coalesced_frames_are_sent_in_event_id_order(self):
+        cfg.CONF.set_override(name='max_queue_size', override=3, group='stream')
+        cfg.CONF.set_override(name='queue_overflow_policy', override='coalesce', group='stream')
+        self.addCleanup(cfg.CONF.clear_override, name='max_queue_size', group='stream')
+        self.addCleanup(cfg.CONF.clear_override, name='queue_overflow_policy', group='stream')
+
+        model = mock.Mock()
+        model.from_model.side_effect = lambda body, mask_secrets: {'id': body.id}
+
+        listener = st2stream.listener.Listener(mock.Mock())
+        process = listener.processor(model)
+        generator = listener.generator()
+        self.assertEqual(next(generator), '')
+
+        object_a = mock.Mock(id='a', action=None, context={}, status=None)
+        object_b = mock.Mock(id='b', action=None, context={}, status=None)
+
+        meta = META('st2.execution', 'update')
+        process(object_a, meta)
+        process(object_b, meta)
+        process(object_b, meta)
+        process(object_a, meta)
+
+        # Stale frame of execution_a is discarded, the rest is sent in the event id order
+        event_ids = []
+        for _ in range(0, 3):
+            event_ids.append(int(next(generator).split('\n')[0].split(' ')[1]))
+
+        self.assertEqual(event_ids, sorted(event_ids))
+        self.assertEqual(event_ids[-1], listener._last_event_id)
+
+        # Client which disconnects after receiving the first frame resumes without a gap
+        replay_generator = listener.generator(last_event_id=event_ids[0])
+        replayed_event_ids = [int(next(replay_generator).split('\n')[0].split(' ')[1])
+                              for _ in range(0, 2)]
+        self.assertEqual(replayed_event_ids, event_ids[1:])
+
+    def test_generator_resync_when_events_are_not_available(self):
+        cfg.CONF.set_override(name='replay_buffer_size', override=1, group='stream')
+        self.addCleanup(cfg.CONF.clear_override, name='replay_buffer_size', group='stream')
+
+        listener = st2stream.listener.Listener(mock.Mock())
+        process = listener.processor()
+
+        process({'a': 1}, META('st2.announcement', 'chatops'))
+        first_event_id = listener._last_event_id
+        process({'a': 2}, META('st2.announcement', 'chatops'))
+        process({'a': 3}, META('st2.announcement', 'chatops'))
+
+        generator = listener.generator(last_event_id=first_event_id)
+        self.assertTrue(next(generator).startswith('event: st2.stream__resync\n'))
+
+        # Unknown id (e.g. from the previous st2stream process)
+        generator = listener.generator(last_event_id=listener._last_event_id + 10)
+        self.assertTrue(next(generator).startswith('event: st2.stream__resync\n'))
@@ -60,6 +60,8 @@ def _register_config_opts():
     _register_scheduler_opts()
     _register_exporter_opts()
     _register_sensor_container_opts()
+    _register_notifier_opts()
+    _register_rules_engine_opts()
 
 
 def _override_db_opts():
@@ -76,7 +78,10 @@ def _override_common_opts():
     CONF.set_override(name='system_runners_base_path', override=runners_base_path, group='content')
     CONF.set_override(name='runners_base_paths', override=runners_base_path, group='content')
     CONF.set_override(name='api_url', override='http://127.0.0.1', group='auth')
+    CONF.set_override(name='validation_cache_ttl', override=0, group='auth')
+    CONF.set_override(name='execution_references_cache_ttl', override=0, group='system')
     CONF.set_override(name='mask_secrets', override=True, group='log')
+    CONF.set_override(name='response_validation', override='full', group='api')
     CONF.set_override(name='url', override='zake://', group='coordination')
     CONF.set_override(name='lock_timeout', override=1, group='coordination')
     CONF.set_override(name='jitter_interval', override=0, group='mistral')
@@ -122,7 +127,10 @@ def _register_api_opts():
         cfg.IntOpt('max_page_size', default=100,
                    help=('Maximum limit (page size) argument which can be specified by the user '
                          'in a query string. If a larger value is provided, it will default to  '
-                         'this value.'))
+                         'this value.')),
+        cfg.BoolOpt('stream_list_responses', default=False),
+        cfg.StrOpt('list_total_count', default='exact',
+                   choices=['exact', 'estimated', 'off'])
     ]
     _register_opts(api_opts, group='api')
 
@@ -154,6 +162,14 @@ def _register_stream_opts():
                    help='Send empty message every N seconds to keep connection open'),
         cfg.BoolOpt('debug', default=False,
                     help='Specify to enable debug mode.'),
+        cfg.IntOpt('max_queue_size', default=1000,
+                   help='Maximum number of events buffered for a single client.'),
+        cfg.StrOpt('queue_overflow_policy', default='drop_oldest',
+                   help='What to do when the client queue is full.'),
+        cfg.IntOpt('replay_buffer_size', default=1000,
+                   help='Number of recent events replayed to the reconnecting clients.'),
+        cfg.IntOpt('stats_log_interval', default=0,
+                   help='Log stats of the connected clients every N seconds.')
     ]
     _register_opts(stream_opts, group='stream')
 
@@ -249,6 +265,34 @@ def _register_sensor_container_opts():
     _register_cli_opts([sensor_test_opt])
 
 
+def _register_notifier_opts():
+    notifier_opts = [
+        cfg.IntOpt('batch_size', default=1,
+                   help='Number of execution update messages to prefetch and acknowledge '
+                        'together. 1 disables batching.'),
+        cfg.FloatOpt('batch_flush_interval', default=1,
+                     help='Maximum number of seconds to wait for a partial batch to fill up '
+                          'before processing it.')
+    ]
+    _register_opts(notifier_opts, group='notifier')
+
+
+def _register_rules_engine_opts():
+    rules_engine_opts = [
+        cfg.BoolOpt('use_rules_index', default=True,
+                    help='True to keep an in-memory index of enabled rules and triggers which '
+                         'is updated from the rule and trigger CUD events instead of querying '
+                         'the database for each trigger instance.'),
+        cfg.IntOpt('batch_size', default=1,
+                   help='Number of trigger instance messages to prefetch, insert into the '
+                        'database and acknowledge together. 1 disables batching.'),
+        cfg.FloatOpt('batch_flush_interval', default=1,
+                     help='Maximum number of seconds to wait for a partial batch to fill up '
+                          'before processing it.')
+    ]
+    _register_opts(rules_engine_opts, group='rulesengine')
+
+
 def _register_opts(opts, group=None):
     CONF.register_opts(opts, group)
 
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# Licensed to the StackStorm, Inc ('StackStorm') under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A utility script which measures the per-request overhead of the API response validation for
+different values of the api.response_validation config option.
+
+It validates a list of executions (GET /v1/executions response) with large results the same way
+the router does.
+"""
+
+import argparse
+import time
+
+import jsonschema
+
+from st2common import config
+from st2common.router import Response
+from st2common.router import Router
+from st2common.util import spec_loader
+
+
+def get_executions(count, result_size):
+    executions = []
+
+    for index in range(0, count):
+        execution = {
+            'id': '5a0eb2ac0640fd5cbd5eb0%02d' % (index),
+            'status': 'succeeded',
+            'start_timestamp': '2017-11-17T10:00:00.000000Z',
+            'end_timestamp': '2017-11-17T10:00:01.000000Z',
+            'action': {'ref': 'core.local', 'name': 'local', 'pack': 'core',
+                       'runner_type': 'local-shell-cmd',
+                       'parameters': {'cmd': {'type': 'string'}}},
+            'runner': {'name': 'local-shell-cmd', 'runner_parameters': {}},
+            'liveaction': {'action': 'core.local', 'parameters': {'cmd': 'date'}},
+            'parameters': {'cmd': 'date'},
+            'context': {'user': 'stanley'},
+            'result': {
+                'stdout': 'a' * result_size,
+                'stderr': '',
+                'return_code': 0,
+                'lines': ['line %s' % (line) for line in range(0, 100)]
+            }
+        }
+        executions.append(execution)
+
+    return executions
+
+
+def main(count, result_size, iterations):
+    spec = spec_loader.load_spec('st2common', 'openapi.yaml')
+    schema = spec['paths']['/api/v1/executions']['get']['responses']['200']['schema']
+
+    router = Router()
+    router.spec = spec
+    router.spec_resolver = jsonschema.RefResolver('', spec)
+    validator = router._get_validator(schema=schema)
+
+    executions = get_executions(count=count, result_size=result_size)
+
+    def serialize():
+        return Response(json=executions)
+
+    def validate_parsed_body():
+        # Previous behavior - body is parsed again before validation
+        validator.validate(serialize().json)
+
+    def validate_json_value():
+        validator.validate(serialize().get_json_value())
+
+    benchmarks = [
+        ('off (serialization only)', serialize),
+        ('full (parsed body)', validate_parsed_body),
+        ('full (pre-serialization value)', validate_json_value)
+    ]
+
+    print('Executions: %s, result size: %s bytes, iterations: %s' % (count, result_size,
+                                                                     iterations))
+    for name, func in benchmarks:
+        start = time.time()
+        for _ in range(0, iterations):
+            func()
+        duration = (time.time() - start) / iterations * 1000
+
+        print('%-35s %.2f ms per request' % (name, duration))
+
+
+if __name__ == '__main__':
+    config.parse_args(args={})
+    parser = argparse.ArgumentParser(description='API response validation benchmark')
+    parser.add_argument('--count', type=int, default=100,
+                        help='Number of executions in the response')
+    parser.add_argument('--result-size', type=int, default=10000,
+                        help='Size of the execution result stdout in bytes')
+    parser.add_argument('--iterations', type=int, default=20,
+                        help='Number of iterations')
+    args = parser.parse_args()
+
+    main(count=args.count, result_size=args.result_size, iterations=args.iterations)